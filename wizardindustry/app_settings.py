@@ -7,3 +7,101 @@ from django.conf import settings
 
 
 wizardindustry_SETTING_ONE = getattr(settings, "wizardindustry_SETTING_ONE", None)
+
+# Seconds a resolved structure name is trusted before ESI is asked again
+wizardindustry_LOCATION_MAX_AGE = getattr(
+    settings, "wizardindustry_LOCATION_MAX_AGE", 60 * 60 * 24 * 7
+)
+
+# Number of locations kept in the in-process tier of the location cache
+wizardindustry_LOCATION_CACHE_SIZE = getattr(
+    settings, "wizardindustry_LOCATION_CACHE_SIZE", 10000
+)
+
+# Seconds a location is kept in the in-process tier, other processes only
+# see renames and deletions made elsewhere once it has passed
+wizardindustry_LOCATION_LOCAL_TIMEOUT = getattr(
+    settings, "wizardindustry_LOCATION_LOCAL_TIMEOUT", 60
+)
+
+# Number of stale structures refreshed by each run of refresh_stale_structures
+wizardindustry_STRUCTURE_REFRESH_LIMIT = getattr(
+    settings, "wizardindustry_STRUCTURE_REFRESH_LIMIT", 200
+)
+
+# Number of structures refreshed by a single refresh_structure_names task
+wizardindustry_STRUCTURE_REFRESH_BATCH_SIZE = getattr(
+    settings, "wizardindustry_STRUCTURE_REFRESH_BATCH_SIZE", 20
+)
+
+# Seconds the batches of one run are spread over, match the beat schedule
+wizardindustry_STRUCTURE_REFRESH_INTERVAL = getattr(
+    settings, "wizardindustry_STRUCTURE_REFRESH_INTERVAL", 60 * 60
+)
+
+# Seconds a user's owned blueprint set is cached for at most
+wizardindustry_OWNERSHIP_CACHE_TIMEOUT = getattr(
+    settings, "wizardindustry_OWNERSHIP_CACHE_TIMEOUT", 60 * 60
+)
+
+# Blueprint type ids never tracked by the blueprint library
+wizardindustry_EXCLUDED_BLUEPRINTS = getattr(
+    settings,
+    "wizardindustry_EXCLUDED_BLUEPRINTS",
+    [
+        47969,
+        48469,
+        48470,
+        47971,
+        48471,
+        48472,
+        47973,
+        48473,
+        48474,
+        48095,
+        58973,
+        58974,
+        49973,
+        60514,
+    ],
+)
+
+# Blueprints whose name starts with one of these are not tracked
+wizardindustry_EXCLUDED_BLUEPRINT_PREFIXES = getattr(
+    settings, "wizardindustry_EXCLUDED_BLUEPRINT_PREFIXES", ["Civilian"]
+)
+
+# Meta groups of the products whose blueprints are tracked
+wizardindustry_BLUEPRINT_META_GROUPS = getattr(
+    settings, "wizardindustry_BLUEPRINT_META_GROUPS", [1, 54]
+)
+
+# Seconds blueprint coverage updates wait for an aa-blueprints sync to finish
+wizardindustry_COVERAGE_UPDATE_DELAY = getattr(
+    settings, "wizardindustry_COVERAGE_UPDATE_DELAY", 60
+)
+
+# Seconds a rendered blueprint library is cached for at most
+wizardindustry_LIBRARY_CACHE_TIMEOUT = getattr(
+    settings, "wizardindustry_LIBRARY_CACHE_TIMEOUT", 86400
+)
+
+# JSON file market prices are read from instead of ESI
+wizardindustry_MARKET_PRICE_FILE = getattr(
+    settings, "wizardindustry_MARKET_PRICE_FILE", None
+)
+
+# Seconds a user's list of running industry jobs is cached for at most
+wizardindustry_ACTIVE_JOBS_CACHE_TIMEOUT = getattr(
+    settings, "wizardindustry_ACTIVE_JOBS_CACHE_TIMEOUT", 3600
+)
+
+# Seconds a catalogue version is kept in the cache, superseded versions expire
+wizardindustry_CATALOGUE_CACHE_TIMEOUT = getattr(
+    settings, "wizardindustry_CATALOGUE_CACHE_TIMEOUT", 86400
+)
+
+# Seconds a user's asset value dashboard is cached for at most
+wizardindustry_ASSET_VALUES_CACHE_TIMEOUT = getattr(
+    settings, "wizardindustry_ASSET_VALUES_CACHE_TIMEOUT", 3600
+)
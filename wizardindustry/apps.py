@@ -13,3 +13,7 @@ class wizardindustryConfig(AppConfig):
     name = "wizardindustry"
     label = "wizardindustry"
     verbose_name = f"wizardindustry App v{__version__}"
+
+    def ready(self):
+        # AA wizardindustry App
+        from wizardindustry import signals  # noqa: F401
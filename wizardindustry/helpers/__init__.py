@@ -0,0 +1 @@
+"""Helpers"""
@@ -0,0 +1,192 @@
+"""Assets visible to a user and asset search
+
+Search matches type names, container names and location names, locations
+include the assets in offices and containers held there. On PostgreSQL the
+names are matched anywhere, served by pg_trgm indexes, other databases match
+name prefixes, served by case-insensitive indexes, on SQLite `NOCASE` ones.
+Results are paged by a keyset cursor over the asset tables and primary keys.
+"""
+
+# Django
+from django.db import connection
+from django.db.models import F, Q
+
+# Alliance Auth (External Libs)
+from eveuniverse.models import EveType
+
+# AA wizardindustry App
+from wizardindustry.helpers.stock import MAX_CONTAINER_DEPTH
+from wizardindustry.models import (
+    CharacterAsset,
+    CorporationAsset,
+    EveLocation,
+    Owner,
+    location_assets_filter,
+    staStations,
+)
+
+SEARCH_TABLES = ("corporation", "character")
+SEARCH_COLUMNS = (
+    "id",
+    "item_id",
+    "type_id",
+    "type_name__name",
+    "name",
+    "quantity",
+    "location_id",
+    "location_name__location_name",
+    "location_flag",
+    "owner_name",
+)
+SEARCH_FIELDS = (
+    "id",
+    "item_id",
+    "type_id",
+    "type_name",
+    "name",
+    "quantity",
+    "location_id",
+    "location_name",
+    "location_flag",
+    "owner_name",
+)
+
+
+def asset_owners(user) -> tuple:
+    """Corporation pks and character ownership pks of the owners of `user`."""
+    corporation_ids = set()
+    character_ownership_ids = set()
+    for corporation_owner, corporation_id, character_id in Owner.objects.filter(
+        user=user
+    ).values_list("corporation_owner", "corporation_id", "character_id"):
+        if corporation_owner:
+            corporation_ids.add(corporation_id)
+        else:
+            character_ownership_ids.add(character_id)
+    return corporation_ids, character_ownership_ids
+
+
+def name_lookup(field: str) -> str:
+    """Lookup matching names containing a term on PostgreSQL, prefixes elsewhere."""
+    if connection.vendor == "postgresql":
+        return f"{field}__icontains"
+    return f"{field}__istartswith"
+
+
+def _owner_assets(table: str, owner_ids):
+    if table == "corporation":
+        return CorporationAsset.objects.filter(corporation_id__in=owner_ids)
+    return CharacterAsset.objects.filter(character_id__in=owner_ids)
+
+
+def _location_ids(term: str, owner_ids: dict) -> set:
+    """Locations named like `term`, and the offices and containers of the
+    owners held in them at any depth, which hold the assets in them.
+    """
+    location_ids = set(
+        EveLocation.objects.filter(**{name_lookup("location_name"): term}).values_list(
+            "location_id", flat=True
+        )
+    )
+    location_ids.update(
+        staStations.objects.filter(**{name_lookup("station_name"): term}).values_list(
+            "station_id", flat=True
+        )
+    )
+
+    querysets = [
+        _owner_assets(table, ids).filter(location_assets_filter())
+        for table, ids in owner_ids.items()
+        if ids
+    ]
+    pending = set(location_ids)
+    for _ in range(MAX_CONTAINER_DEPTH):
+        if not pending:
+            break
+        held = set()
+        for queryset in querysets:
+            held.update(
+                queryset.filter(location_id__in=pending).values_list(
+                    "item_id", flat=True
+                )
+            )
+        pending = held - location_ids
+        location_ids |= pending
+    return location_ids
+
+
+def _search_branches(term: str, owner_ids: dict) -> list:
+    """One filter per searched name, each served by its own index.
+
+    OR-ing them in one query makes most databases scan the asset table, so
+    every branch is queried on its own and the pages are merged.
+    """
+    branches = [Q(name__gt="", **{name_lookup("name"): term})]
+    type_ids = list(
+        EveType.objects.filter(**{name_lookup("name"): term}).values_list(
+            "id", flat=True
+        )
+    )
+    if type_ids:
+        branches.append(Q(type_id__in=type_ids))
+    location_ids = _location_ids(term, owner_ids)
+    if location_ids:
+        branches.append(Q(location_id__in=location_ids))
+    return branches
+
+
+def _search_page(table: str, owner_ids, branches, after: int, size: int) -> list:
+    """The first `size` matching assets of `table` after primary key `after`."""
+    queryset = _owner_assets(table, owner_ids)
+    if table == "corporation":
+        owner_name = F("corporation__corporation_name")
+    else:
+        owner_name = F("character__character__character_name")
+
+    ids = set()
+    for branch in branches:
+        ids.update(
+            queryset.filter(branch, id__gt=after)
+            .order_by("id")
+            .values_list("id", flat=True)[:size]
+        )
+
+    return list(
+        queryset.filter(id__in=sorted(ids)[:size])
+        .annotate(owner_name=owner_name)
+        .order_by("id")
+        .values_list(*SEARCH_COLUMNS)
+    )
+
+
+def search_assets(user, term: str, cursor: str = None, limit: int = 50) -> tuple:
+    """One page of the assets of the owners of `user` matching `term`.
+
+    `cursor` is the `next` value of the previous page. Returns the rows and
+    the cursor of the next page, `None` on the last page.
+    """
+    corporation_ids, character_ownership_ids = asset_owners(user)
+    owner_ids = {"corporation": corporation_ids, "character": character_ownership_ids}
+
+    table, after = SEARCH_TABLES[0], 0
+    if cursor:
+        table, after = cursor.split(":")
+        after = int(after)
+
+    branches = _search_branches(term, owner_ids)
+    rows = []
+    for table in SEARCH_TABLES[SEARCH_TABLES.index(table) :]:
+        if owner_ids[table]:
+            remaining = limit - len(rows)
+            page = _search_page(table, owner_ids[table], branches, after, remaining + 1)
+            rows += [
+                dict(zip(SEARCH_FIELDS, row), owner_type=table)
+                for row in page[:remaining]
+            ]
+            if len(page) > remaining or (
+                len(rows) == limit and table != SEARCH_TABLES[-1]
+            ):
+                return rows, f"{table}:{rows[-1]['id']}"
+        after = 0
+
+    return rows, None
@@ -0,0 +1,161 @@
+"""Blueprint ownership as bitmaps over the stable blueprint bit index
+
+A bitmap is a Python int with bit `BlueprintEligibility.bit_index` set for
+every owned blueprint, so union, intersection and difference of whole
+libraries are single `|`, `&` and `& ~` operations and counts are
+`int.bit_count()`.
+"""
+
+# Standard Library
+import hashlib
+from typing import NamedTuple
+
+# Third Party
+from blueprints.models import Blueprint
+
+# Django
+from django.core.cache import cache
+
+# AA wizardindustry App
+from wizardindustry.app_settings import (
+    wizardindustry_CATALOGUE_CACHE_TIMEOUT,
+    wizardindustry_OWNERSHIP_CACHE_TIMEOUT,
+)
+from wizardindustry.helpers.catalogue import catalogue_version
+from wizardindustry.helpers.ownership import (
+    owned_blueprint_type_ids,
+    ownership_version,
+)
+from wizardindustry.models import BlueprintEligibility
+
+BIT_INDEX_KEY = "wizardindustry-bit-index-{}"
+BITMAPS_KEY = "wizardindustry-corporation-bitmaps-{}-{}-{}"
+
+
+class BitIndex(NamedTuple):
+    bits: dict
+    type_ids: dict
+    mask: int
+
+
+class Comparison(NamedTuple):
+    union: int
+    intersection: int
+    nobody: int
+    unique: dict
+    overlap: dict
+
+
+def get_bit_index() -> BitIndex:
+    """Bit positions of the eligible blueprints, cached per catalogue version."""
+    key = BIT_INDEX_KEY.format(catalogue_version())
+    index = cache.get(key)
+    if index is None:
+        bits = dict(
+            BlueprintEligibility.objects.filter(
+                is_eligible=True, bit_index__isnull=False
+            ).values_list("eve_type_id", "bit_index")
+        )
+        index = BitIndex(
+            bits,
+            {bit: type_id for type_id, bit in bits.items()},
+            to_bitmap(bits.values()),
+        )
+        cache.set(key, index, timeout=wizardindustry_CATALOGUE_CACHE_TIMEOUT)
+    return index
+
+
+def to_bitmap(bits) -> int:
+    """Bitmap with the given bit positions set."""
+    buffer = bytearray()
+    for bit in bits:
+        byte = bit >> 3
+        if byte >= len(buffer):
+            buffer.extend(bytes(byte - len(buffer) + 1))
+        buffer[byte] |= 1 << (bit & 7)
+    return int.from_bytes(buffer, "little")
+
+
+def from_bitmap(bitmap: int) -> list:
+    """Bit positions set in `bitmap`, ascending."""
+    bits = []
+    for byte_index, byte in enumerate(
+        bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little")
+    ):
+        while byte:
+            low = byte & -byte
+            bits.append((byte_index << 3) + low.bit_length() - 1)
+            byte ^= low
+    return bits
+
+
+def ownership_fingerprint(user) -> str:
+    """Hash of the eligible blueprints `user` owns an original of.
+
+    Users with the same access set share the same fingerprint.
+    """
+    index = get_bit_index()
+    bitmap = to_bitmap(
+        index.bits[type_id]
+        for type_id in owned_blueprint_type_ids(user)
+        if type_id in index.bits
+    )
+    return hashlib.blake2b(
+        bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little"), digest_size=16
+    ).hexdigest()
+
+
+def corporation_bitmaps(user) -> dict:
+    """Blueprint original bitmaps of the corporations `user` has access to.
+
+    Keyed by corporation pk, built from one grouped query and cached per user,
+    catalogue version and ownership version.
+    """
+    key = BITMAPS_KEY.format(user.pk, catalogue_version(), ownership_version())
+    bitmaps = cache.get(key)
+    if bitmaps is None:
+        index = get_bit_index()
+        owned = {}
+        for corporation_pk, type_id in (
+            Blueprint.objects.user_has_access(user)
+            .filter(runs=None, owner__corporation__isnull=False)
+            .values_list("owner__corporation_id", "eve_type_id")
+            .distinct()
+        ):
+            bit = index.bits.get(type_id)
+            if bit is not None:
+                owned.setdefault(corporation_pk, []).append(bit)
+        bitmaps = {
+            corporation_pk: to_bitmap(bits) for corporation_pk, bits in owned.items()
+        }
+        cache.set(key, bitmaps, timeout=wizardindustry_OWNERSHIP_CACHE_TIMEOUT)
+    return bitmaps
+
+
+def compare(bitmaps: dict, mask: int) -> Comparison:
+    """Union, intersection and gaps of the libraries in `bitmaps`.
+
+    `unique` holds what only that library owns and `overlap` the number of
+    blueprints owned by both libraries of each pair.
+    """
+    union = 0
+    intersection = mask if bitmaps else 0
+    for bitmap in bitmaps.values():
+        union |= bitmap
+        intersection &= bitmap
+
+    unique = {}
+    for key, bitmap in bitmaps.items():
+        others = 0
+        for other_key, other in bitmaps.items():
+            if other_key != key:
+                others |= other
+        unique[key] = bitmap & ~others
+
+    overlap = {
+        (key, other_key): (bitmap & other).bit_count()
+        for key, bitmap in bitmaps.items()
+        for other_key, other in bitmaps.items()
+    }
+
+    return Comparison(union, intersection, mask & ~union, unique, overlap)
@@ -0,0 +1,202 @@
+"""Bill of materials explosion over the manufacturing and reaction graph
+
+The eveuniverse industry data is compiled once per catalogue version into a
+product -> recipe adjacency map. Every product gets a level, one above the
+highest level of its buildable materials, so an explosion can walk all
+intermediate products highest level first. By the time a product is reached
+the demand of everything that consumes it has been added up, and runs, ME
+and rounding are applied once per product for the whole batch.
+"""
+
+# Standard Library
+import math
+from collections import defaultdict
+from typing import NamedTuple
+
+# Alliance Auth (External Libs)
+from eveuniverse.models import EveIndustryActivityMaterial, EveIndustryActivityProduct
+
+# AA wizardindustry App
+from wizardindustry.helpers.catalogue import catalogue_version
+
+MANUFACTURING_ACTIVITY_ID = 1
+REACTION_ACTIVITY_ID = 11
+
+
+class Recipe(NamedTuple):
+    blueprint_id: int
+    activity_id: int
+    quantity: int
+    materials: tuple
+
+
+class Job(NamedTuple):
+    blueprint_id: int
+    activity_id: int
+    runs: int
+    quantity: int
+
+
+class BillOfMaterials(NamedTuple):
+    materials: dict
+    jobs: dict
+    surplus: dict
+
+
+def material_quantity(runs: int, quantity: int, me: int = 0) -> int:
+    """Units of one material needed for `runs` runs at material efficiency `me`.
+
+    Rounded as in game, never less than one unit per run.
+    """
+    return max(runs, math.ceil(round(runs * quantity * (1 - me / 100), 2)))
+
+
+class IndustryGraph:
+    __slots__ = ("version", "recipes", "levels", "_closures")
+
+    def __init__(self, recipes: dict, version: int = None):
+        self.version = version
+        self.recipes = recipes
+        self.levels = self._levels()
+        self._closures = {}
+
+    def _levels(self) -> dict:
+        levels = {}
+        for type_id in self.recipes:
+            pending = [(type_id, False)]
+            while pending:
+                current, materials_done = pending.pop()
+                if current in levels:
+                    continue
+                materials = [
+                    material_id
+                    for material_id, _ in self.recipes[current].materials
+                    if material_id in self.recipes
+                ]
+                if materials_done:
+                    levels[current] = 1 + max(
+                        (levels.get(material_id, 0) for material_id in materials),
+                        default=0,
+                    )
+                    continue
+                pending.append((current, True))
+                # a material already on the stack would be a cycle, skip it
+                pending += [
+                    (material_id, False)
+                    for material_id in materials
+                    if material_id not in levels and (material_id, True) not in pending
+                ]
+        return levels
+
+    def closure(self, type_id: int) -> frozenset:
+        """`type_id` and every buildable product below it, memoised."""
+        closure = self._closures.get(type_id)
+        if closure is None:
+            closure = frozenset({type_id}).union(
+                *(
+                    self.closure(material_id)
+                    for material_id, _ in self.recipes[type_id].materials
+                    if material_id in self.recipes
+                    and self.levels[material_id] < self.levels[type_id]
+                )
+            )
+            self._closures[type_id] = closure
+        return closure
+
+    def explode(
+        self,
+        targets: dict,
+        me: int = 10,
+        blueprint_me: dict = None,
+        build_reactions: bool = True,
+    ) -> BillOfMaterials:
+        """Raw materials and jobs to build `targets`, a quantity per product.
+
+        `me` applies to every manufacturing blueprint not in `blueprint_me`,
+        reactions have no material efficiency. Without `build_reactions`
+        reaction products are bought instead of built.
+        """
+        blueprint_me = blueprint_me or {}
+        demand = defaultdict(int)
+        for type_id, quantity in targets.items():
+            demand[type_id] += quantity
+
+        buildable = frozenset().union(
+            *(self.closure(type_id) for type_id in targets if type_id in self.recipes)
+        )
+
+        jobs = {}
+        surplus = {}
+        for type_id in sorted(buildable, key=self.levels.get, reverse=True):
+            recipe = self.recipes[type_id]
+            if recipe.activity_id == REACTION_ACTIVITY_ID and not build_reactions:
+                continue
+            needed = demand.pop(type_id, 0)
+            if needed <= 0:
+                continue
+
+            runs = math.ceil(needed / recipe.quantity)
+            jobs[type_id] = Job(
+                recipe.blueprint_id, recipe.activity_id, runs, runs * recipe.quantity
+            )
+            if runs * recipe.quantity > needed:
+                surplus[type_id] = runs * recipe.quantity - needed
+
+            efficiency = (
+                0
+                if recipe.activity_id == REACTION_ACTIVITY_ID
+                else blueprint_me.get(recipe.blueprint_id, me)
+            )
+            for material_id, quantity in recipe.materials:
+                demand[material_id] += material_quantity(runs, quantity, efficiency)
+
+        return BillOfMaterials(dict(demand), jobs, surplus)
+
+
+def build_industry_graph(version: int = None) -> IndustryGraph:
+    """Compile the manufacturing and reaction recipes, in two queries."""
+    activity_ids = (MANUFACTURING_ACTIVITY_ID, REACTION_ACTIVITY_ID)
+
+    materials = defaultdict(list)
+    for blueprint_id, activity_id, material_id, quantity in (
+        EveIndustryActivityMaterial.objects.filter(activity_id__in=activity_ids)
+        .order_by("pk")
+        .values_list("eve_type_id", "activity_id", "material_eve_type_id", "quantity")
+    ):
+        materials[(blueprint_id, activity_id)].append((material_id, quantity))
+
+    recipes = {}
+    for blueprint_id, activity_id, product_id, quantity in (
+        EveIndustryActivityProduct.objects.filter(
+            activity_id__in=activity_ids, eve_type__published=True
+        )
+        .order_by("activity_id", "pk")
+        .values_list("eve_type_id", "activity_id", "product_eve_type_id", "quantity")
+    ):
+        if product_id not in recipes:
+            recipes[product_id] = Recipe(
+                blueprint_id,
+                activity_id,
+                quantity,
+                tuple(materials[(blueprint_id, activity_id)]),
+            )
+
+    return IndustryGraph(recipes, version)
+
+
+_local = None
+
+
+def get_industry_graph() -> IndustryGraph:
+    """The industry graph of the current catalogue version, kept in process."""
+    global _local
+
+    version = catalogue_version()
+    if _local is None or _local.version != version:
+        _local = build_industry_graph(version)
+    return _local
+
+
+def bill_of_materials(targets: dict, **kwargs) -> BillOfMaterials:
+    """Explode `targets`, a quantity per product type id, see `IndustryGraph.explode`."""
+    return get_industry_graph().explode(targets, **kwargs)
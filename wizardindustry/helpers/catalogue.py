@@ -0,0 +1,239 @@
+"""Precomputed catalogue of the blueprints tracked by the blueprint library"""
+
+# Standard Library
+from decimal import Decimal
+from typing import NamedTuple
+
+# Django
+from django.core.cache import cache
+from django.db.models import Max
+
+# Alliance Auth (External Libs)
+from eveuniverse.models import EveIndustryActivityProduct, EveMarketGroup, EveType
+
+# AA wizardindustry App
+from wizardindustry.app_settings import (
+    wizardindustry_BLUEPRINT_META_GROUPS,
+    wizardindustry_CATALOGUE_CACHE_TIMEOUT,
+    wizardindustry_EXCLUDED_BLUEPRINT_PREFIXES,
+    wizardindustry_EXCLUDED_BLUEPRINTS,
+)
+from wizardindustry.helpers.model_helpers import (
+    bulk_upsert,
+    bump_cache_version,
+    cache_version,
+)
+from wizardindustry.models import BlueprintEligibility, invMetaTypes
+
+ROOT_MARKET_GROUP_ID = 2  # Blueprints & Reactions
+
+VERSION_KEY = "wizardindustry-catalogue-version"
+CATALOGUE_KEY = "wizardindustry-catalogue-{}"
+
+
+class CatalogueBlueprint(NamedTuple):
+    type_id: int
+    name: str
+    base_cost: Decimal
+    build_cost: Decimal = 0
+
+
+class CatalogueGroup(NamedTuple):
+    market_group_id: int
+    name: str
+    description: str
+    children: tuple
+    blueprints: tuple
+
+
+class Catalogue(NamedTuple):
+    version: int
+    roots: tuple
+    groups: dict
+
+
+_local = None
+
+
+def catalogue_version() -> int:
+    """Current catalogue version, shared by all processes through the cache."""
+    return cache_version(VERSION_KEY)
+
+
+def bump_catalogue_version() -> int:
+    """Invalidate every cached catalogue, call after SDE or eveuniverse imports."""
+    return bump_cache_version(VERSION_KEY)
+
+
+def get_catalogue() -> Catalogue:
+    """Return the catalogue for the current version, building it on a miss."""
+    global _local
+
+    version = catalogue_version()
+    if _local is not None and _local.version == version:
+        return _local
+
+    catalogue = cache.get(CATALOGUE_KEY.format(version))
+    if catalogue is None:
+        catalogue = build_catalogue(version)
+        cache.set(
+            CATALOGUE_KEY.format(version),
+            catalogue,
+            timeout=wizardindustry_CATALOGUE_CACHE_TIMEOUT,
+        )
+
+    _local = catalogue
+    return catalogue
+
+
+def _market_group_tree():
+    """Names and children of every market group, in one query."""
+    children = {}
+    market_groups = {}
+    for (
+        market_group_id,
+        name,
+        description,
+        parent_id,
+    ) in EveMarketGroup.objects.order_by("id").values_list(
+        "id", "name", "description", "parent_market_group_id"
+    ):
+        market_groups[market_group_id] = (name, description)
+        children.setdefault(parent_id, []).append(market_group_id)
+    return market_groups, children
+
+
+def _descendants(children, market_group_id) -> list:
+    found = []
+    pending = list(children.get(market_group_id, []))
+    while pending:
+        market_group_id = pending.pop()
+        found.append(market_group_id)
+        pending += children.get(market_group_id, [])
+    return found
+
+
+def update_blueprint_eligibility() -> int:
+    """Evaluate which blueprints the blueprint library tracks.
+
+    Skips excluded blueprints, blueprints without a manufacturing product and
+    blueprints for products outside the tracked meta groups. Blueprints gone
+    from the market groups stay ineligible. Returns the number of eligible
+    blueprints.
+    """
+    _, children = _market_group_tree()
+    market_group_ids = _descendants(children, ROOT_MARKET_GROUP_ID)
+
+    blueprint_types = EveType.objects.filter(
+        published=True, eve_market_group_id__in=market_group_ids
+    ).values_list("id", "name", "eve_market_group_id")
+    manufacturing = EveIndustryActivityProduct.objects.filter(
+        activity_id=1,
+        eve_type__published=True,
+        eve_type__eve_market_group_id__in=market_group_ids,
+    )
+
+    products = {}
+    for blueprint_id, product_id in manufacturing.order_by("pk").values_list(
+        "eve_type_id", "product_eve_type_id"
+    ):
+        products.setdefault(blueprint_id, product_id)
+
+    meta_groups = dict(
+        invMetaTypes.objects.filter(
+            eve_type_id__in=manufacturing.values("product_eve_type_id")
+        ).values_list("eve_type_id", "meta_group_id")
+    )
+
+    bit_indexes = dict(
+        BlueprintEligibility.objects.filter(bit_index__isnull=False).values_list(
+            "eve_type_id", "bit_index"
+        )
+    )
+    next_bit_index = BlueprintEligibility.objects.aggregate(Max("bit_index"))[
+        "bit_index__max"
+    ]
+    next_bit_index = 0 if next_bit_index is None else next_bit_index + 1
+
+    excluded = set(wizardindustry_EXCLUDED_BLUEPRINTS)
+    prefixes = tuple(wizardindustry_EXCLUDED_BLUEPRINT_PREFIXES)
+    rows = []
+    for type_id, name, market_group_id in blueprint_types:
+        product_id = products.get(type_id)
+        if type_id in excluded or name.startswith(prefixes) or product_id is None:
+            is_eligible = False
+        elif product_id in meta_groups:
+            is_eligible = (
+                meta_groups[product_id] in wizardindustry_BLUEPRINT_META_GROUPS
+            )
+        else:  # no meta type data, plain tech 1
+            is_eligible = True
+        bit_index = bit_indexes.get(type_id)
+        if bit_index is None:
+            bit_index = next_bit_index
+            next_bit_index += 1
+        rows.append(
+            BlueprintEligibility(
+                eve_type_id=type_id,
+                product_eve_type_id=product_id,
+                market_group_id=market_group_id,
+                is_eligible=is_eligible,
+                bit_index=bit_index,
+            )
+        )
+
+    bulk_upsert(
+        BlueprintEligibility,
+        rows,
+        unique_fields=["eve_type"],
+        update_fields=[
+            "product_eve_type",
+            "market_group_id",
+            "is_eligible",
+            "bit_index",
+        ],
+    )
+    # kept ineligible rather than deleted, so their bit indexes stay taken
+    BlueprintEligibility.objects.exclude(
+        eve_type_id__in=[row.eve_type_id for row in rows]
+    ).update(is_eligible=False)
+
+    return sum(row.is_eligible for row in rows)
+
+
+def build_catalogue(version: int = None) -> Catalogue:
+    """Assemble the tree of market groups holding eligible blueprints."""
+    market_groups, children = _market_group_tree()
+
+    blueprints = {}
+    for type_id, name, market_group_id, base_price, build_cost in (
+        BlueprintEligibility.objects.filter(is_eligible=True)
+        .order_by("eve_type_id")
+        .values_list(
+            "eve_type_id",
+            "eve_type__name",
+            "market_group_id",
+            "eve_type__base_price__base_price",
+            "build_cost",
+        )
+    ):
+        blueprints.setdefault(market_group_id, []).append(
+            CatalogueBlueprint(type_id, name, base_price or 0, build_cost or 0)
+        )
+
+    groups = {
+        market_group_id: CatalogueGroup(
+            market_group_id,
+            market_groups[market_group_id][0],
+            market_groups[market_group_id][1],
+            tuple(children.get(market_group_id, ())),
+            tuple(blueprints.get(market_group_id, ())),
+        )
+        for market_group_id in _descendants(children, ROOT_MARKET_GROUP_ID)
+    }
+
+    return Catalogue(
+        version if version is not None else catalogue_version(),
+        tuple(children.get(ROOT_MARKET_GROUP_ID, ())),
+        groups,
+    )
@@ -0,0 +1,128 @@
+"""Estimated build cost of the eligible blueprints from their manufacturing materials
+
+The materials of all eligible blueprints are loaded once into a sparse matrix
+in coordinate form, one entry per (blueprint, material) pair. Multiplying it
+with a price vector prices every blueprint in a single `numpy.bincount`.
+"""
+
+# Standard Library
+from decimal import Decimal
+from typing import NamedTuple
+
+# Third Party
+import numpy as np
+
+# Alliance Auth (External Libs)
+from eveuniverse.models import EveIndustryActivityMaterial
+
+# AA wizardindustry App
+from wizardindustry.helpers.prices import get_price_table
+from wizardindustry.models import BlueprintEligibility
+
+MANUFACTURING_ACTIVITY_ID = 1
+
+
+class MaterialMatrix(NamedTuple):
+    blueprint_ids: np.ndarray
+    material_ids: np.ndarray
+    rows: np.ndarray
+    columns: np.ndarray
+    quantities: np.ndarray
+
+    def costs(self, prices: np.ndarray) -> np.ndarray:
+        """Material cost per run of every blueprint, `prices` by material column."""
+        return np.bincount(
+            self.rows,
+            weights=self.quantities * prices[self.columns],
+            minlength=len(self.blueprint_ids),
+        )
+
+
+_local = None
+
+
+def _eligible_blueprint_ids() -> np.ndarray:
+    return np.fromiter(
+        BlueprintEligibility.objects.filter(is_eligible=True)
+        .order_by("eve_type_id")
+        .values_list("eve_type_id", flat=True),
+        dtype=np.int64,
+    )
+
+
+def build_material_matrix(blueprint_ids: np.ndarray = None) -> MaterialMatrix:
+    """Manufacturing materials of the eligible blueprints, in one query."""
+    if blueprint_ids is None:
+        blueprint_ids = _eligible_blueprint_ids()
+
+    materials = np.array(
+        EveIndustryActivityMaterial.objects.filter(
+            activity_id=MANUFACTURING_ACTIVITY_ID,
+            eve_type__blueprint_eligibility__is_eligible=True,
+        ).values_list("eve_type_id", "material_eve_type_id", "quantity"),
+        dtype=np.int64,
+    ).reshape(-1, 3)
+
+    material_ids, columns = np.unique(materials[:, 1], return_inverse=True)
+    return MaterialMatrix(
+        blueprint_ids,
+        material_ids,
+        np.searchsorted(blueprint_ids, materials[:, 0]),
+        columns.reshape(-1),
+        materials[:, 2].astype(np.float64),
+    )
+
+
+def get_material_matrix(reload: bool = False) -> MaterialMatrix:
+    """The material matrix, rebuilt when the eligible blueprints change.
+
+    Use `reload` after eveuniverse industry data has been loaded again.
+    """
+    global _local
+
+    blueprint_ids = _eligible_blueprint_ids()
+    if (
+        reload
+        or _local is None
+        or not np.array_equal(_local.blueprint_ids, blueprint_ids)
+    ):
+        _local = build_material_matrix(blueprint_ids)
+    return _local
+
+
+def price_vector(type_ids: np.ndarray) -> np.ndarray:
+    """Average market price of each type, the adjusted price where there is none.
+
+    Types without a price are 0.
+    """
+    return get_price_table().lookup(type_ids)
+
+
+def update_build_costs(reload: bool = False) -> int:
+    """Price every eligible blueprint at current market prices.
+
+    Returns the number of blueprints whose build cost changed.
+    """
+    matrix = get_material_matrix(reload)
+    costs = dict(
+        zip(
+            matrix.blueprint_ids.tolist(),
+            matrix.costs(price_vector(matrix.material_ids)).round(2).tolist(),
+        )
+    )
+
+    changed = []
+    for row in BlueprintEligibility.objects.filter(is_eligible=True).only(
+        "pk", "eve_type_id", "build_cost"
+    ):
+        build_cost = Decimal(f"{costs.get(row.eve_type_id, 0):.2f}")
+        if row.build_cost != build_cost:
+            row.build_cost = build_cost
+            changed.append(row)
+
+    BlueprintEligibility.objects.bulk_update(changed, ["build_cost"], batch_size=1000)
+    BlueprintEligibility.objects.filter(
+        is_eligible=False, build_cost__isnull=False
+    ).update(build_cost=None)
+
+    return len(changed)
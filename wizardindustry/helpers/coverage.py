@@ -0,0 +1,118 @@
+"""Materialised blueprint library coverage per corporation and user"""
+
+# Third Party
+from blueprints.models import Blueprint
+
+# AA wizardindustry App
+from wizardindustry.helpers.catalogue import get_catalogue
+from wizardindustry.helpers.model_helpers import (
+    bump_cache_version,
+    cache_version,
+    sync_rows,
+)
+from wizardindustry.helpers.ownership import owned_blueprint_type_ids
+from wizardindustry.models import BlueprintCoverage
+
+VERSION_KEY = "wizardindustry-coverage-version"
+
+COVERAGE_FIELDS = ["owned_count", "blueprint_count", "base_cost", "build_cost"]
+
+
+def coverage_version() -> int:
+    """Current version of the coverage table, bumped whenever rows change."""
+    return cache_version(VERSION_KEY)
+
+
+def bump_coverage_version() -> int:
+    return bump_cache_version(VERSION_KEY)
+
+
+def compute_coverage(catalogue, owned_type_ids) -> dict:
+    """Owned count, blueprint count, remaining base and build cost per market group.
+
+    Filled bottom-up in one pass over the catalogue, groups without
+    blueprints are left out.
+    """
+    coverage = {}
+    pending = [(market_group_id, False) for market_group_id in catalogue.roots]
+    while pending:
+        market_group_id, children_done = pending.pop()
+        market_group = catalogue.groups[market_group_id]
+        if not children_done:
+            pending.append((market_group_id, True))
+            pending += [(child_id, False) for child_id in market_group.children]
+            continue
+
+        owned_count = blueprint_count = base_cost = build_cost = 0
+        for blueprint in market_group.blueprints:
+            blueprint_count += 1
+            if blueprint.type_id in owned_type_ids:
+                owned_count += 1
+            else:
+                base_cost += blueprint.base_cost
+                build_cost += blueprint.build_cost
+        for child_id in market_group.children:
+            if child_id in coverage:
+                child_owned, child_count, child_cost, child_build = coverage[child_id]
+                owned_count += child_owned
+                blueprint_count += child_count
+                base_cost += child_cost
+                build_cost += child_build
+
+        if blueprint_count:
+            coverage[market_group_id] = (
+                owned_count,
+                blueprint_count,
+                base_cost,
+                build_cost,
+            )
+    return coverage
+
+
+def corporation_owned_type_ids(corporation_pk: int) -> frozenset:
+    """Type ids of the blueprint originals owned by a corporation."""
+    return frozenset(
+        Blueprint.objects.filter(owner__corporation_id=corporation_pk, runs=None)
+        .values_list("eve_type_id", flat=True)
+        .distinct()
+    )
+
+
+def _sync_coverage(owner_filter: dict, coverage: dict) -> int:
+    return sync_rows(
+        BlueprintCoverage,
+        owner_filter,
+        ["market_group_id"],
+        COVERAGE_FIELDS,
+        {(market_group_id,): values for market_group_id, values in coverage.items()},
+    )
+
+
+def update_corporation_coverage(corporation_pk: int, catalogue=None) -> int:
+    catalogue = catalogue or get_catalogue()
+    return _sync_coverage(
+        {"corporation_id": corporation_pk},
+        compute_coverage(catalogue, corporation_owned_type_ids(corporation_pk)),
+    )
+
+
+def update_user_coverage(user, catalogue=None) -> int:
+    catalogue = catalogue or get_catalogue()
+    return _sync_coverage(
+        {"user_id": user.pk},
+        compute_coverage(catalogue, owned_blueprint_type_ids(user)),
+    )
+
+
+def user_coverage(user) -> dict:
+    """Coverage rows of `user` by market group, computed on the first visit.
+
+    Later changes are written by the `update_blueprint_coverage` task.
+    """
+    rows = {
+        row.market_group_id: row
+        for row in BlueprintCoverage.objects.filter(user_id=user.pk)
+    }
+    if not rows and update_user_coverage(user):
+        return user_coverage(user)
+    return rows
@@ -0,0 +1,164 @@
+"""Streaming CSV and JSON lines export of assets and industry jobs
+
+Rows are read with `values_list` and `QuerySet.iterator`, encoded a chunk at
+a time and optionally gzipped on the fly, so memory stays flat whatever the
+row count.
+"""
+
+# Standard Library
+import csv
+import io
+import json
+import zlib
+
+# AA wizardindustry App
+from wizardindustry.models import (
+    CharacterAsset,
+    CharacterIndustryJob,
+    CorporationAsset,
+    CorporationIndustryJob,
+)
+
+CHUNK_SIZE = 2000
+
+ASSET_COLUMNS = [
+    ("item_id", "item_id"),
+    ("type_id", "type_id"),
+    ("type_name", "type_name__name"),
+    ("name", "name"),
+    ("quantity", "quantity"),
+    ("location_id", "location_id"),
+    ("location_name", "location_name__location_name"),
+    ("location_flag", "location_flag"),
+    ("location_type", "location_type"),
+    ("singleton", "singleton"),
+    ("blueprint_copy", "blueprint_copy"),
+]
+
+JOB_COLUMNS = [
+    ("job_id", "job_id"),
+    ("status", "status"),
+    ("activity_id", "activity_id"),
+    ("blueprint_id", "blueprint_id"),
+    ("blueprint_type_id", "blueprint_type_id"),
+    ("blueprint_type_name", "blueprint_type_name__name"),
+    ("product_type_id", "product_type_id"),
+    ("product_type_name", "product_type_name__name"),
+    ("runs", "runs"),
+    ("licensed_runs", "licensed_runs"),
+    ("successful_runs", "successful_runs"),
+    ("cost", "cost"),
+    ("installer_id", "installer_id"),
+    ("facility_id", "facility_id"),
+    ("facility_name", "facility_name__location_name"),
+    ("output_location_id", "output_location_id"),
+    ("start_date", "start_date"),
+    ("end_date", "end_date"),
+    ("completed_date", "completed_date"),
+]
+
+CORPORATION_COLUMNS = [
+    ("corporation_id", "corporation__corporation_id"),
+    ("corporation_name", "corporation__corporation_name"),
+]
+
+CHARACTER_COLUMNS = [
+    ("character_id", "character__character__character_id"),
+    ("character_name", "character__character__character_name"),
+]
+
+# name: (model, owner field, columns)
+EXPORTS = {
+    "corporation_assets": (
+        CorporationAsset,
+        "corporation",
+        CORPORATION_COLUMNS + ASSET_COLUMNS,
+    ),
+    "character_assets": (
+        CharacterAsset,
+        "character",
+        CHARACTER_COLUMNS + ASSET_COLUMNS,
+    ),
+    "corporation_jobs": (
+        CorporationIndustryJob,
+        "corporation",
+        CORPORATION_COLUMNS + JOB_COLUMNS,
+    ),
+    "character_jobs": (
+        CharacterIndustryJob,
+        "character",
+        CHARACTER_COLUMNS + JOB_COLUMNS,
+    ),
+}
+
+FORMATS = {
+    "csv": "text/csv",
+    "jsonl": "application/x-ndjson",
+}
+
+
+def export_rows(name: str, owner_ids=None):
+    """Header and row iterator of export `name`.
+
+    `owner_ids` limits the export to those corporation or character ownership
+    pks, depending on the export, all rows are exported without it.
+    """
+    model, owner_field, columns = EXPORTS[name]
+    queryset = model.objects.all()
+    if owner_ids is not None:
+        queryset = queryset.filter(**{f"{owner_field}_id__in": owner_ids})
+
+    header = [column for column, _ in columns]
+    rows = (
+        queryset.order_by("pk")
+        .values_list(*[lookup for _, lookup in columns])
+        .iterator(chunk_size=CHUNK_SIZE)
+    )
+    return header, rows
+
+
+def _chunks(rows, size: int = CHUNK_SIZE):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def iter_csv(header, rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    yield buffer.getvalue()
+    for chunk in _chunks(rows):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(chunk)
+        yield buffer.getvalue()
+
+
+def iter_jsonl(header, rows):
+    for chunk in _chunks(rows):
+        yield "".join(
+            json.dumps(dict(zip(header, row)), default=str) + "\n" for row in chunk
+        )
+
+
+def iter_gzip(chunks):
+    """Gzip a stream of text chunks as it is consumed."""
+    compressor = zlib.compressobj(wbits=31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk.encode())
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def iter_export(name: str, export_format: str = "csv", owner_ids=None, gzip=False):
+    """Encoded chunks of export `name`, bytes when gzipped, text otherwise."""
+    header, rows = export_rows(name, owner_ids)
+    chunks = (iter_csv if export_format == "csv" else iter_jsonl)(header, rows)
+    return iter_gzip(chunks) if gzip else chunks
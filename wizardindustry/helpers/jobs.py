@@ -0,0 +1,139 @@
+"""Summary of the running industry jobs of every owner
+
+The running jobs of an owner are denormalised into `ActiveIndustryJob`, with
+the owner, product and facility names resolved, after each job sync. Only
+rows that changed are written and the version is only bumped when something
+did, so the per user lists read by the dashboard stay cached between syncs.
+Time remaining is left to the dashboard, the summary only changes with syncs.
+"""
+
+# Django
+from django.core.cache import cache
+from django.db.models import F, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+# AA wizardindustry App
+from wizardindustry.app_settings import wizardindustry_ACTIVE_JOBS_CACHE_TIMEOUT
+from wizardindustry.helpers.assets import asset_owners
+from wizardindustry.helpers.model_helpers import (
+    bump_cache_version,
+    cache_version,
+    sync_rows,
+)
+from wizardindustry.models import (
+    ActiveIndustryJob,
+    CharacterIndustryJob,
+    CorporationIndustryJob,
+    staStations,
+)
+
+VERSION_KEY = "wizardindustry-active-jobs-version"
+ACTIVE_JOBS_KEY = "wizardindustry-active-jobs-{}-{}"
+
+ACTIVE_STATUSES = ("active", "paused", "ready")
+
+SUMMARY_FIELDS = [
+    "owner_name",
+    "activity_id",
+    "status",
+    "runs",
+    "product_type_id",
+    "product_name",
+    "facility_id",
+    "facility_name",
+    "start_date",
+    "end_date",
+]
+
+
+def active_jobs_version() -> int:
+    """Current version of the active job summary, bumped whenever rows change."""
+    return cache_version(VERSION_KEY)
+
+
+def bump_active_jobs_version() -> int:
+    return bump_cache_version(VERSION_KEY)
+
+
+def compute_active_jobs(jobs, owner_name) -> dict:
+    """`SUMMARY_FIELDS` of the running jobs in `jobs` per (job id,)."""
+    return {
+        (row[0],): row[1:]
+        for row in jobs.filter(status__in=ACTIVE_STATUSES)
+        .annotate(
+            summary_owner_name=owner_name,
+            summary_product_name=Coalesce("product_type_name__name", Value("")),
+            summary_facility_name=Coalesce(
+                "facility_name__location_name",
+                Subquery(
+                    staStations.objects.filter(
+                        station_id=OuterRef("facility_id")
+                    ).values("station_name")
+                ),
+                Value(""),
+            ),
+        )
+        .values_list(
+            "job_id",
+            "summary_owner_name",
+            "activity_id",
+            "status",
+            "runs",
+            "product_type_id",
+            "summary_product_name",
+            "facility_id",
+            "summary_facility_name",
+            "start_date",
+            "end_date",
+        )
+    }
+
+
+def update_owner_active_jobs(owner, job_ids=None) -> int:
+    """Refresh the active job summary of one wizardindustry `Owner`.
+
+    `job_ids` are the jobs ESI listed in the last sync, jobs no longer listed
+    have finished whatever their stored status. Without it every job with a
+    running status is summarised.
+    """
+    if owner.corporation_owner:
+        owner_filter = {"corporation_id": owner.corporation_id}
+        jobs = CorporationIndustryJob.objects.filter(**owner_filter)
+        owner_name = F("corporation__corporation_name")
+    else:
+        owner_filter = {"character_id": owner.character_id}
+        jobs = CharacterIndustryJob.objects.filter(**owner_filter)
+        owner_name = F("character__character__character_name")
+
+    if job_ids is not None:
+        jobs = jobs.filter(job_id__in=job_ids)
+
+    return sync_rows(
+        ActiveIndustryJob,
+        owner_filter,
+        ["job_id"],
+        SUMMARY_FIELDS,
+        compute_active_jobs(jobs, owner_name),
+    )
+
+
+def active_jobs(user) -> list:
+    """The running jobs of the owners of `user`, by owner and end date.
+
+    Cached per user and summary version. Changes to a user's owners are only
+    picked up once `wizardindustry_ACTIVE_JOBS_CACHE_TIMEOUT` has passed.
+    """
+    key = ACTIVE_JOBS_KEY.format(user.pk, active_jobs_version())
+    jobs = cache.get(key)
+    if jobs is None:
+        corporation_ids, character_ownership_ids = asset_owners(user)
+        jobs = list(
+            ActiveIndustryJob.objects.filter(
+                Q(corporation_id__in=corporation_ids)
+                | Q(character_id__in=character_ownership_ids)
+            )
+            .order_by("owner_name", "end_date", "job_id")
+            .values("job_id", *SUMMARY_FIELDS)
+        )
+        cache.set(key, jobs, timeout=wizardindustry_ACTIVE_JOBS_CACHE_TIMEOUT)
+    return jobs
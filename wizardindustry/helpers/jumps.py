@@ -0,0 +1,154 @@
+"""Jump distances over the stargate graph and the nearest stockpiles of a type
+
+The stargates are compiled once per catalogue version into a compressed
+sparse row adjacency of solar system indexes. Distances from a system are a
+frontier by frontier breadth first search in numpy, kept as `int16` arrays in
+a small per process cache, so repeated lookups from the same system are free
+and an all-pairs matrix never has to be held.
+"""
+
+# Standard Library
+from collections import OrderedDict
+
+# Third Party
+import numpy as np
+
+# Alliance Auth (External Libs)
+from eveuniverse.models import EveStargate
+
+# AA wizardindustry App
+from wizardindustry.helpers.catalogue import catalogue_version
+from wizardindustry.helpers.rollups import stockpiles
+from wizardindustry.models import EveLocation, staStations
+
+UNREACHABLE = -1
+
+# Distance arrays kept per process, about 16 KB each for the whole of New Eden
+DISTANCE_CACHE_SIZE = 256
+
+
+class JumpGraph:
+    __slots__ = ("version", "system_ids", "indptr", "indices", "_distances")
+
+    def __init__(self, edges, version: int = None):
+        self.version = version
+        edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        # gates are one way in the data, jump both ways regardless
+        edges = np.unique(np.concatenate([edges, edges[:, ::-1]]), axis=0)
+
+        self.system_ids, nodes = np.unique(edges, return_inverse=True)
+        nodes = nodes.reshape(-1, 2)
+        self.indptr = np.zeros(len(self.system_ids) + 1, dtype=np.int64)
+        np.cumsum(
+            np.bincount(nodes[:, 0], minlength=len(self.system_ids)),
+            out=self.indptr[1:],
+        )
+        self.indices = nodes[:, 1]
+        self._distances = OrderedDict()
+
+    def index(self, system_id: int):
+        position = np.searchsorted(self.system_ids, system_id)
+        if position < len(self.system_ids) and self.system_ids[position] == system_id:
+            return int(position)
+        return None
+
+    def distances(self, system_id: int) -> np.ndarray:
+        """Jumps from `system_id` to every system by index, -1 if unreachable."""
+        distances = self._distances.get(system_id)
+        if distances is not None:
+            self._distances.move_to_end(system_id)
+            return distances
+
+        distances = np.full(len(self.system_ids), UNREACHABLE, dtype=np.int16)
+        source = self.index(system_id)
+        if source is not None:
+            distances[source] = 0
+            frontier = np.array([source])
+            jumps = 0
+            while len(frontier):
+                jumps += 1
+                starts = self.indptr[frontier]
+                lengths = self.indptr[frontier + 1] - starts
+                # positions of all neighbours of the frontier in `indices`
+                offsets = np.arange(lengths.sum()) - np.repeat(
+                    np.cumsum(lengths) - lengths, lengths
+                )
+                neighbours = self.indices[np.repeat(starts, lengths) + offsets]
+                frontier = np.unique(neighbours[distances[neighbours] == UNREACHABLE])
+                distances[frontier] = jumps
+
+        self._distances[system_id] = distances
+        if len(self._distances) > DISTANCE_CACHE_SIZE:
+            self._distances.popitem(last=False)
+        return distances
+
+    def jumps(self, from_system_id: int, to_system_ids) -> list:
+        """Jumps from `from_system_id` to each of `to_system_ids`, `None` if
+        unreachable or unknown.
+        """
+        distances = self.distances(from_system_id)
+        result = []
+        for system_id in to_system_ids:
+            position = None if system_id is None else self.index(system_id)
+            jumps = UNREACHABLE if position is None else int(distances[position])
+            result.append(None if jumps == UNREACHABLE else jumps)
+        return result
+
+
+def build_jump_graph(version: int = None) -> JumpGraph:
+    """The stargate graph, in one query."""
+    return JumpGraph(
+        EveStargate.objects.filter(
+            destination_eve_solar_system__isnull=False
+        ).values_list("eve_solar_system_id", "destination_eve_solar_system_id"),
+        version,
+    )
+
+
+_local = None
+
+
+def get_jump_graph() -> JumpGraph:
+    """The jump graph of the current catalogue version, kept in process."""
+    global _local
+
+    version = catalogue_version()
+    if _local is None or _local.version != version:
+        _local = build_jump_graph(version)
+    return _local
+
+
+def location_systems(location_ids) -> dict:
+    """Solar system of each known station or structure."""
+    systems = dict(
+        staStations.objects.filter(station_id__in=location_ids).values_list(
+            "station_id", "solar_system_id"
+        )
+    )
+    systems.update(
+        EveLocation.objects.filter(
+            location_id__in=location_ids, system__isnull=False
+        ).values_list("location_id", "system_id")
+    )
+    return systems
+
+
+def nearest_stockpiles(user, type_id: int, system_id: int, limit: int = 5) -> list:
+    """The `limit` stockpiles of `type_id` of the owners of `user` closest to
+    `system_id`, stockpiles in unknown or unreachable systems last.
+    """
+    rows = stockpiles(user, type_id)
+    systems = location_systems([row["location_id"] for row in rows])
+    for row, jumps in zip(
+        rows,
+        get_jump_graph().jumps(
+            system_id, [systems.get(row["location_id"]) for row in rows]
+        ),
+    ):
+        row["system_id"] = systems.get(row["location_id"])
+        row["jumps"] = jumps
+
+    return sorted(
+        rows,
+        key=lambda row: (row["jumps"] is None, row["jumps"] or 0, -row["quantity"]),
+    )[:limit]
@@ -0,0 +1,110 @@
+"""Two tier read-through cache for resolved locations
+
+Deletes only reach the in-process tier of the process making them, the
+entries of other processes expire after `wizardindustry_LOCATION_LOCAL_TIMEOUT`.
+"""
+
+# Standard Library
+import time
+from collections import OrderedDict
+from threading import Lock
+
+# Django
+from django.core.cache import cache
+from django.utils import timezone
+
+# AA wizardindustry App
+from wizardindustry.app_settings import (
+    wizardindustry_LOCATION_CACHE_SIZE,
+    wizardindustry_LOCATION_LOCAL_TIMEOUT,
+    wizardindustry_LOCATION_MAX_AGE,
+)
+
+CACHE_KEY = "wizardindustry-location-{}"
+
+
+class LRUCache:
+    """Small thread safe least recently used mapping, entries expire after
+    `timeout` seconds.
+    """
+
+    def __init__(self, maxsize: int, timeout: float):
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self._data = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key):
+        with self._lock:
+            try:
+                expires, value = self._data[key]
+            except KeyError:
+                return None
+            if expires <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.timeout, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+_local = LRUCache(
+    wizardindustry_LOCATION_CACHE_SIZE, wizardindustry_LOCATION_LOCAL_TIMEOUT
+)
+
+
+def is_fresh(last_update: float) -> bool:
+    """Whether a location refreshed at `last_update` is within the staleness window."""
+    return timezone.now().timestamp() - last_update < wizardindustry_LOCATION_MAX_AGE
+
+
+def get_location(location_id: int) -> tuple | None:
+    """Return the cached (location_id, name, system_id, last_update) entry.
+
+    The in-process tier is checked first, then the Django cache.
+    """
+    entry = _local.get(location_id)
+    if entry is None:
+        entry = cache.get(CACHE_KEY.format(location_id))
+        if entry is not None:
+            _local.set(location_id, entry)
+    return entry
+
+
+def set_location(location) -> tuple:
+    """Store a saved `EveLocation` in both tiers."""
+    entry = (
+        location.location_id,
+        location.location_name,
+        location.system_id,
+        location.last_update.timestamp(),
+    )
+    _local.set(location.location_id, entry)
+    cache.set(
+        CACHE_KEY.format(location.location_id),
+        entry,
+        timeout=wizardindustry_LOCATION_MAX_AGE,
+    )
+    return entry
+
+
+def delete_locations(location_ids):
+    """Drop locations from both tiers after they were written in bulk."""
+    location_ids = list(location_ids)
+    for location_id in location_ids:
+        _local.delete(location_id)
+    cache.delete_many([CACHE_KEY.format(location_id) for location_id in location_ids])
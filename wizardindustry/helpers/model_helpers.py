@@ -0,0 +1,85 @@
+"""Model helpers"""
+
+# Standard Library
+import time
+
+# Django
+from django.core.cache import cache
+from django.db import connections, router, transaction
+
+
+def bulk_upsert(model, objs, unique_fields, update_fields, batch_size=1000):
+    """Bulk insert rows, updating `update_fields` on rows that already exist.
+
+    MySQL resolves conflicts against any unique key and rejects an explicit
+    conflict target, so `unique_fields` is only passed where it is supported.
+    """
+    features = connections[router.db_for_write(model)].features
+    kwargs = {}
+    if features.supports_update_conflicts_with_target:
+        kwargs["unique_fields"] = unique_fields
+
+    return model.objects.bulk_create(
+        objs,
+        batch_size=batch_size,
+        update_conflicts=True,
+        update_fields=update_fields,
+        **kwargs,
+    )
+
+
+def sync_rows(model, owner_filter: dict, keys, fields, computed: dict) -> int:
+    """Write the rows of `model` of one owner that differ from `computed`.
+
+    `computed` maps a tuple of the `keys` fields to a tuple of the `fields`
+    values. Returns the number of rows created, updated or deleted.
+    """
+    existing = {
+        tuple(getattr(row, key) for key in keys): row
+        for row in model.objects.filter(**owner_filter)
+    }
+
+    created = []
+    updated = []
+    for key, values in computed.items():
+        row = existing.pop(key, None)
+        if row is None:
+            created.append(
+                model(
+                    **owner_filter,
+                    **dict(zip(keys, key)),
+                    **dict(zip(fields, values)),
+                )
+            )
+        elif tuple(getattr(row, field) for field in fields) != values:
+            for field, value in zip(fields, values):
+                setattr(row, field, value)
+            updated.append(row)
+
+    changed = len(created) + len(updated) + len(existing)
+    if not changed:
+        return 0
+
+    with transaction.atomic():
+        model.objects.bulk_create(created, batch_size=1000)
+        model.objects.bulk_update(updated, fields, batch_size=1000)
+        model.objects.filter(pk__in=[row.pk for row in existing.values()]).delete()
+
+    return changed
+
+
+def cache_version(key: str) -> int:
+    """Current version stored under `key`, shared by all processes."""
+    version = cache.get(key)
+    if version is None:
+        version = time.time_ns()
+        if not cache.add(key, version, timeout=None):
+            version = cache.get(key)
+    return version
+
+
+def bump_cache_version(key: str) -> int:
+    """Move the version under `key` on, entries keyed by the old one go stale."""
+    version = time.time_ns()
+    cache.set(key, version, timeout=None)
+    return version
@@ -0,0 +1,42 @@
+"""Cached sets of the blueprint types a user owns an original of"""
+
+# Third Party
+from blueprints.models import Blueprint
+
+# Django
+from django.core.cache import cache
+
+# AA wizardindustry App
+from wizardindustry.app_settings import wizardindustry_OWNERSHIP_CACHE_TIMEOUT
+from wizardindustry.helpers.model_helpers import bump_cache_version, cache_version
+
+VERSION_KEY = "wizardindustry-ownership-version"
+OWNED_TYPES_KEY = "wizardindustry-owned-types-{}-{}"
+
+
+def ownership_version() -> int:
+    """Current version of the aa-blueprints data, bumped on every change."""
+    return cache_version(VERSION_KEY)
+
+
+def bump_ownership_version() -> int:
+    return bump_cache_version(VERSION_KEY)
+
+
+def owned_blueprint_type_ids(user) -> frozenset:
+    """Type ids of the blueprint originals `user` has access to.
+
+    Cached per user and ownership version. Changes to a user's characters are
+    only picked up once `wizardindustry_OWNERSHIP_CACHE_TIMEOUT` has passed.
+    """
+    key = OWNED_TYPES_KEY.format(user.pk, ownership_version())
+    type_ids = cache.get(key)
+    if type_ids is None:
+        type_ids = frozenset(
+            Blueprint.objects.user_has_access(user)
+            .filter(runs=None)
+            .values_list("eve_type_id", flat=True)
+            .distinct()
+        )
+        cache.set(key, type_ids, timeout=wizardindustry_OWNERSHIP_CACHE_TIMEOUT)
+    return type_ids
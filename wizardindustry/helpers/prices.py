@@ -0,0 +1,172 @@
+"""Local market price cache and vectorised asset valuation
+
+Prices are refreshed in bulk from a price source, ESI by default or a JSON
+file set in `wizardindustry_MARKET_PRICE_FILE`. Every refresh that changes a
+price bumps the price version, and each process keeps the price table of the
+current version as sorted numpy arrays, so pricing a whole asset set is one
+`numpy.searchsorted` and one multiply.
+"""
+
+# Standard Library
+import json
+from decimal import Decimal
+from typing import NamedTuple
+
+# Third Party
+import numpy as np
+
+# Django
+from django.db.models import Sum
+from django.utils import timezone
+
+# AA wizardindustry App
+from wizardindustry.app_settings import wizardindustry_MARKET_PRICE_FILE
+from wizardindustry.helpers.model_helpers import (
+    bulk_upsert,
+    bump_cache_version,
+    cache_version,
+)
+from wizardindustry.models import MarketPrice
+from wizardindustry.providers import esi
+
+PRICE_VERSION_KEY = "wizardindustry-price-version"
+PRICE_FIELDS = ("average_price", "adjusted_price", "buy_price", "sell_price")
+
+
+class EsiPriceSource:
+    """Average and adjusted prices of all types from ESI."""
+
+    def prices(self):
+        for price in esi.client.Market.GetMarketsPrices().results(use_etag=False):
+            yield {
+                "type_id": price.type_id,
+                "average_price": price.average_price,
+                "adjusted_price": price.adjusted_price,
+            }
+
+
+class JsonFilePriceSource:
+    """Prices from a JSON list of objects with a `type_id` and any price fields."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def prices(self):
+        with open(self.path, encoding="utf-8") as file:
+            yield from json.load(file)
+
+
+def get_price_source():
+    if wizardindustry_MARKET_PRICE_FILE:
+        return JsonFilePriceSource(wizardindustry_MARKET_PRICE_FILE)
+    return EsiPriceSource()
+
+
+def price_version() -> int:
+    return cache_version(PRICE_VERSION_KEY)
+
+
+def bump_price_version() -> int:
+    return bump_cache_version(PRICE_VERSION_KEY)
+
+
+def _decimal(value):
+    return None if value is None else Decimal(f"{value:.2f}")
+
+
+def refresh_market_prices(source=None) -> int:
+    """Store the prices of `source`, only writing rows that changed.
+
+    Returns the number of changed types.
+    """
+    source = source or get_price_source()
+    existing = {
+        row[0]: row[1:]
+        for row in MarketPrice.objects.values_list("type_id", *PRICE_FIELDS)
+    }
+
+    now = timezone.now()
+    changed = []
+    for price in source.prices():
+        values = tuple(_decimal(price.get(field)) for field in PRICE_FIELDS)
+        if existing.get(price["type_id"]) != values:
+            changed.append(
+                MarketPrice(
+                    type_id=price["type_id"],
+                    updated=now,
+                    **dict(zip(PRICE_FIELDS, values)),
+                )
+            )
+
+    if changed:
+        bulk_upsert(MarketPrice, changed, ["type_id"], [*PRICE_FIELDS, "updated"])
+        bump_price_version()
+    return len(changed)
+
+
+class PriceTable(NamedTuple):
+    version: int
+    type_ids: np.ndarray
+    prices: dict
+
+    def lookup(self, type_ids, field: str = "average_price") -> np.ndarray:
+        """Price of each of `type_ids`, falling back to the average and adjusted
+        price. Types without a price are 0.
+        """
+        type_ids = np.asarray(type_ids, dtype=np.int64)
+        values = np.zeros(len(type_ids))
+        if not len(self.type_ids):
+            return values
+
+        positions = np.searchsorted(self.type_ids, type_ids).clip(
+            max=len(self.type_ids) - 1
+        )
+        found = self.type_ids[positions] == type_ids
+        values[found] = self.prices[field][positions[found]]
+        return values
+
+
+def build_price_table(version: int = None) -> PriceTable:
+    rows = np.array(
+        MarketPrice.objects.order_by("type_id").values_list("type_id", *PRICE_FIELDS),
+        dtype=np.float64,
+    ).reshape(-1, 1 + len(PRICE_FIELDS))
+    columns = {field: rows[:, 1 + i] for i, field in enumerate(PRICE_FIELDS)}
+
+    fallback = np.nan_to_num(
+        np.where(
+            np.isnan(columns["average_price"]),
+            columns["adjusted_price"],
+            columns["average_price"],
+        )
+    )
+    prices = {
+        field: np.where(np.isnan(values), fallback, values)
+        for field, values in columns.items()
+    }
+    return PriceTable(version, rows[:, 0].astype(np.int64), prices)
+
+
+_local = None
+
+
+def get_price_table() -> PriceTable:
+    """The price table of the current price version, kept in process."""
+    global _local
+
+    version = price_version()
+    if _local is None or _local.version != version:
+        _local = build_price_table(version)
+    return _local
+
+
+def value_assets(queryset, field: str = "average_price") -> float:
+    """Market value of the assets in `queryset`, blueprint copies are worthless."""
+    rows = np.array(
+        queryset.exclude(blueprint_copy=True)
+        .values_list("type_id")
+        .annotate(quantity=Sum("quantity"))
+        .order_by(),
+        dtype=np.int64,
+    ).reshape(-1, 2)
+    return float(get_price_table().lookup(rows[:, 0], field) @ rows[:, 1])
@@ -0,0 +1,238 @@
+"""Materialised asset value per owner, location and category, and asset
+quantity per type, owner and location
+
+Each owner's assets are loaded in one query, containers are resolved to the
+station or structure holding them in memory and the values are grouped with
+numpy, so a refresh does not join through the eveuniverse type tables per
+asset row. Only rows that changed are written, so refreshing after an asset
+sync writes the diff of the sync.
+"""
+
+# Standard Library
+from collections import defaultdict
+from decimal import Decimal
+
+# Third Party
+import numpy as np
+
+# Django
+from django.core.cache import cache
+from django.db.models import OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+# Alliance Auth (External Libs)
+from eveuniverse.models import EveCategory, EveType
+
+# AA wizardindustry App
+from wizardindustry.app_settings import wizardindustry_ASSET_VALUES_CACHE_TIMEOUT
+from wizardindustry.helpers.assets import asset_owners
+from wizardindustry.helpers.model_helpers import (
+    bump_cache_version,
+    cache_version,
+    sync_rows,
+)
+from wizardindustry.helpers.prices import get_price_table
+from wizardindustry.helpers.stock import root_locations
+from wizardindustry.models import (
+    AssetTypeLocation,
+    AssetValueRollup,
+    CharacterAsset,
+    CorporationAsset,
+    EveLocation,
+    staStations,
+)
+
+VERSION_KEY = "wizardindustry-asset-rollup-version"
+ASSET_VALUES_KEY = "wizardindustry-asset-values-{}-{}"
+
+ROLLUP_FIELDS = ["quantity", "value"]
+
+
+def rollup_version() -> int:
+    """Current version of the asset value rollup, bumped whenever rows change."""
+    return cache_version(VERSION_KEY)
+
+
+def bump_rollup_version() -> int:
+    return bump_cache_version(VERSION_KEY)
+
+
+def asset_rows(assets) -> list:
+    """The fields the rollups need of every asset in `assets`, in one query."""
+    return list(
+        assets.values_list(
+            "item_id", "location_id", "type_id", "quantity", "blueprint_copy"
+        )
+    )
+
+
+def compute_asset_rollup(rows) -> dict:
+    """Quantity and market value of `rows` per (location id, category id).
+
+    Locations are the stations and structures holding the assets, blueprint
+    copies are worthless and types without a category are category 0.
+    """
+    if not rows:
+        return {}
+
+    item_ids, location_ids, type_ids, quantities, blueprint_copies = zip(*rows)
+    roots = root_locations(dict(zip(item_ids, location_ids)))
+    categories = dict(
+        EveType.objects.filter(id__in=set(type_ids)).values_list(
+            "id", "eve_group__eve_category_id"
+        )
+    )
+
+    keys = np.array(
+        [
+            (roots[item_id], categories.get(type_id) or 0)
+            for item_id, type_id in zip(item_ids, type_ids)
+        ],
+        dtype=np.int64,
+    )
+    quantities = np.array(quantities, dtype=np.int64)
+    values = get_price_table().lookup(type_ids) * quantities
+    values[np.array(blueprint_copies, dtype=bool)] = 0
+
+    groups, inverse = np.unique(keys, axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    group_quantities = np.bincount(
+        inverse, weights=quantities, minlength=len(groups)
+    ).astype(np.int64)
+    group_values = np.bincount(inverse, weights=values, minlength=len(groups))
+
+    return {
+        (location_id, category_id): (quantity, Decimal(f"{value:.2f}"))
+        for (location_id, category_id), quantity, value in zip(
+            groups.tolist(), group_quantities.tolist(), group_values.tolist()
+        )
+    }
+
+
+def compute_type_locations(rows) -> dict:
+    """Quantity of `rows` per (type id, station or structure)."""
+    roots = root_locations({row[0]: row[1] for row in rows})
+    type_locations = defaultdict(int)
+    for item_id, _, type_id, quantity, _ in rows:
+        type_locations[(type_id, roots[item_id])] += quantity
+    return {key: (quantity,) for key, quantity in type_locations.items()}
+
+
+def update_owner_rollup(owner, type_locations: bool = True) -> int:
+    """Refresh the rollups of one wizardindustry `Owner`.
+
+    Without `type_locations` only the values are refreshed, for price changes.
+    """
+    if owner.corporation_owner:
+        owner_filter = {"corporation_id": owner.corporation_id}
+        assets = CorporationAsset.objects.filter(**owner_filter)
+    else:
+        owner_filter = {"character_id": owner.character_id}
+        assets = CharacterAsset.objects.filter(**owner_filter)
+
+    rows = asset_rows(assets)
+    changed = sync_rows(
+        AssetValueRollup,
+        owner_filter,
+        ["location_id", "category_id"],
+        ROLLUP_FIELDS,
+        compute_asset_rollup(rows),
+    )
+    if type_locations:
+        changed += sync_rows(
+            AssetTypeLocation,
+            owner_filter,
+            ["type_id", "location_id"],
+            ["quantity"],
+            compute_type_locations(rows),
+        )
+    return changed
+
+
+def _location_name():
+    """Name of the `location_id` station or structure, SDE stations included."""
+    return Coalesce(
+        Subquery(
+            EveLocation.objects.filter(location_id=OuterRef("location_id")).values(
+                "location_name"
+            )
+        ),
+        Subquery(
+            staStations.objects.filter(station_id=OuterRef("location_id")).values(
+                "station_name"
+            )
+        ),
+    )
+
+
+def stockpiles(user, type_id: int) -> list:
+    """Every station or structure holding `type_id` for the owners of `user`,
+    largest stockpile first.
+    """
+    corporation_ids, character_ownership_ids = asset_owners(user)
+    return list(
+        AssetTypeLocation.objects.filter(
+            Q(corporation_id__in=corporation_ids)
+            | Q(character_id__in=character_ownership_ids),
+            type_id=type_id,
+        )
+        .annotate(
+            owner_name=Coalesce(
+                "corporation__corporation_name",
+                "character__character__character_name",
+            ),
+            location_name=_location_name(),
+        )
+        .order_by("-quantity", "location_id")
+        .values("location_id", "location_name", "owner_name", "quantity")
+    )
+
+
+def asset_values(user) -> dict:
+    """Value of the assets of the owners of `user` per location and category.
+
+    Cached per user and rollup version. Categories without a name are left
+    `None`. Changes to a user's owners and location renames are only picked
+    up once `wizardindustry_ASSET_VALUES_CACHE_TIMEOUT` has passed.
+    """
+    key = ASSET_VALUES_KEY.format(user.pk, rollup_version())
+    values = cache.get(key)
+    if values is None:
+        corporation_ids, character_ownership_ids = asset_owners(user)
+        rollup = AssetValueRollup.objects.filter(
+            Q(corporation_id__in=corporation_ids)
+            | Q(character_id__in=character_ownership_ids)
+        )
+
+        locations = list(
+            rollup.values("location_id")
+            .annotate(
+                quantity=Sum("quantity"),
+                value=Sum("value"),
+                location_name=_location_name(),
+            )
+            .order_by("-value", "location_id")
+        )
+        for row in locations:
+            row["name"] = row.pop("location_name") or row["location_id"]
+
+        categories = list(
+            rollup.values("category_id")
+            .annotate(quantity=Sum("quantity"), value=Sum("value"))
+            .order_by("-value", "category_id")
+        )
+        category_names = dict(
+            EveCategory.objects.filter(
+                id__in=[row["category_id"] for row in categories]
+            ).values_list("id", "name")
+        )
+        for row in categories:
+            row["name"] = category_names.get(row["category_id"])
+
+        values = {
+            "locations": locations,
+            "categories": categories,
+            "total": sum(row["value"] for row in locations),
+        }
+        cache.set(key, values, timeout=wizardindustry_ASSET_VALUES_CACHE_TIMEOUT)
+    return values
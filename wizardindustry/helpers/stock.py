@@ -0,0 +1,144 @@
+"""Match bills of materials against the assets of corporations and characters"""
+
+# Standard Library
+from collections import defaultdict
+from typing import NamedTuple
+
+# Django
+from django.db.models import Sum
+
+# AA wizardindustry App
+from wizardindustry.models import CharacterAsset, CorporationAsset
+
+# Ships in containers in a station are three levels deep, leave some room
+MAX_CONTAINER_DEPTH = 6
+
+
+class StockMatch(NamedTuple):
+    stock: dict
+    shortfall: dict
+    location_shortfall: dict
+
+
+def root_locations(parents: dict, location_ids=None) -> dict:
+    """Station or structure at the top of each location, following containers.
+
+    `parents` maps item ids to their location id, locations that are not in
+    it are their own root. Resolves every item of `parents` by default.
+    """
+    roots = {}
+    for location_id in parents if location_ids is None else location_ids:
+        chain = []
+        current = location_id
+        while (
+            current in parents
+            and current not in roots
+            and len(chain) < MAX_CONTAINER_DEPTH
+        ):
+            chain.append(current)
+            current = parents[current]
+        root = roots.get(current, current)
+        for link in chain:
+            roots[link] = root
+        roots[location_id] = root
+    return roots
+
+
+def _container_parents(querysets, location_ids) -> dict:
+    """Location of each of `location_ids` that is an item, and of its parents.
+
+    Every round loads one level of nesting for all pending locations in a
+    single query per asset table.
+    """
+    parents = {}
+    pending = set(location_ids)
+    for _ in range(MAX_CONTAINER_DEPTH):
+        if not pending:
+            break
+        level = {}
+        for queryset in querysets:
+            level.update(
+                queryset.filter(item_id__in=pending).values_list(
+                    "item_id", "location_id"
+                )
+            )
+        parents.update(level)
+        pending = set(level.values()) - parents.keys()
+    return parents
+
+
+def match_stock(
+    materials: dict,
+    corporation_ids=(),
+    character_ownership_ids=(),
+    location_ids=None,
+) -> StockMatch:
+    """Subtract the assets held by the given owners from `materials`.
+
+    `materials` is a quantity per type id, for instance
+    `BillOfMaterials.materials`. Assets in containers count towards the
+    station or structure holding them, `location_ids` limits the stock to
+    those stations and structures.
+
+    Returns the stock per type and location, the shortfall per type when all
+    locations are pooled and the shortfall per type for building at each
+    location holding stock.
+    """
+    querysets = []
+    if corporation_ids:
+        querysets.append(
+            CorporationAsset.objects.filter(corporation_id__in=corporation_ids)
+        )
+    if character_ownership_ids:
+        querysets.append(
+            CharacterAsset.objects.filter(character_id__in=character_ownership_ids)
+        )
+
+    held = defaultdict(int)
+    for queryset in querysets:
+        for row in (
+            queryset.filter(type_id__in=list(materials))
+            .values("type_id", "location_id")
+            .annotate(total=Sum("quantity"))
+            .order_by()
+        ):
+            held[(row["type_id"], row["location_id"])] += row["total"]
+
+    held_location_ids = {location_id for _, location_id in held}
+    roots = root_locations(
+        _container_parents(querysets, held_location_ids), held_location_ids
+    )
+
+    stock = defaultdict(lambda: defaultdict(int))
+    for (type_id, location_id), quantity in held.items():
+        root = roots.get(location_id, location_id)
+        if location_ids is None or root in location_ids:
+            stock[type_id][root] += quantity
+
+    shortfall = {}
+    for type_id, needed in materials.items():
+        missing = needed - sum(stock[type_id].values())
+        if missing > 0:
+            shortfall[type_id] = missing
+
+    locations = {
+        location_id for by_location in stock.values() for location_id in by_location
+    }
+    location_shortfall = {}
+    for location_id in locations:
+        missing = {
+            type_id: needed - stock[type_id].get(location_id, 0)
+            for type_id, needed in materials.items()
+            if needed > stock[type_id].get(location_id, 0)
+        }
+        location_shortfall[location_id] = missing
+
+    return StockMatch(
+        {
+            type_id: dict(by_location)
+            for type_id, by_location in stock.items()
+            if by_location
+        },
+        shortfall,
+        location_shortfall,
+    )
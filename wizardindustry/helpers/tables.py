@@ -0,0 +1,223 @@
+"""Server-side asset and industry job tables with keyset pagination
+
+Requests use the DataTables parameter names, `draw`, `length`,
+`search[value]`, `order[0][column]`, `order[0][dir]`, `columns[i][data]` and
+`columns[i][search][value]`, except that pages are addressed by the `next`
+cursor of the previous page instead of a `start` offset, and no row counts
+are returned.
+
+Every owner is read on its own, seeking past the cursor on an (owner, sort
+columns, primary key) index, and the pages of the owners are merged. Page 500
+costs the same as page 1, as no rows before the cursor are read.
+"""
+
+# Standard Library
+import base64
+import heapq
+import json
+
+# Django
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+# Alliance Auth (External Libs)
+from eveuniverse.models import EveType
+
+# AA wizardindustry App
+from wizardindustry.helpers.assets import asset_owners, name_lookup
+from wizardindustry.helpers.export import EXPORTS
+
+MAX_LENGTH = 500
+
+# column: fields of the keyset, the primary key is always appended
+ASSET_ORDERINGS = {
+    "location_id": ("location_id",),
+    "type_id": ("type_id",),
+}
+JOB_ORDERINGS = {
+    "end_date": ("end_date",),
+    "status": ("status", "end_date"),
+}
+
+# name: (orderings, filterable columns, type field searched by name)
+TABLES = {
+    "corporation_assets": (ASSET_ORDERINGS, ("location_id", "type_id"), "type_id"),
+    "character_assets": (ASSET_ORDERINGS, ("location_id", "type_id"), "type_id"),
+    "corporation_jobs": (JOB_ORDERINGS, ("status",), "product_type_id"),
+    "character_jobs": (JOB_ORDERINGS, ("status",), "product_type_id"),
+}
+
+# owner field: (owner column, EVE id lookup on the owner model)
+OWNER_COLUMNS = {
+    "corporation": ("corporation_id", "corporation_id"),
+    "character": ("character_id", "character__character_id"),
+}
+
+
+def _field(model, attname: str):
+    if attname == "pk":
+        return model._meta.pk
+    return next(
+        field for field in model._meta.concrete_fields if field.attname == attname
+    )
+
+
+def encode_cursor(values) -> str:
+    # str keeps the microseconds of datetimes, the keyset compares them exactly
+    return base64.urlsafe_b64encode(
+        json.dumps(list(values), default=str).encode()
+    ).decode()
+
+
+def decode_cursor(model, fields, cursor: str) -> tuple:
+    """Keyset values of `cursor`, `ValueError` if it does not fit `fields`."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if not isinstance(values, list) or len(values) != len(fields):
+            raise ValueError("invalid cursor")
+        return tuple(
+            _field(model, field).to_python(value)
+            for field, value in zip(fields, values)
+        )
+    except (TypeError, ValidationError, UnicodeError, json.JSONDecodeError) as exc:
+        raise ValueError("invalid cursor") from exc
+
+
+def after(fields, values, descending: bool = False) -> Q:
+    """Rows sorting after `values` of `fields`, a row value comparison."""
+    lookup = "lt" if descending else "gt"
+    condition = None
+    for field, value in reversed(list(zip(fields, values))):
+        strict = Q(**{f"{field}__{lookup}": value})
+        condition = (
+            strict if condition is None else strict | Q(condition, **{field: value})
+        )
+    return condition
+
+
+class TableRequest:
+    """The parameters of one table page, validated."""
+
+    __slots__ = ("draw", "length", "order", "descending", "search", "filters", "cursor")
+
+    def __init__(self, name: str, params):
+        orderings, filterable, _ = TABLES[name]
+        owner_column = OWNER_COLUMNS[EXPORTS[name][1]][0]
+        columns = {}
+        index = 0
+        while f"columns[{index}][data]" in params:
+            columns[index] = params[f"columns[{index}][data]"]
+            index += 1
+
+        try:
+            self.draw = int(params.get("draw", 0))
+            self.length = int(params.get("length", 50))
+            order_column = params.get("order[0][column]")
+            self.order = (
+                columns[int(order_column)] if order_column is not None else None
+            )
+        except (KeyError, ValueError) as exc:
+            raise ValueError("draw, length and order must be integers") from exc
+        if not 1 <= self.length <= MAX_LENGTH:
+            raise ValueError(f"length must be 1 to {MAX_LENGTH}")
+        if self.order is None:
+            self.order = next(iter(orderings))
+        if self.order != owner_column and self.order not in orderings:
+            raise ValueError(f"{self.order} is not sortable")
+        self.descending = params.get("order[0][dir]", "asc") == "desc"
+
+        self.search = params.get("search[value]", "").strip()
+        self.filters = {}
+        for index, column in columns.items():
+            value = params.get(f"columns[{index}][search][value]", "").strip()
+            if value:
+                if column != owner_column and column not in filterable:
+                    raise ValueError(f"{column} is not filterable")
+                self.filters[column] = value
+        self.cursor = params.get("cursor") or None
+
+
+def table_columns(name: str) -> list:
+    """Columns of table `name`, with whether each is sortable and filterable."""
+    _, owner_field, columns = EXPORTS[name]
+    orderings, filterable, _ = TABLES[name]
+    owner_column = OWNER_COLUMNS[owner_field][0]
+    return [
+        {
+            "data": column,
+            "sortable": column == owner_column or column in orderings,
+            "filterable": column == owner_column or column in filterable,
+        }
+        for column, _ in columns
+    ]
+
+
+def _owner_ids(name: str, user, owner_filter) -> list:
+    """Owner pks of `user` for table `name`, the `owner_filter` EVE id only."""
+    model, owner_field, _ = EXPORTS[name]
+    corporation_ids, character_ownership_ids = asset_owners(user)
+    owner_ids = (
+        corporation_ids if owner_field == "corporation" else character_ownership_ids
+    )
+    if owner_filter is None:
+        return sorted(owner_ids)
+
+    owner_column, eve_id_lookup = OWNER_COLUMNS[owner_field]
+    return sorted(
+        _field(model, owner_column)
+        .related_model.objects.filter(pk__in=owner_ids, **{eve_id_lookup: owner_filter})
+        .values_list("pk", flat=True)
+    )
+
+
+def table_page(name: str, user, table: TableRequest) -> dict:
+    """One page of table `name` of the owners of `user`."""
+    model, owner_field, columns = EXPORTS[name]
+    orderings, _, type_field = TABLES[name]
+    owner_column = OWNER_COLUMNS[owner_field][0]
+
+    keys = (*orderings.get(table.order, (owner_column,)), "pk")
+    filters = dict(table.filters)
+    owner_ids = _owner_ids(name, user, filters.pop(owner_column, None))
+
+    queryset = model.objects.filter(**filters)
+    if table.search:
+        queryset = queryset.filter(
+            **{
+                f"{type_field}__in": EveType.objects.filter(
+                    **{name_lookup("name"): table.search}
+                ).values("id")
+            }
+        )
+    if table.cursor:
+        queryset = queryset.filter(
+            after(keys, decode_cursor(model, keys, table.cursor), table.descending)
+        )
+
+    ordering = [f"-{key}" if table.descending else key for key in keys]
+    lookups = [lookup for _, lookup in columns]
+    pages = [
+        list(
+            queryset.filter(**{owner_column: owner_id})
+            .order_by(*ordering)
+            .values_list(*keys, *lookups)[: table.length + 1]
+        )
+        for owner_id in owner_ids
+    ]
+    rows = list(
+        heapq.merge(
+            *pages,
+            key=lambda row: row[: len(keys)],
+            reverse=table.descending,
+        )
+    )[: table.length + 1]
+
+    page = rows[: table.length]
+    header = [column for column, _ in columns]
+    return {
+        "draw": table.draw,
+        "data": [dict(zip(header, row[len(keys) :])) for row in page],
+        "next": (
+            encode_cursor(page[-1][: len(keys)]) if len(rows) > table.length else None
+        ),
+    }
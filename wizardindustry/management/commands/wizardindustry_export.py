@@ -0,0 +1,49 @@
+"""Export assets or industry jobs as CSV or JSON lines"""
+
+# Standard Library
+import sys
+
+# Django
+from django.core.management.base import BaseCommand
+
+# AA wizardindustry App
+from wizardindustry.helpers.export import EXPORTS, FORMATS, iter_export
+
+
+class Command(BaseCommand):
+    help = "Stream assets or industry jobs of all owners as CSV or JSON lines"
+
+    def add_arguments(self, parser):
+        parser.add_argument("name", choices=sorted(EXPORTS))
+        parser.add_argument("--format", choices=sorted(FORMATS), default="csv")
+        parser.add_argument(
+            "--gzip", action="store_true", help="Compress the output with gzip"
+        )
+        parser.add_argument(
+            "--owner",
+            type=int,
+            action="append",
+            help="Only export this corporation or character ownership pk, repeatable",
+        )
+        parser.add_argument(
+            "--output", help="File to write to instead of standard output"
+        )
+
+    def handle(self, *args, **options):
+        chunks = iter_export(
+            options["name"], options["format"], options["owner"], options["gzip"]
+        )
+        if options["output"]:
+            if options["gzip"]:
+                output = open(options["output"], "wb")
+            else:
+                output = open(options["output"], "w", encoding="utf-8", newline="")
+            with output:
+                for chunk in chunks:
+                    output.write(chunk)
+        elif options["gzip"]:
+            for chunk in chunks:
+                sys.stdout.buffer.write(chunk)
+        else:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
@@ -0,0 +1,24 @@
+# Generated by Django 4.2.30 on 2026-10-19 07:26
+
+# Django
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("wizardindustry", "0008_corporationindustryjob_characterindustryjob"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="staStations",
+            fields=[
+                ("station_id", models.IntegerField(primary_key=True, serialize=False)),
+                ("station_name", models.CharField(max_length=255)),
+                ("solar_system_id", models.IntegerField()),
+                ("constellation_id", models.IntegerField(blank=True, null=True)),
+                ("region_id", models.IntegerField(blank=True, null=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 4.2.30 on 2026-10-19 07:33
+
+# Django
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("eveuniverse", "0012_alter_evebloodline_eve_ship_type"),
+        ("wizardindustry", "0009_stastations"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BlueprintEligibility",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("market_group_id", models.IntegerField(blank=True, null=True)),
+                ("is_eligible", models.BooleanField(default=False)),
+                (
+                    "eve_type",
+                    models.OneToOneField(
+                        default=None,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="blueprint_eligibility",
+                        to="eveuniverse.evetype",
+                    ),
+                ),
+                (
+                    "product_eve_type",
+                    models.ForeignKey(
+                        default=None,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="eveuniverse.evetype",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["is_eligible", "market_group_id"],
+                        name="wizardindus_is_elig_c5746b_idx",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,83 @@
+# Generated by Django 4.2.30 on 2026-10-19 07:48
+
+# Django
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("eveonline", "0017_alliance_and_corp_names_are_not_unique"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("wizardindustry", "0010_blueprinteligibility"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BlueprintCoverage",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("market_group_id", models.IntegerField()),
+                ("owned_count", models.PositiveIntegerField(default=0)),
+                ("blueprint_count", models.PositiveIntegerField(default=0)),
+                (
+                    "base_cost",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=20),
+                ),
+                (
+                    "corporation",
+                    models.ForeignKey(
+                        default=None,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="eveonline.evecorporationinfo",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        default=None,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="blueprintcoverage",
+            constraint=models.UniqueConstraint(
+                fields=("corporation", "market_group_id"),
+                name="wizardindustry_coverage_corporation",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="blueprintcoverage",
+            constraint=models.UniqueConstraint(
+                fields=("user", "market_group_id"), name="wizardindustry_coverage_user"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="blueprintcoverage",
+            constraint=models.CheckConstraint(
+                check=models.Q(
+                    models.Q(("corporation__isnull", True), ("user__isnull", False)),
+                    models.Q(("corporation__isnull", False), ("user__isnull", True)),
+                    _connector="OR",
+                ),
+                name="wizardindustry_coverage_owner",
+            ),
+        ),
+    ]
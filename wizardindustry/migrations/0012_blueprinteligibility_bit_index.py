@@ -0,0 +1,28 @@
+# Generated by Django 4.2.30 on 2026-10-19 07:51
+
+# Django
+from django.db import migrations, models
+
+
+def assign_bit_indexes(apps, schema_editor):
+    BlueprintEligibility = apps.get_model("wizardindustry", "BlueprintEligibility")
+    rows = list(BlueprintEligibility.objects.order_by("eve_type_id"))
+    for bit_index, row in enumerate(rows):
+        row.bit_index = bit_index
+    BlueprintEligibility.objects.bulk_update(rows, ["bit_index"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("wizardindustry", "0011_blueprintcoverage"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="blueprinteligibility",
+            name="bit_index",
+            field=models.PositiveIntegerField(default=None, null=True, unique=True),
+        ),
+        migrations.RunPython(assign_bit_indexes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.30 on 2026-10-19 07:54
+
+# Django
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("wizardindustry", "0012_blueprinteligibility_bit_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="blueprintcoverage",
+            name="build_cost",
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=20),
+        ),
+        migrations.AddField(
+            model_name="blueprinteligibility",
+            name="build_cost",
+            field=models.DecimalField(
+                blank=True, decimal_places=2, default=None, max_digits=20, null=True
+            ),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.30 on 2026-10-19 08:00
+
+# Django
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("wizardindustry", "0013_build_cost"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="characterasset",
+            index=models.Index(
+                fields=["character", "type_id"], name="wizardindus_charact_21553a_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="corporationasset",
+            index=models.Index(
+                fields=["corporation", "type_id"], name="wizardindus_corpora_13e6d7_idx"
+            ),
+        ),
+    ]
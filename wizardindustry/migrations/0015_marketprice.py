@@ -0,0 +1,48 @@
+# Generated by Django 4.2.30 on 2026-10-19 08:04
+
+# Django
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("wizardindustry", "0014_asset_type_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MarketPrice",
+            fields=[
+                (
+                    "type_id",
+                    models.PositiveIntegerField(primary_key=True, serialize=False),
+                ),
+                (
+                    "average_price",
+                    models.DecimalField(
+                        decimal_places=2, default=None, max_digits=20, null=True
+                    ),
+                ),
+                (
+                    "adjusted_price",
+                    models.DecimalField(
+                        decimal_places=2, default=None, max_digits=20, null=True
+                    ),
+                ),
+                (
+                    "buy_price",
+                    models.DecimalField(
+                        decimal_places=2, default=None, max_digits=20, null=True
+                    ),
+                ),
+                (
+                    "sell_price",
+                    models.DecimalField(
+                        decimal_places=2, default=None, max_digits=20, null=True
+                    ),
+                ),
+                ("updated", models.DateTimeField()),
+            ],
+        ),
+    ]
@@ -0,0 +1,87 @@
+# Generated by Django 4.2.30 on 2026-10-19 08:06
+
+# Django
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authentication", "0025_userprofile_minimize_sidebar"),
+        ("eveonline", "0017_alliance_and_corp_names_are_not_unique"),
+        ("wizardindustry", "0015_marketprice"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AssetValueRollup",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("location_id", models.BigIntegerField()),
+                ("category_id", models.IntegerField()),
+                ("quantity", models.BigIntegerField(default=0)),
+                (
+                    "value",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=20),
+                ),
+                (
+                    "character",
+                    models.ForeignKey(
+                        default=None,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="authentication.characterownership",
+                    ),
+                ),
+                (
+                    "corporation",
+                    models.ForeignKey(
+                        default=None,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="eveonline.evecorporationinfo",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="assetvaluerollup",
+            constraint=models.UniqueConstraint(
+                fields=("corporation", "location_id", "category_id"),
+                name="wizardindustry_rollup_corporation",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="assetvaluerollup",
+            constraint=models.UniqueConstraint(
+                fields=("character", "location_id", "category_id"),
+                name="wizardindustry_rollup_character",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="assetvaluerollup",
+            constraint=models.CheckConstraint(
+                check=models.Q(
+                    models.Q(
+                        ("character__isnull", False), ("corporation__isnull", True)
+                    ),
+                    models.Q(
+                        ("character__isnull", True), ("corporation__isnull", False)
+                    ),
+                    _connector="OR",
+                ),
+                name="wizardindustry_rollup_owner",
+            ),
+        ),
+    ]
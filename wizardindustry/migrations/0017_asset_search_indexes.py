@@ -0,0 +1,53 @@
+# Generated by Django 4.2.30 on 2026-10-19 08:09
+
+# Django
+from django.db import migrations, models
+
+TRIGRAM_INDEXES = [
+    ("wizardindustry_evelocation", "location_name"),
+    ("wizardindustry_characterasset", "name"),
+    ("wizardindustry_corporationasset", "name"),
+]
+
+
+def create_trigram_indexes(apps, schema_editor):
+    """Substring search indexes, PostgreSQL only."""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for table, column in TRIGRAM_INDEXES:
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {table}_{column}_trgm "
+            f"ON {table} USING gin (UPPER({column}) gin_trgm_ops)"
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for table, column in TRIGRAM_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {table}_{column}_trgm")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("wizardindustry", "0016_assetvaluerollup"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="evelocation",
+            name="location_name",
+            field=models.CharField(db_index=True, max_length=255),
+        ),
+        migrations.AddIndex(
+            model_name="characterasset",
+            index=models.Index(fields=["name"], name="wizardindus_name_ad4608_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="corporationasset",
+            index=models.Index(fields=["name"], name="wizardindus_name_1b887d_idx"),
+        ),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,83 @@
+# Generated by Django 4.2.30 on 2026-10-19 08:21
+
+# Django
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authentication", "0025_userprofile_minimize_sidebar"),
+        ("eveonline", "0017_alliance_and_corp_names_are_not_unique"),
+        ("wizardindustry", "0017_asset_search_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AssetTypeLocation",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("type_id", models.IntegerField()),
+                ("location_id", models.BigIntegerField()),
+                ("quantity", models.BigIntegerField(default=0)),
+                (
+                    "character",
+                    models.ForeignKey(
+                        default=None,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="authentication.characterownership",
+                    ),
+                ),
+                (
+                    "corporation",
+                    models.ForeignKey(
+                        default=None,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="eveonline.evecorporationinfo",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="assettypelocation",
+            constraint=models.UniqueConstraint(
+                fields=("type_id", "corporation", "location_id"),
+                name="wizardindustry_type_location_corporation",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="assettypelocation",
+            constraint=models.UniqueConstraint(
+                fields=("type_id", "character", "location_id"),
+                name="wizardindustry_type_location_character",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="assettypelocation",
+            constraint=models.CheckConstraint(
+                check=models.Q(
+                    models.Q(
+                        ("character__isnull", False), ("corporation__isnull", True)
+                    ),
+                    models.Q(
+                        ("character__isnull", True), ("corporation__isnull", False)
+                    ),
+                    _connector="OR",
+                ),
+                name="wizardindustry_type_location_owner",
+            ),
+        ),
+    ]
@@ -0,0 +1,90 @@
+# Generated by Django 4.2.30 on 2026-10-19 08:30
+
+# Django
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("wizardindustry", "0018_assettypelocation"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="characterasset",
+            name="wizardindus_charact_21553a_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="corporationasset",
+            name="wizardindus_corpora_13e6d7_idx",
+        ),
+        migrations.AddIndex(
+            model_name="characterasset",
+            index=models.Index(
+                fields=["character", "id"], name="wizardindus_charact_08381a_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="characterasset",
+            index=models.Index(
+                fields=["character", "location_id", "id"],
+                name="wizardindus_charact_a56a4c_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="characterasset",
+            index=models.Index(
+                fields=["character", "type_id", "id"],
+                name="wizardindus_charact_ca92a7_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="characterindustryjob",
+            index=models.Index(
+                fields=["character", "end_date", "id"],
+                name="wizardindus_charact_2ba709_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="characterindustryjob",
+            index=models.Index(
+                fields=["character", "status", "end_date", "id"],
+                name="wizardindus_charact_ae398e_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="corporationasset",
+            index=models.Index(
+                fields=["corporation", "id"], name="wizardindus_corpora_c1474f_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="corporationasset",
+            index=models.Index(
+                fields=["corporation", "location_id", "id"],
+                name="wizardindus_corpora_a6b6d4_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="corporationasset",
+            index=models.Index(
+                fields=["corporation", "type_id", "id"],
+                name="wizardindus_corpora_f48283_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="corporationindustryjob",
+            index=models.Index(
+                fields=["corporation", "end_date", "job_id"],
+                name="wizardindus_corpora_b59492_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="corporationindustryjob",
+            index=models.Index(
+                fields=["corporation", "status", "end_date", "job_id"],
+                name="wizardindus_corpora_440b2d_idx",
+            ),
+        ),
+    ]
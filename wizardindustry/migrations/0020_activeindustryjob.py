@@ -0,0 +1,91 @@
+# Generated by Django 4.2.30 on 2026-10-19 08:35
+
+# Django
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authentication", "0025_userprofile_minimize_sidebar"),
+        ("eveonline", "0017_alliance_and_corp_names_are_not_unique"),
+        ("wizardindustry", "0019_table_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ActiveIndustryJob",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("owner_name", models.CharField(default="", max_length=255)),
+                ("job_id", models.IntegerField()),
+                ("activity_id", models.IntegerField()),
+                ("status", models.CharField(max_length=15)),
+                ("runs", models.IntegerField()),
+                ("product_type_id", models.IntegerField()),
+                ("product_name", models.CharField(default="", max_length=255)),
+                ("facility_id", models.BigIntegerField()),
+                ("facility_name", models.CharField(default="", max_length=255)),
+                ("start_date", models.DateTimeField()),
+                ("end_date", models.DateTimeField()),
+                (
+                    "character",
+                    models.ForeignKey(
+                        default=None,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="authentication.characterownership",
+                    ),
+                ),
+                (
+                    "corporation",
+                    models.ForeignKey(
+                        default=None,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="eveonline.evecorporationinfo",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="activeindustryjob",
+            constraint=models.UniqueConstraint(
+                fields=("corporation", "job_id"),
+                name="wizardindustry_active_job_corporation",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="activeindustryjob",
+            constraint=models.UniqueConstraint(
+                fields=("character", "job_id"),
+                name="wizardindustry_active_job_character",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="activeindustryjob",
+            constraint=models.CheckConstraint(
+                check=models.Q(
+                    models.Q(
+                        ("character__isnull", False), ("corporation__isnull", True)
+                    ),
+                    models.Q(
+                        ("character__isnull", True), ("corporation__isnull", False)
+                    ),
+                    _connector="OR",
+                ),
+                name="wizardindustry_active_job_owner",
+            ),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 4.2.30 on 2026-10-19 10:12
+
+# Django
+from django.db import migrations
+
+NOCASE_INDEXES = [
+    ("wizardindustry_evelocation", "location_name"),
+    ("wizardindustry_stastations", "station_name"),
+    ("wizardindustry_characterasset", "name"),
+    ("wizardindustry_corporationasset", "name"),
+    ("eveuniverse_evetype", "name"),
+]
+
+
+def create_nocase_indexes(apps, schema_editor):
+    """Name prefix search indexes, SQLite only.
+
+    SQLite only serves its case-insensitive LIKE from NOCASE indexes.
+    """
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for table, column in NOCASE_INDEXES:
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {table}_{column}_nocase "
+            f"ON {table} ({column} COLLATE NOCASE)"
+        )
+
+
+def drop_nocase_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for table, column in NOCASE_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {table}_{column}_nocase")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("eveuniverse", "0012_alter_evebloodline_eve_ship_type"),
+        ("wizardindustry", "0020_activeindustryjob"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_nocase_indexes, drop_nocase_indexes),
+    ]
@@ -1,3 +1,7 @@
+# Standard Library
+from datetime import datetime
+from datetime import timezone as dt_timezone
+
 # Third Party
 from bravado.exception import HTTPForbidden
 
@@ -15,6 +19,7 @@ from esi.models import Token
 # Alliance Auth (External Libs)
 from eveuniverse.models import EveSolarSystem, EveType
 
+from .helpers import location_cache
 from .providers import esi
 
 logger = get_extension_logger(__name__)
@@ -99,10 +104,36 @@ def chunks(qst, n):
         yield qst[i : i + n]
 
 
+def _known_location(location_id: int) -> "EveLocation | None":
+    """Look up a stored location through the location cache.
+
+    The database is only read on a cache miss or when the cached entry of a
+    structure is older than the staleness window.
+    """
+    entry = location_cache.get_location(location_id)
+    if entry is not None and (
+        location_id < 64000000 or location_cache.is_fresh(entry[3])
+    ):
+        return EveLocation(
+            location_id=entry[0],
+            location_name=entry[1],
+            system_id=entry[2],
+            last_update=datetime.fromtimestamp(entry[3], tz=dt_timezone.utc),
+        )
+
+    location = EveLocation.objects.filter(location_id=location_id).first()
+    if location:
+        location_cache.set_location(location)
+    return location
+
+
 def fetch_location_name(
     location_id, location_flag, character_id, item_id, update=False
 ):
-    """Takes a location_id and character_id and returns a location model for items in a station/structure or in space"""
+    """Takes a location_id and character_id and returns a location model for items in a station/structure or in space
+
+    Known locations are returned as stored unless `update` is set.
+    """
 
     accepted_location_flags = [
         "AssetSafety",
@@ -121,13 +152,13 @@ def fetch_location_name(
         if location_flag is not None:
             return None  # ship fits or in cargo holds or what ever also dont care
 
-    existing = EveLocation.objects.filter(location_id=location_id)
-    current_loc = existing.exists()
+    existing = _known_location(location_id)
+    current_loc = existing is not None
 
-    if current_loc and location_id < 64000000:
-        return existing.first()
-    else:
-        existing = existing.first()
+    # Stored names are read only here, stale structures are refreshed in the
+    # background by `tasks.refresh_stale_structures` with update=True.
+    if current_loc and not update:
+        return existing
 
     if location_id == 2004:
         # ASSET SAFETY
@@ -143,20 +174,25 @@ def fetch_location_name(
             location_id=location_id, location_name=system.name, system=system
         )
     elif 60000000 < location_id < 64000000:  # Station ID
-        station = esi.client.Universe.GetUniverseStationsStationId(
-            station_id=location_id
-        ).result()
-        system = EveSolarSystem.objects.get_or_create_esi(id=station.system_id)
+        station = staStations.objects.filter(station_id=location_id).first()
+        if station:
+            station_name, system_id = station.station_name, station.solar_system_id
+        else:  # SDE not imported yet
+            station = esi.client.Universe.GetUniverseStationsStationId(
+                station_id=location_id
+            ).result()
+            station_name, system_id = station.name, station.system_id
+        system = EveSolarSystem.objects.get_or_create_esi(id=system_id)
         if not system:
             logger.error("Unknown System, Have you populated the map?")
             return None
         return EveLocation(
             location_id=location_id,
-            location_name=station.name,
-            system_id=station.system_id,
+            location_name=station_name,
+            system_id=system_id,
         )
     elif location_flag == "OfficeFolder":
-        structure = EveLocation.objects.filter(location_id=location_id).first()
+        structure = _known_location(location_id)
         if not structure:
             structure = fetch_location_name(
                 location_id, "Hangar", character_id, item_id
@@ -221,6 +257,27 @@ class BasePrice(models.Model):
     )
 
 
+class MarketPrice(models.Model):
+    """
+    Market prices of a type, refreshed in bulk from a price source
+    """
+
+    type_id = models.PositiveIntegerField(primary_key=True)
+    average_price = models.DecimalField(
+        max_digits=20, decimal_places=2, null=True, default=None
+    )
+    adjusted_price = models.DecimalField(
+        max_digits=20, decimal_places=2, null=True, default=None
+    )
+    buy_price = models.DecimalField(
+        max_digits=20, decimal_places=2, null=True, default=None
+    )
+    sell_price = models.DecimalField(
+        max_digits=20, decimal_places=2, null=True, default=None
+    )
+    updated = models.DateTimeField()
+
+
 class invMetaTypes(models.Model):
     eve_type = models.OneToOneField(
         "eveuniverse.EveType",
@@ -232,9 +289,231 @@ class invMetaTypes(models.Model):
     meta_group_id = models.IntegerField(null=True, blank=True)
 
 
+class BlueprintEligibility(models.Model):
+    """
+    Whether a blueprint is tracked by the blueprint library, evaluated at SDE import
+    """
+
+    eve_type = models.OneToOneField(
+        "eveuniverse.EveType",
+        on_delete=models.CASCADE,
+        related_name="blueprint_eligibility",
+        default=None,
+    )
+    product_eve_type = models.ForeignKey(
+        "eveuniverse.EveType",
+        on_delete=models.SET_NULL,
+        null=True,
+        default=None,
+        related_name="+",
+    )
+    market_group_id = models.IntegerField(null=True, blank=True)
+    is_eligible = models.BooleanField(default=False)
+    # Stable position of the blueprint in ownership bitmaps, never reused
+    bit_index = models.PositiveIntegerField(null=True, unique=True, default=None)
+    # Material cost of one manufacturing run at current market prices
+    build_cost = models.DecimalField(
+        max_digits=20, decimal_places=2, null=True, blank=True, default=None
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["is_eligible", "market_group_id"]),
+        ]
+
+
+class BlueprintCoverage(models.Model):
+    """
+    Blueprint library completeness of a corporation or user per market group,
+    including the blueprints of all sub groups
+    """
+
+    corporation = models.ForeignKey(
+        EveCorporationInfo,
+        on_delete=models.CASCADE,
+        null=True,
+        default=None,
+        related_name="+",
+    )
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        null=True,
+        default=None,
+        related_name="+",
+    )
+    market_group_id = models.IntegerField()
+    owned_count = models.PositiveIntegerField(default=0)
+    blueprint_count = models.PositiveIntegerField(default=0)
+    base_cost = models.DecimalField(max_digits=20, decimal_places=2, default=0)
+    build_cost = models.DecimalField(max_digits=20, decimal_places=2, default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["corporation", "market_group_id"],
+                name="wizardindustry_coverage_corporation",
+            ),
+            models.UniqueConstraint(
+                fields=["user", "market_group_id"],
+                name="wizardindustry_coverage_user",
+            ),
+            models.CheckConstraint(
+                check=models.Q(corporation__isnull=True, user__isnull=False)
+                | models.Q(corporation__isnull=False, user__isnull=True),
+                name="wizardindustry_coverage_owner",
+            ),
+        ]
+
+
+class AssetValueRollup(models.Model):
+    """
+    Quantity and market value of the assets of a corporation or character per
+    station or structure and category
+    """
+
+    corporation = models.ForeignKey(
+        EveCorporationInfo,
+        on_delete=models.CASCADE,
+        null=True,
+        default=None,
+        related_name="+",
+    )
+    character = models.ForeignKey(
+        CharacterOwnership,
+        on_delete=models.CASCADE,
+        null=True,
+        default=None,
+        related_name="+",
+    )
+    location_id = models.BigIntegerField()
+    category_id = models.IntegerField()
+    quantity = models.BigIntegerField(default=0)
+    value = models.DecimalField(max_digits=20, decimal_places=2, default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["corporation", "location_id", "category_id"],
+                name="wizardindustry_rollup_corporation",
+            ),
+            models.UniqueConstraint(
+                fields=["character", "location_id", "category_id"],
+                name="wizardindustry_rollup_character",
+            ),
+            models.CheckConstraint(
+                check=models.Q(corporation__isnull=True, character__isnull=False)
+                | models.Q(corporation__isnull=False, character__isnull=True),
+                name="wizardindustry_rollup_owner",
+            ),
+        ]
+
+
+class AssetTypeLocation(models.Model):
+    """
+    Quantity of a type held by a corporation or character per station or
+    structure
+    """
+
+    type_id = models.IntegerField()
+    corporation = models.ForeignKey(
+        EveCorporationInfo,
+        on_delete=models.CASCADE,
+        null=True,
+        default=None,
+        related_name="+",
+    )
+    character = models.ForeignKey(
+        CharacterOwnership,
+        on_delete=models.CASCADE,
+        null=True,
+        default=None,
+        related_name="+",
+    )
+    location_id = models.BigIntegerField()
+    quantity = models.BigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["type_id", "corporation", "location_id"],
+                name="wizardindustry_type_location_corporation",
+            ),
+            models.UniqueConstraint(
+                fields=["type_id", "character", "location_id"],
+                name="wizardindustry_type_location_character",
+            ),
+            models.CheckConstraint(
+                check=models.Q(corporation__isnull=True, character__isnull=False)
+                | models.Q(corporation__isnull=False, character__isnull=True),
+                name="wizardindustry_type_location_owner",
+            ),
+        ]
+
+
+class ActiveIndustryJob(models.Model):
+    """
+    Running industry job of a corporation or character with the names it is
+    shown with, rebuilt after each job sync
+    """
+
+    corporation = models.ForeignKey(
+        EveCorporationInfo,
+        on_delete=models.CASCADE,
+        null=True,
+        default=None,
+        related_name="+",
+    )
+    character = models.ForeignKey(
+        CharacterOwnership,
+        on_delete=models.CASCADE,
+        null=True,
+        default=None,
+        related_name="+",
+    )
+    owner_name = models.CharField(max_length=255, default="")
+    job_id = models.IntegerField()
+    activity_id = models.IntegerField()
+    status = models.CharField(max_length=15)
+    runs = models.IntegerField()
+    product_type_id = models.IntegerField()
+    product_name = models.CharField(max_length=255, default="")
+    facility_id = models.BigIntegerField()
+    facility_name = models.CharField(max_length=255, default="")
+    start_date = models.DateTimeField()
+    end_date = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["corporation", "job_id"],
+                name="wizardindustry_active_job_corporation",
+            ),
+            models.UniqueConstraint(
+                fields=["character", "job_id"],
+                name="wizardindustry_active_job_character",
+            ),
+            models.CheckConstraint(
+                check=models.Q(corporation__isnull=True, character__isnull=False)
+                | models.Q(corporation__isnull=False, character__isnull=True),
+                name="wizardindustry_active_job_owner",
+            ),
+        ]
+
+
+class staStations(models.Model):
+    """NPC station from the SDE, so stations resolve without ESI"""
+
+    station_id = models.IntegerField(primary_key=True)
+    station_name = models.CharField(max_length=255)
+    solar_system_id = models.IntegerField()
+    constellation_id = models.IntegerField(null=True, blank=True)
+    region_id = models.IntegerField(null=True, blank=True)
+
+
 class EveLocation(models.Model):
     location_id = models.BigIntegerField(primary_key=True)
-    location_name = models.CharField(max_length=255)
+    location_name = models.CharField(max_length=255, db_index=True)
     system = models.ForeignKey(
         EveSolarSystem, on_delete=models.SET_NULL, null=True, default=None
     )
@@ -302,6 +581,12 @@ class CorporationIndustryJob(models.Model):
         related_name="+",
     )
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["corporation", "end_date", "job_id"]),
+            models.Index(fields=["corporation", "status", "end_date", "job_id"]),
+        ]
+
 
 class CharacterIndustryJob(models.Model):
     character = models.ForeignKey(CharacterOwnership, on_delete=models.CASCADE)
@@ -359,6 +644,32 @@ class CharacterIndustryJob(models.Model):
         related_name="+",
     )
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["character", "end_date", "id"]),
+            models.Index(fields=["character", "status", "end_date", "id"]),
+        ]
+
+
+# Category of the containers other assets are placed in, and groups in it
+# that never hold assets
+CONTAINER_CATEGORIES = [2]
+EXCLUDED_CONTAINER_GROUPS = [14]
+
+# Item ids sent to a single location maintenance task
+LOCATION_UPDATE_CHUNK_SIZE = 1000
+
+
+def location_assets_filter() -> models.Q:
+    """Offices and assembled containers, the assets that can be locations."""
+    return models.Q(location_flag="OfficeFolder") | (
+        models.Q(
+            type_name__eve_group__eve_category_id__in=CONTAINER_CATEGORIES,
+            singleton=True,
+        )
+        & ~models.Q(type_name__eve_group_id__in=EXCLUDED_CONTAINER_GROUPS)
+    )
+
 
 class Asset(models.Model):
     id = models.BigAutoField(primary_key=True)
@@ -384,6 +695,7 @@ class Asset(models.Model):
         indexes = [
             models.Index(fields=["location_id"]),
             models.Index(fields=["item_id"]),
+            models.Index(fields=["name"]),
         ]
 
 
@@ -392,12 +704,26 @@ class CharacterAsset(Asset):
         CharacterOwnership, on_delete=models.deletion.CASCADE, related_name="+"
     )
 
+    class Meta(Asset.Meta):
+        indexes = Asset.Meta.indexes + [
+            models.Index(fields=["character", "id"]),
+            models.Index(fields=["character", "location_id", "id"]),
+            models.Index(fields=["character", "type_id", "id"]),
+        ]
+
 
 class CorporationAsset(Asset):
     corporation = models.ForeignKey(
         EveCorporationInfo, on_delete=models.deletion.CASCADE, related_name="+"
     )
 
+    class Meta(Asset.Meta):
+        indexes = Asset.Meta.indexes + [
+            models.Index(fields=["corporation", "id"]),
+            models.Index(fields=["corporation", "location_id", "id"]),
+            models.Index(fields=["corporation", "type_id", "id"]),
+        ]
+
 
 class Owner(models.Model):
     corporation = models.ForeignKey(
@@ -412,12 +738,16 @@ class Owner(models.Model):
     user = models.ForeignKey(User, on_delete=models.deletion.PROTECT, related_name="+")
 
     def _get_industry_jobs(self):
+        # AA wizardindustry App
+        from wizardindustry.tasks import update_active_jobs
+
         if self.corporation_owner:
-            self._get_corporation_jobs()
-            return
+            job_ids = self._get_corporation_jobs()
         else:
-            self._get_character_jobs()
-            return
+            job_ids = self._get_character_jobs()
+
+        if job_ids is not False:
+            update_active_jobs.delay(self.pk, job_ids)
 
     def _get_character_jobs(self):
         if self.corporation_owner:
@@ -512,6 +842,8 @@ class Owner(models.Model):
 
         CharacterIndustryJob.objects.bulk_create(items)
 
+        return item_ids
+
     def _get_corporation_jobs(self):
         if not self.corporation_owner:
             return False
@@ -612,15 +944,57 @@ class Owner(models.Model):
 
         CorporationIndustryJob.objects.bulk_create(items)
 
+        return item_ids
+
     def _get_assets(self):
+        previous = self._location_asset_snapshot()
+
         if self.corporation_owner:
-            self._get_corporation_assets()
+            synced = self._get_corporation_assets()
             self._update_corporation_asset_names()
-            return
         else:
-            self._get_character_assets()
+            synced = self._get_character_assets()
             self._update_character_asset_names()
-            return
+
+        current = self._location_asset_snapshot()
+        changed_office_ids = []
+        changed_container_ids = []
+        for item_id, state in current.items():
+            if previous.get(item_id) != state:
+                if state[2] == "OfficeFolder":
+                    changed_office_ids.append(item_id)
+                else:
+                    changed_container_ids.append(item_id)
+
+        # AA wizardindustry App
+        from wizardindustry.tasks import update_asset_rollup, update_owner_locations
+
+        # Offices are resolved here, in one pass, so every office row exists
+        # before the containers in them are resolved by the chunked tasks.
+        update_owner_locations(self.pk, changed_office_ids)
+        for start in range(0, len(changed_container_ids), LOCATION_UPDATE_CHUNK_SIZE):
+            update_owner_locations.delay(
+                self.pk,
+                changed_container_ids[start : start + LOCATION_UPDATE_CHUNK_SIZE],
+            )
+        if synced:
+            update_asset_rollup.delay(self.pk)
+
+    def _location_asset_snapshot(self) -> dict:
+        """Map of item_id to (location_id, name, location_flag) for assets that
+        can be locations.
+        """
+        if self.corporation_owner:
+            assets = CorporationAsset.objects.filter(corporation=self.corporation)
+        else:
+            assets = CharacterAsset.objects.filter(character=self.character)
+
+        return {
+            item_id: (location_id, name, location_flag)
+            for item_id, location_id, name, location_flag in assets.filter(
+                location_assets_filter()
+            ).values_list("item_id", "location_id", "name", "location_flag")
+        }
 
     def _get_character_assets(self):
         if self.corporation_owner:
@@ -671,6 +1045,7 @@ class Owner(models.Model):
             delete_query.delete()
 
         CharacterAsset.objects.bulk_create(items)
+        return True
 
     def _get_corporation_assets(self):
         if not self.corporation_owner:
@@ -748,6 +1123,7 @@ class Owner(models.Model):
             delete_query.delete()
 
         CorporationAsset.objects.bulk_create(items)
+        return True
 
     def _update_corporation_asset_names(self):
         if not self.corporation_owner:
@@ -17,5 +17,6 @@ esi = ESIClientProvider(
         "GetCorporationsCorporationIdAssets",
         "PostCorporationsCorporationIdAssetsNames",
         "PostCharactersCharacterIdAssetsNames",
+        "GetMarketsPrices",
     ],
 )
@@ -0,0 +1,19 @@
+"""App Signals"""
+
+# Third Party
+from blueprints.models import Blueprint
+
+# Django
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+# AA wizardindustry App
+from wizardindustry.helpers.ownership import bump_ownership_version
+from wizardindustry.tasks import schedule_blueprint_coverage
+
+
+@receiver(post_save, sender=Blueprint)
+@receiver(post_delete, sender=Blueprint)
+def blueprint_changed(sender, instance, **kwargs):
+    bump_ownership_version()
+    schedule_blueprint_coverage(instance.owner.corporation_id)
@@ -4,23 +4,68 @@
 import json
 import logging
 import urllib.request
+from datetime import timedelta
 
 # Third Party
+from blueprints.models import Owner as BlueprintOwner
+from bravado.exception import HTTPError
 from celery import shared_task
 
+# Django
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+
+# Alliance Auth
+from esi.exceptions import ESIErrorLimitException, HTTPClientError, HTTPServerError
+from esi.models import Token
+
 # Alliance Auth (External Libs)
 from eveuniverse.models import EveType
 
+from .app_settings import (
+    wizardindustry_COVERAGE_UPDATE_DELAY,
+    wizardindustry_LOCATION_MAX_AGE,
+    wizardindustry_STRUCTURE_REFRESH_BATCH_SIZE,
+    wizardindustry_STRUCTURE_REFRESH_INTERVAL,
+    wizardindustry_STRUCTURE_REFRESH_LIMIT,
+)
+from .helpers import location_cache
+from .helpers.catalogue import (
+    bump_catalogue_version,
+    get_catalogue,
+    update_blueprint_eligibility,
+)
+from .helpers.costs import update_build_costs
+from .helpers.coverage import (
+    bump_coverage_version,
+    update_corporation_coverage,
+    update_user_coverage,
+)
+from .helpers.jobs import bump_active_jobs_version, update_owner_active_jobs
+from .helpers.model_helpers import bulk_upsert
+from .helpers.prices import refresh_market_prices
+from .helpers.rollups import bump_rollup_version, update_owner_rollup
 from .models import (
+    CONTAINER_CATEGORIES,
+    EXCLUDED_CONTAINER_GROUPS,
     BasePrice,
+    BlueprintCoverage,
     CharacterAsset,
     CorporationAsset,
     EveLocation,
+    Owner,
+    fetch_location_name,
     invMetaTypes,
+    staStations,
 )
 
 logger = logging.getLogger(__name__)
 
+COVERAGE_PENDING_KEY = "wizardindustry-coverage-pending-{}"
+
 
 @shared_task
 def get_base_prices():
@@ -37,6 +82,9 @@ def get_base_prices():
             except Exception:
                 continue
 
+    bump_catalogue_version()
+    update_blueprint_coverage.delay()
+
 
 @shared_task
 def get_inv_meta_types():
@@ -56,91 +104,449 @@ def get_inv_meta_types():
             except Exception:
                 continue
 
+    update_blueprint_eligibility()
+    update_build_costs()
+    bump_catalogue_version()
+    update_blueprint_coverage.delay()
+
 
 @shared_task
-def _create_office_locations():
-    corp_offices = CorporationAsset.objects.filter(location_flag="OfficeFolder").all()
+def refresh_blueprint_catalogue():
+    """Rebuild the blueprint catalogue, run after `eveuniverse_load_data`."""
+    update_blueprint_eligibility()
+    update_build_costs(reload=True)
+    bump_catalogue_version()
+    get_catalogue()
+    update_blueprint_coverage.delay()
+
+
+@shared_task
+def update_market_prices():
+    """Refresh market prices, reprice every blueprint's materials and revalue
+    all assets.
+    """
+    if not refresh_market_prices():
+        return
+
+    if update_build_costs():
+        bump_catalogue_version()
+        update_blueprint_coverage.delay()
+    update_asset_rollups.delay()
+
+
+@shared_task
+def update_asset_rollup(owner_pk: int):
+    """Refresh the asset rollups of one owner, chained after its asset sync."""
+    owner = Owner.objects.filter(pk=owner_pk).first()
+    if owner and update_owner_rollup(owner):
+        bump_rollup_version()
 
-    location_names = list(
-        EveLocation.objects.all().values_list("location_id", flat=True)
-    )
 
-    for office in corp_offices:
-        if office.item_id not in location_names:
-            structure = EveLocation.objects.filter(
-                location_id=office.location_id
-            ).first()
-            new_location = EveLocation(
-                location_id=office.item_id,
-                location_name=f"Office: #{office.item_id}",
-                system_id=structure.system_id if structure else None,
+@shared_task
+def update_asset_rollups():
+    """Refresh the asset value rollup of every owner."""
+    changed = 0
+    for owner in Owner.objects.all():
+        changed += update_owner_rollup(owner, type_locations=False)
+    if changed:
+        bump_rollup_version()
+
+
+@shared_task
+def update_assets():
+    """Sync the assets of every owner from ESI."""
+    for owner in Owner.objects.all():
+        owner._get_assets()
+
+
+@shared_task
+def update_industry_jobs():
+    """Sync the industry jobs of every owner from ESI."""
+    for owner in Owner.objects.all():
+        owner._get_industry_jobs()
+
+
+@shared_task
+def update_active_jobs(owner_pk: int, job_ids: list = None):
+    """Refresh the active job summary of one owner, chained after its job sync."""
+    owner = Owner.objects.filter(pk=owner_pk).first()
+    if owner and update_owner_active_jobs(owner, job_ids):
+        bump_active_jobs_version()
+
+
+def schedule_blueprint_coverage(corporation_pk: int | None):
+    """Queue one coverage update for a burst of blueprint changes.
+
+    aa-blueprints saves blueprints one by one, the update waits
+    `wizardindustry_COVERAGE_UPDATE_DELAY` seconds after the first change so a
+    whole sync is picked up by a single run. Personal blueprint owners have no
+    corporation and only refresh user coverage.
+    """
+
+    def _schedule():
+        if cache.add(
+            COVERAGE_PENDING_KEY.format(corporation_pk),
+            True,
+            timeout=wizardindustry_COVERAGE_UPDATE_DELAY * 10,
+        ):
+            update_blueprint_coverage.apply_async(
+                kwargs={"corporation_ids": [corporation_pk]},
+                countdown=wizardindustry_COVERAGE_UPDATE_DELAY,
             )
-            new_location.save()
+
+    transaction.on_commit(_schedule)
 
 
 @shared_task
-def _update_office_locations():
-    office_locations = EveLocation.objects.filter(
-        location_name__startswith="Office", system_id__isnull=True
-    ).all()
+def update_blueprint_coverage(corporation_ids: list = None):
+    """Refresh the blueprint coverage table.
+
+    Refreshes the given corporations, or every corporation owning blueprints
+    when none are given, and every user that already has coverage rows since
+    their access can span any corporation. Only rows that changed are written.
+    """
+    catalogue = get_catalogue()
+
+    if corporation_ids is None:
+        corporation_ids = list(
+            BlueprintOwner.objects.filter(corporation__isnull=False).values_list(
+                "corporation_id", flat=True
+            )
+        )
+        BlueprintCoverage.objects.filter(corporation__isnull=False).exclude(
+            corporation_id__in=corporation_ids
+        ).delete()
+    else:
+        cache.delete_many([COVERAGE_PENDING_KEY.format(pk) for pk in corporation_ids])
+
+    changed = 0
+    for corporation_pk in corporation_ids:
+        if corporation_pk is not None:
+            changed += update_corporation_coverage(corporation_pk, catalogue)
+
+    for user in User.objects.filter(
+        pk__in=BlueprintCoverage.objects.filter(user__isnull=False).values("user_id")
+    ):
+        changed += update_user_coverage(user, catalogue)
+
+    if changed:
+        bump_coverage_version()
+
+
+@shared_task
+def get_sta_stations():
+    with urllib.request.urlopen(
+        "https://sde.eve-o.tech/latest/staStations.json"
+    ) as url:
+        data = json.loads(url.read().decode())
+
+    stations = [
+        staStations(
+            station_id=item["stationID"],
+            station_name=item["stationName"],
+            solar_system_id=item["solarSystemID"],
+            constellation_id=item.get("constellationID"),
+            region_id=item.get("regionID"),
+        )
+        for item in data
+    ]
+
+    bulk_upsert(
+        staStations,
+        stations,
+        unique_fields=["station_id"],
+        update_fields=[
+            "station_name",
+            "solar_system_id",
+            "constellation_id",
+            "region_id",
+        ],
+    )
+
+
+def _parent_system(location_field="location_id"):
+    """Subquery resolving the system of the location a row sits in."""
+    return Subquery(
+        EveLocation.objects.filter(location_id=OuterRef(location_field)).values(
+            "system_id"
+        )[:1]
+    )
+
+
+def _asset_field(model, field):
+    """Subquery resolving a field of the asset a location was created from."""
+    return Subquery(
+        model.objects.filter(item_id=OuterRef("location_id")).values(field)[:1]
+    )
+
+
+def _office_assets():
+    return CorporationAsset.objects.filter(location_flag="OfficeFolder")
+
+
+def _can_assets():
+    return CorporationAsset.objects.filter(
+        type_name__eve_group__eve_category_id__in=CONTAINER_CATEGORIES,
+        singleton=True,
+    ).exclude(type_name__eve_group__id__in=EXCLUDED_CONTAINER_GROUPS)
+
+
+def _create_office_rows(offices):
+    offices = (
+        offices.exclude(item_id__in=EveLocation.objects.values("location_id"))
+        .annotate(parent_system_id=_parent_system())
+        .values_list("item_id", "parent_system_id")
+    )
+
+    new_locations = {
+        item_id: EveLocation(
+            location_id=item_id,
+            location_name=f"Office: #{item_id}",
+            system_id=system_id,
+        )
+        for item_id, system_id in offices
+    }
 
-    location_ids = list(EveLocation.objects.all().values_list("location_id", flat=True))
+    EveLocation.objects.bulk_create(new_locations.values(), ignore_conflicts=True)
 
+
+def _update_office_rows(locations):
+    office_systems = (
+        CorporationAsset.objects.filter(item_id=OuterRef("location_id"))
+        .annotate(parent_system_id=_parent_system())
+        .values("parent_system_id")[:1]
+    )
+    office_locations = (
+        locations.filter(location_name__startswith="Office", system_id__isnull=True)
+        .annotate(parent_system_id=Subquery(office_systems))
+        .filter(parent_system_id__isnull=False)
+    )
+
+    now = timezone.now()
+    updates = []
     for location in office_locations:
-        asset = CorporationAsset.objects.filter(item_id=location.location_id).first()
-        if not asset:
-            location.location_name_id = None
+        location.system_id = location.parent_system_id
+        location.last_update = now
+        updates.append(location)
+
+    EveLocation.objects.bulk_update(updates, ["system", "last_update"])
+    location_cache.delete_locations(location.location_id for location in updates)
+
+
+def _create_can_rows(cans):
+    cans = (
+        cans.exclude(item_id__in=EveLocation.objects.values("location_id"))
+        .annotate(parent_system_id=_parent_system())
+        .values_list("item_id", "name", "parent_system_id")
+    )
+
+    new_locations = {
+        item_id: EveLocation(
+            location_id=item_id,
+            location_name=f"Can: {name}",
+            system_id=system_id,
+        )
+        for item_id, name, system_id in cans
+    }
+
+    EveLocation.objects.bulk_create(new_locations.values(), ignore_conflicts=True)
+
+
+def _update_can_rows(locations):
+    can_locations = list(
+        locations.filter(location_name__startswith="Can:").annotate(
+            corp_parent_id=_asset_field(CorporationAsset, "location_id"),
+            corp_name=_asset_field(CorporationAsset, "name"),
+            char_parent_id=_asset_field(CharacterAsset, "location_id"),
+            char_name=_asset_field(CharacterAsset, "name"),
+        )
+    )
+
+    parent_ids = {
+        location.corp_parent_id or location.char_parent_id for location in can_locations
+    }
+    parent_systems = dict(
+        EveLocation.objects.filter(location_id__in=parent_ids).values_list(
+            "location_id", "system_id"
+        )
+    )
+
+    now = timezone.now()
+    updates = []
+    for location in can_locations:
+        if location.corp_parent_id is not None:
+            parent_id, name = location.corp_parent_id, location.corp_name
+        else:
+            parent_id, name = location.char_parent_id, location.char_name
+
+        if parent_id not in parent_systems:
+            continue
+
+        location_name = f"Can: {name}"
+        system_id = parent_systems[parent_id]
+        if location.location_name == location_name and location.system_id == system_id:
             continue
 
-        if asset.location_id in location_ids:
-            location.location_name_id = asset.location_id
-            location.save()
+        location.location_name = location_name
+        location.system_id = system_id
+        location.last_update = now
+        updates.append(location)
+
+    EveLocation.objects.bulk_update(updates, ["location_name", "system", "last_update"])
+    location_cache.delete_locations(location.location_id for location in updates)
+
+
+@shared_task
+def _create_office_locations():
+    _create_office_rows(_office_assets())
+
+
+@shared_task
+def _update_office_locations():
+    _update_office_rows(EveLocation.objects.all())
 
 
 @shared_task
 def _create_can_locations():
-    expandable_categories = [2]
-    not_groups = [14]
+    _create_can_rows(_can_assets())
 
-    corp_cans = (
-        CorporationAsset.objects.filter(
-            type_name__eve_group__eve_category_id__in=expandable_categories,
-            singleton=True,
-        )
-        .exclude(type_name__eve_group__id__in=not_groups)
-        .order_by("pk")
+
+@shared_task
+def _update_can_locations():
+    _update_can_rows(EveLocation.objects.all())
+
+
+@shared_task
+def update_owner_locations(owner_pk: int, item_ids: list):
+    """Run the location maintenance for the given items of one owner only.
+
+    Chained after an owner's asset sync with the item ids that were added,
+    moved or renamed, so the work scales with churn instead of install size.
+    """
+    if not item_ids:
+        return
+
+    owner = Owner.objects.filter(pk=owner_pk).first()
+    if not owner:
+        return
+
+    changed_locations = EveLocation.objects.filter(location_id__in=item_ids)
+
+    if owner.corporation_owner:
+        scope = {"corporation_id": owner.corporation_id, "item_id__in": item_ids}
+        _create_office_rows(_office_assets().filter(**scope))
+        _update_office_rows(changed_locations)
+        _create_can_rows(_can_assets().filter(**scope))
+
+    _update_can_rows(changed_locations)
+
+
+@shared_task
+def refresh_stale_structures():
+    """Queue name refreshes for the structures with the oldest names.
+
+    Meant to run from the beat schedule every
+    `wizardindustry_STRUCTURE_REFRESH_INTERVAL` seconds, the batches of a run
+    are spread over that interval.
+    """
+    cutoff = timezone.now() - timedelta(seconds=wizardindustry_LOCATION_MAX_AGE)
+    structure_ids = list(
+        EveLocation.objects.filter(location_id__gt=64000000, last_update__lt=cutoff)
+        .exclude(location_name__startswith="Office")
+        .exclude(location_name__startswith="Can:")
+        .order_by("last_update")
+        .values_list("location_id", flat=True)[:wizardindustry_STRUCTURE_REFRESH_LIMIT]
     )
 
-    location_names = list(
-        EveLocation.objects.all().values_list("location_id", flat=True)
+    batch_size = wizardindustry_STRUCTURE_REFRESH_BATCH_SIZE
+    batches = [
+        structure_ids[i : i + batch_size]
+        for i in range(0, len(structure_ids), batch_size)
+    ]
+    spacing = wizardindustry_STRUCTURE_REFRESH_INTERVAL / max(len(batches), 1)
+
+    for number, batch in enumerate(batches):
+        refresh_structure_names.apply_async(
+            args=[batch], countdown=int(number * spacing)
+        )
+
+
+def _structure_characters(structure_ids) -> dict:
+    """Map each structure to the characters known to have assets docked in it."""
+    characters = {structure_id: [] for structure_id in structure_ids}
+
+    for structure_id, character_id in (
+        CharacterAsset.objects.filter(location_id__in=structure_ids)
+        .values_list("location_id", "character__character__character_id")
+        .distinct()
+    ):
+        characters[structure_id].append(character_id)
+
+    corporation_structures = (
+        CorporationAsset.objects.filter(location_id__in=structure_ids)
+        .values_list("corporation_id", "location_id")
+        .distinct()
     )
+    corporation_owners = {}
+    for corporation_id, character_id in Owner.objects.filter(
+        corporation_owner=True,
+        corporation_id__in={
+            corporation_id for corporation_id, _ in corporation_structures
+        },
+    ).values_list("corporation_id", "character__character__character_id"):
+        corporation_owners.setdefault(corporation_id, []).append(character_id)
 
-    for can in corp_cans:
-        if can.item_id not in location_names:
-            structure = EveLocation.objects.filter(location_id=can.location_id).first()
-            system_id = structure.system_id if structure else None
-            new_location = EveLocation(
-                location_id=can.item_id,
-                location_name=f"Can: {can.name}",
-                system_id=system_id,
-            )
-            new_location.save()
+    for corporation_id, structure_id in corporation_structures:
+        characters[structure_id] += corporation_owners.get(corporation_id, [])
+
+    return characters
 
 
 @shared_task
-def _update_can_locations():
-    can_locations = EveLocation.objects.filter(location_name__startswith="Can:").all()
-    location_ids = list(EveLocation.objects.all().values_list("location_id", flat=True))
+def refresh_structure_names(structure_ids: list):
+    """Refresh structure names from ESI with any token known to have docking access."""
+    structure_characters = _structure_characters(structure_ids)
 
-    for location in can_locations:
-        asset = CorporationAsset.objects.filter(item_id=location.location_id).first()
-        if not asset:
-            asset = CharacterAsset.objects.filter(item_id=location.location_id).first()
-            if not asset:
-                location.location_name_id = None
-                continue
+    character_ids = {
+        character_id
+        for characters in structure_characters.values()
+        for character_id in characters
+    }
+    with_token = set(
+        Token.objects.filter(character_id__in=character_ids)
+        .require_scopes(["esi-universe.read_structures.v1"])
+        .values_list("character_id", flat=True)
+    )
+
+    locations = EveLocation.objects.in_bulk(structure_ids)
+    now = timezone.now()
+    touched = {}
+    for structure_id in structure_ids:
+        location = locations.get(structure_id)
+        if location is None:
+            continue
+        try:
+            for character_id in dict.fromkeys(structure_characters[structure_id]):
+                if character_id not in with_token:
+                    continue
+                refreshed = fetch_location_name(
+                    structure_id, None, character_id, None, update=True
+                )
+                if refreshed:
+                    location.location_name = refreshed.location_name
+                    break
+            else:
+                logger.debug("No token with access to structure %s", structure_id)
+        except ESIErrorLimitException:
+            # the rest keep their age and come up again on the next run
+            logger.warning("ESI error limit reached, structure refresh stopped")
+            break
+        except (HTTPError, HTTPClientError, HTTPServerError) as e:
+            logger.info("Failed to refresh structure %s: %s", structure_id, e)
+
+        # Touched either way so inaccessible structures rotate to the back.
+        location.last_update = now
+        touched[structure_id] = location
 
-        if asset.location_id in location_ids:
-            location.location_name_id = asset.location_id
-            location.location_name = f"Can: {asset.name}"
-            location.save()
+    EveLocation.objects.bulk_update(touched.values(), ["location_name", "last_update"])
+    location_cache.delete_locations(touched)
@@ -0,0 +1,170 @@
+"""
+wizardindustry Asset Search Tests
+"""
+
+# Django
+from django.test import TestCase
+from django.urls import reverse
+
+# AA wizardindustry App
+from wizardindustry.helpers.assets import asset_owners, search_assets
+from wizardindustry.models import (
+    CharacterAsset,
+    CorporationAsset,
+    EveLocation,
+    Owner,
+    staStations,
+)
+from wizardindustry.tests.testdata import (
+    create_asset,
+    create_blueprint_catalogue,
+    create_blueprint_materials,
+    create_container_types,
+    create_corporation,
+    create_user_with_character,
+)
+
+JITA = 60003760
+AMARR = 60008494
+DODIXIE = 60011866
+KEEPSTAR = 1035466617946
+
+
+class TestAssetSearch(TestCase):
+    """
+    Asset search across owners
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        create_blueprint_catalogue()
+        create_blueprint_materials()
+        cls.corporation = corporation = create_corporation()
+        cls.ownership = create_user_with_character(corporation=corporation)
+        cls.user = cls.ownership.user
+        Owner.objects.create(
+            corporation=corporation,
+            character=cls.ownership,
+            corporation_owner=True,
+            user=cls.user,
+        )
+        Owner.objects.create(
+            corporation=corporation, character=cls.ownership, user=cls.user
+        )
+        EveLocation.objects.create(location_id=JITA, location_name="Jita IV - 4")
+        EveLocation.objects.create(location_id=AMARR, location_name="Amarr VIII")
+
+        corporation_owner = {"corporation": corporation}
+        character_owner = {"character": cls.ownership}
+        create_asset(CorporationAsset, 1, 34, JITA, 1000, **corporation_owner)
+        create_asset(
+            CorporationAsset, 2, 587, AMARR, name="Rifter Stash", **corporation_owner
+        )
+        create_asset(CorporationAsset, 3, 35, 2, 50, **corporation_owner)
+        create_asset(CharacterAsset, 4, 34, AMARR, 10, **character_owner)
+        create_asset(CharacterAsset, 5, 587, JITA, **character_owner)
+
+        # somebody else's tritanium
+        other = create_user_with_character("other", 1002, corporation)
+        create_asset(CharacterAsset, 6, 34, JITA, 5, character=other)
+
+    def _item_ids(self, term, **kwargs):
+        rows, cursor = search_assets(self.user, term, **kwargs)
+        return [row["item_id"] for row in rows], cursor
+
+    def test_asset_owners(self):
+        corporation_ids, character_ownership_ids = asset_owners(self.user)
+
+        self.assertEqual(len(corporation_ids), 1)
+        self.assertEqual(character_ownership_ids, {self.ownership.pk})
+
+    def test_search_by_type_name(self):
+        self.assertEqual(self._item_ids("trit"), ([1, 4], None))
+
+    def test_search_by_container_name(self):
+        self.assertEqual(self._item_ids("rifter s"), ([2], None))
+
+    def test_search_by_location_name(self):
+        self.assertEqual(self._item_ids("Amarr"), ([2, 4], None))
+
+    def test_search_by_location_name_finds_office_contents(self):
+        corporation = {"corporation": self.corporation}
+        create_container_types()
+        EveLocation.objects.create(location_id=KEEPSTAR, location_name="Wizard Keep")
+        office = create_asset(CorporationAsset, 10, 27, KEEPSTAR, **corporation)
+        office.location_flag = "OfficeFolder"
+        office.save()
+        create_asset(CorporationAsset, 11, 34, 10, 500, **corporation)
+        create_asset(CorporationAsset, 12, 3465, 10, type_name_id=3465, **corporation)
+        create_asset(CorporationAsset, 13, 35, 12, 20, **corporation)
+
+        self.assertEqual(self._item_ids("Wizard Keep"), ([10, 11, 12, 13], None))
+
+    def test_search_by_sde_station_name(self):
+        staStations.objects.create(
+            station_id=DODIXIE,
+            station_name="Dodixie IX - Moon 20",
+            solar_system_id=30002659,
+        )
+        create_asset(CharacterAsset, 14, 34, DODIXIE, 5, character=self.ownership)
+
+        self.assertEqual(self._item_ids("Dodixie"), ([14], None))
+
+    def test_row(self):
+        rows, _ = search_assets(self.user, "Pyer")
+
+        self.assertEqual(
+            rows,
+            [
+                {
+                    "id": rows[0]["id"],
+                    "item_id": 3,
+                    "type_id": 35,
+                    "type_name": None,
+                    "name": None,
+                    "quantity": 50,
+                    "location_id": 2,
+                    "location_name": None,
+                    "location_flag": "Hangar",
+                    "owner_name": "Wizard Corp",
+                    "owner_type": "corporation",
+                }
+            ],
+        )
+
+    def test_keyset_pages_across_owners(self):
+        pages = []
+        cursor = None
+        while True:
+            item_ids, cursor = self._item_ids("Jita", cursor=cursor, limit=1)
+            pages.append(item_ids)
+            if cursor is None:
+                break
+
+        self.assertEqual(pages, [[1], [5]])
+
+    def test_endpoint(self):
+        self.user.is_superuser = True
+        self.user.save()
+        self.user.profile.main_character = self.ownership.character
+        self.user.profile.save()
+        self.client.force_login(self.user)
+
+        data = self.client.get(
+            reverse("wizardindustry:asset_search"), {"q": "Tritanium"}
+        ).json()
+
+        self.assertEqual([row["item_id"] for row in data["results"]], [1, 4])
+        self.assertIsNone(data["next"])
+        self.assertEqual(
+            self.client.get(
+                reverse("wizardindustry:asset_search"), {"q": "Tr"}
+            ).status_code,
+            400,
+        )
+        self.assertEqual(
+            self.client.get(
+                reverse("wizardindustry:asset_search"), {"q": "Trit", "cursor": "x"}
+            ).status_code,
+            400,
+        )
@@ -0,0 +1,111 @@
+"""
+wizardindustry Blueprint Bitmap Tests
+"""
+
+# Standard Library
+from unittest.mock import patch
+
+# Django
+from django.test import TestCase
+
+# Alliance Auth (External Libs)
+from eveuniverse.models import EveType
+
+# AA wizardindustry App
+from wizardindustry.helpers.bitsets import (
+    compare,
+    from_bitmap,
+    get_bit_index,
+    to_bitmap,
+)
+from wizardindustry.helpers.catalogue import update_blueprint_eligibility
+from wizardindustry.models import BlueprintEligibility
+from wizardindustry.tests.testdata import create_blueprint_catalogue
+
+
+class TestBitmaps(TestCase):
+    """
+    Bitmap operations
+    """
+
+    def test_round_trip(self):
+        bits = [0, 7, 8, 63, 64, 4999]
+
+        self.assertEqual(from_bitmap(to_bitmap(bits)), bits)
+        self.assertEqual(from_bitmap(0), [])
+
+    @patch("wizardindustry.helpers.bitsets.cache")
+    def test_bit_index_versions_expire(self, mock_cache):
+        mock_cache.get.return_value = None
+
+        get_bit_index()
+
+        self.assertEqual(mock_cache.set.call_args.kwargs["timeout"], 86400)
+
+    def test_compare(self):
+        mask = to_bitmap(range(4))
+        comparison = compare({"a": to_bitmap([0, 1]), "b": to_bitmap([1])}, mask)
+
+        self.assertEqual(from_bitmap(comparison.union), [0, 1])
+        self.assertEqual(from_bitmap(comparison.intersection), [1])
+        self.assertEqual(from_bitmap(comparison.nobody), [2, 3])
+        self.assertEqual(from_bitmap(comparison.unique["a"]), [0])
+        self.assertEqual(comparison.unique["b"], 0)
+        self.assertEqual(comparison.overlap[("a", "b")], 1)
+        self.assertEqual(comparison.overlap[("a", "a")], 2)
+
+    def test_compare_nothing(self):
+        comparison = compare({}, to_bitmap(range(4)))
+
+        self.assertEqual(comparison.intersection, 0)
+        self.assertEqual(from_bitmap(comparison.nobody), [0, 1, 2, 3])
+
+
+class TestBitIndex(TestCase):
+    """
+    Stable blueprint bit index
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        create_blueprint_catalogue()
+        update_blueprint_eligibility()
+
+    def _bit_indexes(self):
+        return dict(
+            BlueprintEligibility.objects.values_list("eve_type_id", "bit_index")
+        )
+
+    def test_every_blueprint_has_an_index(self):
+        bit_indexes = self._bit_indexes()
+
+        self.assertEqual(sorted(bit_indexes.values()), list(range(len(bit_indexes))))
+
+    def test_indexes_are_stable(self):
+        before = self._bit_indexes()
+        EveType.objects.filter(id=691).update(published=False)
+
+        update_blueprint_eligibility()
+        EveType.objects.filter(id=691).update(published=True)
+        update_blueprint_eligibility()
+
+        after = self._bit_indexes()
+        self.assertEqual(after, before)
+
+    def test_removed_index_is_not_reused(self):
+        before = self._bit_indexes()
+        highest = max(before, key=before.get)
+        EveType.objects.filter(id=highest).update(published=False)
+        update_blueprint_eligibility()
+        self.assertFalse(
+            BlueprintEligibility.objects.get(eve_type_id=highest).is_eligible
+        )
+
+        blueprint = EveType.objects.get(id=highest)
+        blueprint.pk = None
+        blueprint.id = 999999
+        blueprint.published = True
+        blueprint.save()
+        update_blueprint_eligibility()
+
+        self.assertEqual(self._bit_indexes()[999999], before[highest] + 1)
@@ -0,0 +1,113 @@
+"""
+wizardindustry Bill of Materials Tests
+"""
+
+# Django
+from django.test import TestCase
+
+# AA wizardindustry App
+from wizardindustry.helpers.bom import (
+    IndustryGraph,
+    Job,
+    Recipe,
+    build_industry_graph,
+    material_quantity,
+)
+from wizardindustry.tests.testdata import (
+    create_blueprint_catalogue,
+    create_blueprint_materials,
+)
+
+SHIP, COMPONENT, REACTION, MODULE = 100, 200, 300, 500
+TRITANIUM, MOON_GOO = 34, 400
+
+
+def _graph():
+    return IndustryGraph(
+        {
+            SHIP: Recipe(1000, 1, 1, ((COMPONENT, 9), (TRITANIUM, 1000))),
+            COMPONENT: Recipe(2000, 1, 2, ((TRITANIUM, 50), (REACTION, 3))),
+            REACTION: Recipe(3000, 11, 200, ((MOON_GOO, 100),)),
+            MODULE: Recipe(5000, 1, 1, ((COMPONENT, 5),)),
+        }
+    )
+
+
+class TestMaterialQuantity(TestCase):
+    """
+    In game material rounding
+    """
+
+    def test_material_efficiency(self):
+        self.assertEqual(material_quantity(10, 100, 10), 900)
+        self.assertEqual(material_quantity(1, 3, 10), 3)
+
+    def test_at_least_one_per_run(self):
+        self.assertEqual(material_quantity(10, 1, 10), 10)
+
+
+class TestIndustryGraph(TestCase):
+    """
+    Bill of materials explosion
+    """
+
+    def test_levels(self):
+        graph = _graph()
+
+        self.assertEqual(graph.levels, {SHIP: 3, COMPONENT: 2, REACTION: 1, MODULE: 3})
+        self.assertEqual(graph.closure(SHIP), {SHIP, COMPONENT, REACTION})
+
+    def test_explode(self):
+        bom = _graph().explode({SHIP: 3}, me=10)
+
+        self.assertEqual(bom.materials, {TRITANIUM: 3285, MOON_GOO: 100})
+        self.assertEqual(
+            bom.jobs,
+            {
+                SHIP: Job(1000, 1, 3, 3),
+                COMPONENT: Job(2000, 1, 13, 26),
+                REACTION: Job(3000, 11, 1, 200),
+            },
+        )
+        self.assertEqual(bom.surplus, {COMPONENT: 1, REACTION: 164})
+
+    def test_shared_components_are_batched(self):
+        bom = _graph().explode({SHIP: 1, MODULE: 1}, me=0)
+
+        self.assertEqual(bom.jobs[COMPONENT].runs, 7)
+
+    def test_blueprint_me(self):
+        bom = _graph().explode({SHIP: 3}, me=10, blueprint_me={1000: 0})
+
+        self.assertEqual(bom.jobs[COMPONENT].runs, 14)
+
+    def test_buy_reactions(self):
+        bom = _graph().explode({SHIP: 3}, me=10, build_reactions=False)
+
+        self.assertEqual(bom.materials, {TRITANIUM: 3285, REACTION: 36})
+        self.assertNotIn(REACTION, bom.jobs)
+
+    def test_cycles_terminate(self):
+        graph = IndustryGraph(
+            {1: Recipe(10, 1, 1, ((2, 1),)), 2: Recipe(20, 1, 1, ((1, 1),))}
+        )
+
+        self.assertEqual(set(graph.levels), {1, 2})
+        graph.explode({1: 1})
+
+
+class TestBuildIndustryGraph(TestCase):
+    """
+    Industry graph compiled from eveuniverse
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        create_blueprint_catalogue()
+        create_blueprint_materials()
+
+    def test_recipes(self):
+        with self.assertNumQueries(2):
+            graph = build_industry_graph()
+
+        self.assertEqual(graph.recipes[587], Recipe(691, 1, 1, ((34, 1000), (35, 100))))
@@ -0,0 +1,95 @@
+"""
+wizardindustry Blueprint Catalogue Tests
+"""
+
+# Standard Library
+from unittest.mock import patch
+
+# Django
+from django.test import TestCase
+
+# AA wizardindustry App
+from wizardindustry.helpers.catalogue import (
+    build_catalogue,
+    bump_catalogue_version,
+    get_catalogue,
+    update_blueprint_eligibility,
+)
+from wizardindustry.models import BlueprintEligibility
+from wizardindustry.tests.testdata import create_blueprint_catalogue
+
+
+class TestBlueprintCatalogue(TestCase):
+    """
+    Blueprint catalogue
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        create_blueprint_catalogue()
+        update_blueprint_eligibility()
+
+    def setUp(self):
+        bump_catalogue_version()
+
+    def test_build_catalogue_tree(self):
+        catalogue = build_catalogue()
+
+        self.assertEqual(catalogue.roots, (10,))
+        self.assertEqual(catalogue.groups[10].children, (11, 13))
+        self.assertEqual(catalogue.groups[11].children, (12,))
+
+    def test_build_catalogue_filters_blueprints(self):
+        catalogue = build_catalogue()
+
+        self.assertEqual(
+            [blueprint.name for blueprint in catalogue.groups[11].blueprints],
+            ["Rifter Blueprint"],
+        )
+        self.assertEqual(
+            [blueprint.type_id for blueprint in catalogue.groups[12].blueprints],
+            [951],
+        )
+        self.assertEqual(
+            [blueprint.type_id for blueprint in catalogue.groups[13].blueprints],
+            [1030],
+        )
+        self.assertEqual(catalogue.groups[13].blueprints[0].base_cost, 16000000)
+
+    def test_get_catalogue_is_cached_per_version(self):
+        get_catalogue()
+
+        with self.assertNumQueries(0):
+            get_catalogue()
+
+        bump_catalogue_version()
+        with self.assertNumQueries(2):
+            get_catalogue()
+
+    @patch("wizardindustry.helpers.catalogue.cache")
+    def test_catalogue_versions_expire(self, mock_cache):
+        mock_cache.get.return_value = None
+
+        get_catalogue()
+
+        mock_cache.set.assert_called_once()
+        self.assertEqual(mock_cache.set.call_args.kwargs["timeout"], 86400)
+
+    def test_eligibility_flags(self):
+        self.assertEqual(
+            set(
+                BlueprintEligibility.objects.filter(is_eligible=False).values_list(
+                    "eve_type_id", flat=True
+                )
+            ),
+            {39581, 17813, 11990},
+        )
+
+    def test_eligibility_exclusions_are_configurable(self):
+        with patch(
+            "wizardindustry.helpers.catalogue.wizardindustry_EXCLUDED_BLUEPRINTS",
+            [691],
+        ):
+            update_blueprint_eligibility()
+
+        self.assertFalse(BlueprintEligibility.objects.get(eve_type_id=691).is_eligible)
@@ -0,0 +1,96 @@
+"""
+wizardindustry Build Cost Tests
+"""
+
+# Standard Library
+from decimal import Decimal
+
+# Third Party
+import numpy as np
+
+# Django
+from django.test import TestCase
+
+# AA wizardindustry App
+from wizardindustry.helpers.catalogue import (
+    build_catalogue,
+    update_blueprint_eligibility,
+)
+from wizardindustry.helpers.costs import (
+    build_material_matrix,
+    get_material_matrix,
+    update_build_costs,
+)
+from wizardindustry.helpers.prices import bump_price_version
+from wizardindustry.models import BlueprintEligibility, MarketPrice
+from wizardindustry.tests.testdata import (
+    create_blueprint_catalogue,
+    create_blueprint_materials,
+)
+
+
+class TestBuildCosts(TestCase):
+    """
+    Material build cost engine
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        create_blueprint_catalogue()
+        create_blueprint_materials()
+        update_blueprint_eligibility()
+
+    def setUp(self):
+        bump_price_version()
+
+    def _build_costs(self):
+        return dict(
+            BlueprintEligibility.objects.filter(is_eligible=True).values_list(
+                "eve_type_id", "build_cost"
+            )
+        )
+
+    def test_material_matrix(self):
+        matrix = build_material_matrix()
+
+        self.assertEqual(matrix.blueprint_ids.tolist(), [691, 951, 1030])
+        self.assertEqual(matrix.material_ids.tolist(), [34, 35])
+        np.testing.assert_array_equal(
+            matrix.costs(np.array([1.0, 0.0])), [1000.0, 500.0, 0.0]
+        )
+
+    def test_update_build_costs(self):
+        self.assertEqual(update_build_costs(), 3)
+
+        self.assertEqual(
+            self._build_costs(),
+            {691: Decimal("6000.00"), 951: Decimal("2500.00"), 1030: Decimal("0.00")},
+        )
+        self.assertIsNone(
+            BlueprintEligibility.objects.get(eve_type_id=17813).build_cost
+        )
+
+    def test_price_changes_reprice_without_reloading_materials(self):
+        update_build_costs(reload=True)
+        MarketPrice.objects.filter(type_id=34).update(average_price=6)
+        bump_price_version()
+
+        # eligible ids, price table, current costs and two updates, no material query
+        with self.assertNumQueries(5):
+            self.assertEqual(update_build_costs(), 2)
+
+        self.assertEqual(self._build_costs()[951], Decimal("3000.00"))
+
+    def test_matrix_follows_eligibility(self):
+        matrix = get_material_matrix(reload=True)
+        BlueprintEligibility.objects.filter(eve_type_id=951).update(is_eligible=False)
+
+        self.assertIsNot(get_material_matrix(), matrix)
+        self.assertEqual(get_material_matrix().blueprint_ids.tolist(), [691, 1030])
+
+    def test_catalogue_carries_build_costs(self):
+        update_build_costs()
+
+        catalogue = build_catalogue()
+
+        self.assertEqual(catalogue.groups[11].blueprints[0].build_cost, Decimal("6000"))
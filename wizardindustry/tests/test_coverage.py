@@ -0,0 +1,101 @@
+"""
+wizardindustry Blueprint Coverage Tests
+"""
+
+# Standard Library
+from unittest.mock import patch
+
+# Django
+from django.core.cache import cache
+from django.test import TestCase
+
+# AA wizardindustry App
+from wizardindustry.helpers.catalogue import (
+    bump_catalogue_version,
+    update_blueprint_eligibility,
+)
+from wizardindustry.helpers.coverage import coverage_version, user_coverage
+from wizardindustry.helpers.ownership import bump_ownership_version
+from wizardindustry.models import BlueprintCoverage
+from wizardindustry.tasks import COVERAGE_PENDING_KEY, update_blueprint_coverage
+from wizardindustry.tests.testdata import (
+    create_blueprint,
+    create_blueprint_catalogue,
+    create_blueprint_owner,
+    create_corporation,
+    create_user_with_character,
+)
+
+
+def _coverage(**owner_filter):
+    return {
+        row.market_group_id: (row.owned_count, row.blueprint_count, row.base_cost)
+        for row in BlueprintCoverage.objects.filter(**owner_filter)
+    }
+
+
+class TestBlueprintCoverage(TestCase):
+    """
+    Materialised blueprint coverage
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        create_blueprint_catalogue()
+        update_blueprint_eligibility()
+        cls.corporation = create_corporation()
+        cls.user = create_user_with_character(corporation=cls.corporation).user
+        cls.owner = create_blueprint_owner(cls.corporation)
+        create_blueprint(cls.owner, 1, 691)
+
+    def setUp(self):
+        bump_catalogue_version()
+        bump_ownership_version()
+        cache.delete(COVERAGE_PENDING_KEY.format(self.corporation.pk))
+
+    def test_corporation_coverage(self):
+        update_blueprint_coverage()
+
+        self.assertEqual(
+            _coverage(corporation=self.corporation),
+            {
+                10: (1, 3, 18000000),
+                11: (1, 2, 2000000),
+                12: (0, 1, 2000000),
+                13: (0, 1, 16000000),
+            },
+        )
+
+    def test_user_coverage_on_first_visit(self):
+        rows = user_coverage(self.user)
+
+        self.assertEqual((rows[11].owned_count, rows[11].blueprint_count), (1, 2))
+
+    def test_user_coverage_follows_blueprint_changes(self):
+        user_coverage(self.user)
+
+        create_blueprint(self.owner, 2, 951)
+        update_blueprint_coverage([self.corporation.pk])
+
+        self.assertEqual(_coverage(user=self.user)[11], (2, 2, 0))
+
+    def test_unchanged_coverage_is_not_written(self):
+        update_blueprint_coverage()
+        version = coverage_version()
+
+        with self.assertNumQueries(5):
+            update_blueprint_coverage()
+
+        self.assertEqual(coverage_version(), version)
+
+    @patch("wizardindustry.tasks.update_blueprint_coverage.apply_async")
+    def test_blueprint_changes_queue_one_update(self, mock_apply_async):
+        with self.captureOnCommitCallbacks(execute=True):
+            create_blueprint(self.owner, 2, 951)
+            create_blueprint(self.owner, 3, 1030)
+
+        mock_apply_async.assert_called_once()
+        self.assertEqual(
+            mock_apply_async.call_args.kwargs["kwargs"],
+            {"corporation_ids": [self.corporation.pk]},
+        )
@@ -0,0 +1,191 @@
+"""
+wizardindustry Export Tests
+"""
+
+# Standard Library
+import csv
+import gzip
+import io
+import json
+import tempfile
+from datetime import timedelta
+
+# Django
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+# AA wizardindustry App
+from wizardindustry.helpers.export import iter_export
+from wizardindustry.models import (
+    CharacterAsset,
+    CorporationAsset,
+    CorporationIndustryJob,
+    Owner,
+)
+from wizardindustry.tests.testdata import (
+    create_asset,
+    create_corporation,
+    create_user_with_character,
+)
+
+
+class TestExport(TestCase):
+    """
+    Streaming exports
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.corporation = create_corporation()
+        cls.other_corporation = create_corporation(2002, "Other Corp", "OTH")
+        cls.ownership = create_user_with_character(corporation=cls.corporation)
+        cls.user = cls.ownership.user
+        Owner.objects.create(
+            corporation=cls.corporation,
+            character=cls.ownership,
+            corporation_owner=True,
+            user=cls.user,
+        )
+        create_asset(
+            CorporationAsset, 1, 34, 60003760, 1000, corporation=cls.corporation
+        )
+        create_asset(
+            CorporationAsset,
+            2,
+            587,
+            60003760,
+            name='Rifter "1"',
+            corporation=cls.corporation,
+        )
+        create_asset(
+            CorporationAsset, 3, 35, 60003760, 5, corporation=cls.other_corporation
+        )
+        create_asset(CharacterAsset, 4, 34, 60003760, 10, character=cls.ownership)
+
+        start = timezone.now()
+        CorporationIndustryJob.objects.create(
+            corporation=cls.corporation,
+            job_id=1,
+            activity_id=1,
+            blueprint_id=10,
+            blueprint_location_id=60003760,
+            blueprint_type_id=691,
+            duration=3600,
+            start_date=start,
+            end_date=start + timedelta(hours=1),
+            facility_id=60003760,
+            installer_id=1001,
+            location_id=60003760,
+            output_location_id=60003760,
+            product_type_id=587,
+            runs=2,
+            status="active",
+        )
+
+    def test_csv(self):
+        rows = list(csv.reader(io.StringIO("".join(iter_export("corporation_assets")))))
+
+        self.assertEqual(
+            rows[0][:4], ["corporation_id", "corporation_name", "item_id", "type_id"]
+        )
+        self.assertEqual([row[2] for row in rows[1:]], ["1", "2", "3"])
+        self.assertEqual(rows[2][5], 'Rifter "1"')
+
+    def test_jsonl(self):
+        lines = "".join(iter_export("corporation_jobs", "jsonl")).splitlines()
+
+        job = json.loads(lines[0])
+        self.assertEqual(len(lines), 1)
+        self.assertEqual((job["job_id"], job["corporation_name"]), (1, "Wizard Corp"))
+
+    def test_owner_filter(self):
+        rows = list(
+            csv.reader(
+                io.StringIO(
+                    "".join(
+                        iter_export(
+                            "corporation_assets", owner_ids=[self.other_corporation.pk]
+                        )
+                    )
+                )
+            )
+        )
+
+        self.assertEqual([row[2] for row in rows[1:]], ["3"])
+
+    def test_gzip(self):
+        data = gzip.decompress(b"".join(iter_export("character_assets", gzip=True)))
+
+        self.assertEqual(
+            data.decode().splitlines()[1].split(",")[:3], ["1001", "Wizard", "4"]
+        )
+
+    def test_endpoint_streams_own_rows(self):
+        self.user.is_superuser = True
+        self.user.save()
+        self.user.profile.main_character = self.ownership.character
+        self.user.profile.save()
+        self.client.force_login(self.user)
+
+        response = self.client.get(
+            reverse("wizardindustry:export", args=["corporation_assets"]),
+            {"gzip": "1"},
+        )
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(
+            response["Content-Disposition"],
+            'attachment; filename="corporation_assets.csv.gz"',
+        )
+        rows = (
+            gzip.decompress(b"".join(response.streaming_content)).decode().splitlines()
+        )
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(
+            self.client.get(
+                reverse("wizardindustry:export", args=["corporation_assets"]),
+                {"format": "xml"},
+            ).status_code,
+            400,
+        )
+        self.assertEqual(
+            self.client.get(
+                reverse("wizardindustry:export", args=["owners"])
+            ).status_code,
+            404,
+        )
+
+    def test_command(self):
+        with tempfile.NamedTemporaryFile(suffix=".jsonl") as output:
+            call_command(
+                "wizardindustry_export",
+                "corporation_assets",
+                "--format",
+                "jsonl",
+                "--owner",
+                str(self.corporation.pk),
+                "--output",
+                output.name,
+            )
+
+            with open(output.name, encoding="utf-8") as file:
+                lines = file.read().splitlines()
+
+        self.assertEqual([json.loads(line)["item_id"] for line in lines], [1, 2])
+
+    def test_command_gzip_output(self):
+        with tempfile.NamedTemporaryFile(suffix=".csv.gz") as output:
+            call_command(
+                "wizardindustry_export",
+                "character_assets",
+                "--gzip",
+                "--output",
+                output.name,
+            )
+
+            with gzip.open(output.name, "rt", encoding="utf-8") as file:
+                lines = file.read().splitlines()
+
+        self.assertEqual(lines[1].split(",")[:3], ["1001", "Wizard", "4"])
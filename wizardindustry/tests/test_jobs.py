@@ -0,0 +1,198 @@
+"""
+wizardindustry Active Job Tests
+"""
+
+# Standard Library
+from datetime import timedelta
+from unittest.mock import patch
+
+# Django
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+# AA wizardindustry App
+from wizardindustry.helpers.jobs import (
+    active_jobs,
+    active_jobs_version,
+    bump_active_jobs_version,
+    update_owner_active_jobs,
+)
+from wizardindustry.models import (
+    ActiveIndustryJob,
+    CharacterIndustryJob,
+    CorporationIndustryJob,
+    EveLocation,
+    Owner,
+    staStations,
+)
+from wizardindustry.tasks import update_active_jobs
+from wizardindustry.tests.testdata import (
+    create_blueprint_catalogue,
+    create_corporation,
+    create_user_with_character,
+)
+
+
+def create_job(model, job_id, status="active", hours=1, **fields):
+    start = timezone.now()
+    return model.objects.create(
+        job_id=job_id,
+        activity_id=1,
+        blueprint_id=10,
+        blueprint_location_id=60003760,
+        blueprint_type_id=691,
+        duration=3600,
+        start_date=start,
+        end_date=start + timedelta(hours=hours),
+        installer_id=1001,
+        output_location_id=60003760,
+        product_type_id=587,
+        product_type_name_id=587,
+        runs=2,
+        status=status,
+        **fields,
+    )
+
+
+class TestActiveJobs(TestCase):
+    """
+    Active job summary
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        create_blueprint_catalogue()
+        corporation = create_corporation()
+        cls.ownership = create_user_with_character(corporation=corporation)
+        cls.user = cls.ownership.user
+        cls.corporation_owner = Owner.objects.create(
+            corporation=corporation,
+            character=cls.ownership,
+            corporation_owner=True,
+            user=cls.user,
+        )
+        cls.character_owner = Owner.objects.create(
+            corporation=corporation,
+            character=cls.ownership,
+            corporation_owner=False,
+            user=cls.user,
+        )
+        staStations.objects.create(
+            station_id=60003760, station_name="Jita IV - 4", solar_system_id=30000142
+        )
+        EveLocation.objects.create(
+            location_id=1035466617946,
+            location_name="Perimeter - Tranquility Trading Tower",
+        )
+
+        for job_id, status, facility_id in [
+            (1, "active", 60003760),
+            (2, "delivered", 60003760),
+            (3, "paused", 1035466617946),
+            (4, "active", 60003760),
+        ]:
+            create_job(
+                CorporationIndustryJob,
+                job_id,
+                status,
+                hours=job_id,
+                corporation=corporation,
+                facility_id=facility_id,
+                facility_name_id=(
+                    facility_id if facility_id == 1035466617946 else None
+                ),
+                location_id=facility_id,
+            )
+        create_job(
+            CharacterIndustryJob,
+            5,
+            character=cls.ownership,
+            facility_id=60003760,
+            station_id=60003760,
+        )
+
+    def setUp(self):
+        bump_active_jobs_version()
+
+    def test_summary(self):
+        changed = update_owner_active_jobs(self.corporation_owner, [1, 2, 3])
+
+        self.assertEqual(changed, 2)
+        self.assertEqual(
+            list(
+                ActiveIndustryJob.objects.order_by("job_id").values_list(
+                    "job_id", "owner_name", "product_name", "facility_name", "status"
+                )
+            ),
+            [
+                (1, "Wizard Corp", "Rifter", "Jita IV - 4", "active"),
+                (
+                    3,
+                    "Wizard Corp",
+                    "Rifter",
+                    "Perimeter - Tranquility Trading Tower",
+                    "paused",
+                ),
+            ],
+        )
+        self.assertEqual(update_owner_active_jobs(self.corporation_owner, [1, 2, 3]), 0)
+
+    def test_finished_jobs_are_removed(self):
+        update_owner_active_jobs(self.corporation_owner, [1, 3])
+        CorporationIndustryJob.objects.filter(job_id=1).update(status="ready")
+
+        self.assertEqual(update_owner_active_jobs(self.corporation_owner, [1]), 2)
+        self.assertEqual(
+            list(ActiveIndustryJob.objects.values_list("job_id", "status")),
+            [(1, "ready")],
+        )
+
+    def test_active_jobs_are_cached(self):
+        update_owner_active_jobs(self.corporation_owner)
+        update_owner_active_jobs(self.character_owner)
+        bump_active_jobs_version()
+
+        jobs = active_jobs(self.user)
+
+        self.assertEqual(
+            [(job["owner_name"], job["job_id"]) for job in jobs],
+            [("Wizard", 5), ("Wizard Corp", 1), ("Wizard Corp", 3), ("Wizard Corp", 4)],
+        )
+        with self.assertNumQueries(0):
+            self.assertEqual(active_jobs(self.user), jobs)
+
+    def test_task_bumps_version_on_change(self):
+        version = active_jobs_version()
+
+        update_active_jobs(self.character_owner.pk, [5])
+        bumped = active_jobs_version()
+        update_active_jobs(self.character_owner.pk, [5])
+
+        self.assertNotEqual(bumped, version)
+        self.assertEqual(active_jobs_version(), bumped)
+
+    @patch("wizardindustry.tasks.update_active_jobs.delay")
+    def test_job_sync_queues_summary(self, mock_delay):
+        with patch.object(Owner, "_get_corporation_jobs", return_value=[1, 3]):
+            self.corporation_owner._get_industry_jobs()
+        with patch.object(Owner, "_get_character_jobs", return_value=False):
+            self.character_owner._get_industry_jobs()
+
+        mock_delay.assert_called_once_with(self.corporation_owner.pk, [1, 3])
+
+    def test_endpoint(self):
+        update_owner_active_jobs(self.character_owner)
+        self.user.is_superuser = True
+        self.user.save()
+        self.user.profile.main_character = self.ownership.character
+        self.user.profile.save()
+        self.client.force_login(self.user)
+
+        data = self.client.get(reverse("wizardindustry:active_jobs")).json()
+
+        self.assertEqual(data["version"], str(active_jobs_version()))
+        self.assertEqual([job["job_id"] for job in data["jobs"]], [5])
+        self.assertEqual(
+            self.client.get(reverse("wizardindustry:industry_jobs")).status_code, 200
+        )
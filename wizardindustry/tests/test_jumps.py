@@ -0,0 +1,139 @@
+"""
+wizardindustry Jump Graph Tests
+"""
+
+# Third Party
+import numpy as np
+
+# Django
+from django.test import TestCase
+from django.urls import reverse
+
+# AA wizardindustry App
+from wizardindustry.helpers.catalogue import bump_catalogue_version
+from wizardindustry.helpers.jumps import (
+    JumpGraph,
+    build_jump_graph,
+    get_jump_graph,
+    nearest_stockpiles,
+)
+from wizardindustry.helpers.rollups import update_owner_rollup
+from wizardindustry.models import CorporationAsset, EveLocation, Owner, staStations
+from wizardindustry.tests.testdata import (
+    create_asset,
+    create_corporation,
+    create_jump_graph,
+    create_user_with_character,
+)
+
+JITA = 30000142
+PERIMETER = 30000144
+NEW_CALDARI = 30000145
+AMARR = 30002187
+
+
+class TestJumpGraph(TestCase):
+    """
+    Jump distances
+    """
+
+    def test_distances(self):
+        graph = JumpGraph([(1, 2), (2, 3), (3, 4), (2, 5), (7, 8)])
+
+        np.testing.assert_array_equal(graph.distances(1), [0, 1, 2, 3, 2, -1, -1])
+        self.assertEqual(graph.jumps(4, [1, 5, 8, 6, None]), [3, 3, None, None, None])
+
+    def test_distances_are_cached(self):
+        graph = JumpGraph([(1, 2)])
+
+        self.assertIs(graph.distances(1), graph.distances(1))
+
+    def test_build_jump_graph(self):
+        create_jump_graph()
+
+        graph = build_jump_graph()
+
+        self.assertEqual(graph.system_ids.tolist(), [JITA, PERIMETER, NEW_CALDARI])
+        self.assertEqual(graph.jumps(NEW_CALDARI, [JITA, AMARR]), [2, None])
+
+
+class TestNearestStockpiles(TestCase):
+    """
+    Stockpiles of a type by jumps
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        create_jump_graph()
+        corporation = create_corporation()
+        cls.ownership = create_user_with_character(corporation=corporation)
+        cls.user = cls.ownership.user
+        owner = Owner.objects.create(
+            corporation=corporation,
+            character=cls.ownership,
+            corporation_owner=True,
+            user=cls.user,
+        )
+        staStations.objects.create(
+            station_id=60003760, station_name="Jita IV - 4", solar_system_id=JITA
+        )
+        EveLocation.objects.create(
+            location_id=1035466617946,
+            location_name="Perimeter - Tranquility Trading Tower",
+            system_id=PERIMETER,
+        )
+        for item_id, location_id, quantity in [
+            (1, 60003760, 100),
+            (2, 1035466617946, 10),
+            (3, 1000000000001, 1000),
+        ]:
+            create_asset(
+                CorporationAsset,
+                item_id,
+                34,
+                location_id,
+                quantity,
+                corporation=corporation,
+            )
+        update_owner_rollup(owner)
+
+    def setUp(self):
+        bump_catalogue_version()
+
+    def test_nearest_stockpiles(self):
+        rows = nearest_stockpiles(self.user, 34, NEW_CALDARI)
+
+        self.assertEqual(
+            [(row["location_id"], row["jumps"]) for row in rows],
+            [(1035466617946, 1), (60003760, 2), (1000000000001, None)],
+        )
+
+    def test_graph_is_kept_per_catalogue_version(self):
+        graph = get_jump_graph()
+
+        self.assertIs(get_jump_graph(), graph)
+        bump_catalogue_version()
+        self.assertIsNot(get_jump_graph(), graph)
+
+    def test_endpoint(self):
+        self.user.is_superuser = True
+        self.user.save()
+        self.user.profile.main_character = self.ownership.character
+        self.user.profile.save()
+        self.client.force_login(self.user)
+
+        data = self.client.get(
+            reverse("wizardindustry:nearest_stockpiles"),
+            {"type_id": 34, "system_id": JITA, "limit": 1},
+        ).json()
+
+        self.assertEqual(
+            [(row["location_name"], row["jumps"]) for row in data["stockpiles"]],
+            [("Jita IV - 4", 0)],
+        )
+        self.assertEqual(
+            self.client.get(
+                reverse("wizardindustry:nearest_stockpiles"), {"type_id": 34}
+            ).status_code,
+            400,
+        )
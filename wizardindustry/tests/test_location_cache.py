@@ -0,0 +1,97 @@
+"""
+wizardindustry Location Cache Tests
+"""
+
+# Standard Library
+import time
+from unittest.mock import patch
+
+# Django
+from django.test import TestCase
+
+# AA wizardindustry App
+from wizardindustry.helpers import location_cache
+from wizardindustry.models import EveLocation, fetch_location_name, staStations
+
+
+class TestFetchLocationNameCache(TestCase):
+    """
+    fetch_location_name cache tiers
+    """
+
+    def setUp(self):
+        location_cache.delete_locations([60003760, 1022734985679])
+
+    def test_known_station_resolves_from_cache(self):
+        EveLocation.objects.create(location_id=60003760, location_name="Jita 4-4")
+
+        with self.assertNumQueries(1):
+            fetch_location_name(60003760, "Hangar", 1001, 1)
+        with self.assertNumQueries(0):
+            location = fetch_location_name(60003760, "Hangar", 1001, 1)
+
+        self.assertEqual(location.location_name, "Jita 4-4")
+
+    def test_fresh_structure_skips_esi(self):
+        EveLocation.objects.create(
+            location_id=1022734985679, location_name="Wizard Tower"
+        )
+
+        fetch_location_name(1022734985679, "Hangar", 1001, 1)
+        with self.assertNumQueries(0):
+            location = fetch_location_name(1022734985679, "Hangar", 1001, 1)
+
+        self.assertEqual(location.location_name, "Wizard Tower")
+
+    def test_django_cache_tier_refills_local_tier(self):
+        EveLocation.objects.create(location_id=60003760, location_name="Jita 4-4")
+        fetch_location_name(60003760, "Hangar", 1001, 1)
+        location_cache._local.clear()
+
+        with self.assertNumQueries(0):
+            location = fetch_location_name(60003760, "Hangar", 1001, 1)
+
+        self.assertEqual(location.location_name, "Jita 4-4")
+
+    def test_local_tier_expires(self):
+        EveLocation.objects.create(location_id=60003760, location_name="Jita 4-4")
+        fetch_location_name(60003760, "Hangar", 1001, 1)
+        # renamed by another process, which only cleared its own local tier
+        entry = location_cache.get_location(60003760)
+        location_cache.cache.set(
+            location_cache.CACHE_KEY.format(60003760), (entry[0], "Jita", *entry[2:])
+        )
+
+        self.assertEqual(location_cache.get_location(60003760)[1], "Jita 4-4")
+        with patch(
+            "wizardindustry.helpers.location_cache.time.monotonic",
+            return_value=time.monotonic() + location_cache._local.timeout,
+        ):
+            self.assertEqual(location_cache.get_location(60003760)[1], "Jita")
+
+
+@patch("wizardindustry.models.esi")
+@patch("wizardindustry.models.EveSolarSystem.objects.get_or_create_esi")
+class TestFetchLocationNameStations(TestCase):
+    """
+    fetch_location_name station resolution
+    """
+
+    def setUp(self):
+        location_cache.delete_locations([60003760])
+
+    def test_station_resolves_from_sde(self, get_or_create_esi, esi):
+        get_or_create_esi.return_value = (object(), False)
+        staStations.objects.create(
+            station_id=60003760,
+            station_name="Jita IV - Moon 4 - Caldari Navy Assembly Plant",
+            solar_system_id=30000142,
+        )
+
+        location = fetch_location_name(60003760, "Hangar", 1001, 1)
+
+        self.assertEqual(location.system_id, 30000142)
+        self.assertEqual(
+            location.location_name, "Jita IV - Moon 4 - Caldari Navy Assembly Plant"
+        )
+        esi.client.Universe.GetUniverseStationsStationId.assert_not_called()
@@ -0,0 +1,53 @@
+"""
+wizardindustry Blueprint Ownership Tests
+"""
+
+# Django
+from django.test import TestCase
+
+# AA wizardindustry App
+from wizardindustry.helpers.ownership import (
+    bump_ownership_version,
+    owned_blueprint_type_ids,
+)
+from wizardindustry.tests.testdata import (
+    create_blueprint,
+    create_blueprint_catalogue,
+    create_blueprint_owner,
+    create_corporation,
+    create_user_with_character,
+)
+
+
+class TestOwnedBlueprintTypeIds(TestCase):
+    """
+    Owned blueprint type sets
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        create_blueprint_catalogue()
+        corporation = create_corporation()
+        cls.user = create_user_with_character(corporation=corporation).user
+        cls.owner = create_blueprint_owner(corporation)
+        create_blueprint(cls.owner, 1, 691)
+        create_blueprint(cls.owner, 2, 1030, runs=10)
+
+    def setUp(self):
+        bump_ownership_version()
+
+    def test_contains_originals_only(self):
+        self.assertEqual(owned_blueprint_type_ids(self.user), {691})
+
+    def test_is_cached(self):
+        owned_blueprint_type_ids(self.user)
+
+        with self.assertNumQueries(0):
+            owned_blueprint_type_ids(self.user)
+
+    def test_blueprint_changes_invalidate(self):
+        owned_blueprint_type_ids(self.user)
+
+        create_blueprint(self.owner, 3, 951)
+
+        self.assertEqual(owned_blueprint_type_ids(self.user), {691, 951})
@@ -0,0 +1,119 @@
+"""
+wizardindustry Market Price Tests
+"""
+
+# Standard Library
+import json
+import tempfile
+from decimal import Decimal
+
+# Third Party
+import numpy as np
+
+# Django
+from django.test import TestCase
+
+# AA wizardindustry App
+from wizardindustry.helpers.prices import (
+    JsonFilePriceSource,
+    bump_price_version,
+    get_price_table,
+    price_version,
+    refresh_market_prices,
+    value_assets,
+)
+from wizardindustry.models import CorporationAsset, MarketPrice
+from wizardindustry.tests.testdata import create_asset, create_corporation
+
+PRICES = [
+    {"type_id": 34, "average_price": 5.0, "adjusted_price": 4.5, "sell_price": 5.5},
+    {"type_id": 35, "adjusted_price": 10.0},
+    {"type_id": 587, "average_price": 400000.0, "buy_price": 350000.0},
+]
+
+
+class TestMarketPrices(TestCase):
+    """
+    Local market price cache
+    """
+
+    def setUp(self):
+        bump_price_version()
+        self.file = tempfile.NamedTemporaryFile("w", suffix=".json")
+        self.addCleanup(self.file.close)
+        self._write(PRICES)
+
+    def _write(self, prices):
+        self.file.seek(0)
+        self.file.truncate()
+        json.dump(prices, self.file)
+        self.file.flush()
+
+    def test_refresh(self):
+        self.assertEqual(refresh_market_prices(JsonFilePriceSource(self.file.name)), 3)
+
+        price = MarketPrice.objects.get(type_id=34)
+        self.assertEqual(
+            (price.average_price, price.adjusted_price, price.buy_price),
+            (Decimal("5.00"), Decimal("4.50"), None),
+        )
+
+    def test_unchanged_prices_are_not_written(self):
+        source = JsonFilePriceSource(self.file.name)
+        refresh_market_prices(source)
+        version = price_version()
+
+        with self.assertNumQueries(1):
+            self.assertEqual(refresh_market_prices(source), 0)
+
+        self.assertEqual(price_version(), version)
+
+    def test_changed_price_is_written(self):
+        source = JsonFilePriceSource(self.file.name)
+        refresh_market_prices(source)
+        version = price_version()
+        self._write([{**PRICES[0], "sell_price": 6.0}, *PRICES[1:]])
+
+        self.assertEqual(refresh_market_prices(source), 1)
+
+        self.assertEqual(MarketPrice.objects.get(type_id=34).sell_price, Decimal("6"))
+        self.assertNotEqual(price_version(), version)
+
+    def test_lookup_falls_back_to_average_and_adjusted_price(self):
+        refresh_market_prices(JsonFilePriceSource(self.file.name))
+
+        table = get_price_table()
+
+        np.testing.assert_array_equal(
+            table.lookup([35, 34, 1, 587], "sell_price"), [10.0, 5.5, 0.0, 400000.0]
+        )
+        np.testing.assert_array_equal(
+            table.lookup([587, 35], "buy_price"), [350000.0, 10.0]
+        )
+
+    def test_value_assets(self):
+        refresh_market_prices(JsonFilePriceSource(self.file.name))
+        corporation = create_corporation()
+        for item_id, type_id, quantity, blueprint_copy in [
+            (1, 34, 1000, None),
+            (2, 34, 500, None),
+            (3, 587, 1, None),
+            (4, 691, 1, True),
+        ]:
+            create_asset(
+                CorporationAsset,
+                item_id,
+                type_id,
+                60003760,
+                quantity,
+                corporation=corporation,
+                blueprint_copy=blueprint_copy,
+            )
+        get_price_table()
+
+        with self.assertNumQueries(1):
+            value = value_assets(
+                CorporationAsset.objects.filter(corporation=corporation)
+            )
+
+        self.assertEqual(value, 1500 * 5.0 + 400000.0)
@@ -0,0 +1,220 @@
+"""
+wizardindustry Asset Value Rollup Tests
+"""
+
+# Standard Library
+from decimal import Decimal
+from unittest.mock import patch
+
+# Django
+from django.test import TestCase
+from django.urls import reverse
+
+# AA wizardindustry App
+from wizardindustry.helpers.prices import bump_price_version
+from wizardindustry.helpers.rollups import (
+    asset_values,
+    bump_rollup_version,
+    rollup_version,
+    update_owner_rollup,
+)
+from wizardindustry.models import (
+    AssetTypeLocation,
+    AssetValueRollup,
+    CorporationAsset,
+    EveLocation,
+    MarketPrice,
+    Owner,
+    staStations,
+)
+from wizardindustry.tasks import update_asset_rollups, update_market_prices
+from wizardindustry.tests.testdata import (
+    create_asset,
+    create_blueprint_catalogue,
+    create_blueprint_materials,
+    create_corporation,
+    create_user_with_character,
+)
+
+JITA = 60003760
+AMARR = 60008494
+
+
+def _rollup(**owner_filter):
+    return {
+        (row.location_id, row.category_id): (row.quantity, row.value)
+        for row in AssetValueRollup.objects.filter(**owner_filter)
+    }
+
+
+def _type_locations(**owner_filter):
+    return {
+        (row.type_id, row.location_id): row.quantity
+        for row in AssetTypeLocation.objects.filter(**owner_filter)
+    }
+
+
+class TestAssetValueRollup(TestCase):
+    """
+    Materialised asset values
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        create_blueprint_catalogue()
+        create_blueprint_materials()
+        cls.corporation = create_corporation()
+        cls.ownership = create_user_with_character(corporation=cls.corporation)
+        cls.owner = Owner.objects.create(
+            corporation=cls.corporation,
+            character=cls.ownership,
+            corporation_owner=True,
+            user=cls.ownership.user,
+        )
+        corporation = {"corporation": cls.corporation}
+        create_asset(CorporationAsset, 1, 34, JITA, 1000, **corporation)
+        # a Rifter in Amarr with pyerite in its cargo, and a blueprint copy
+        create_asset(CorporationAsset, 2, 587, AMARR, **corporation)
+        create_asset(CorporationAsset, 3, 35, 2, 50, **corporation)
+        create_asset(
+            CorporationAsset, 4, 691, AMARR, blueprint_copy=True, **corporation
+        )
+        EveLocation.objects.create(location_id=JITA, location_name="Jita IV - 4")
+
+    def setUp(self):
+        bump_price_version()
+        bump_rollup_version()
+
+    def test_rollup(self):
+        update_owner_rollup(self.owner)
+
+        self.assertEqual(
+            _rollup(corporation=self.corporation),
+            {
+                (JITA, 4): (1000, Decimal("5000.00")),
+                (AMARR, 4): (50, Decimal("500.00")),
+                (AMARR, 6): (1, Decimal("0.00")),
+                (AMARR, 9): (1, Decimal("0.00")),
+            },
+        )
+
+    def test_unchanged_rollup_is_not_written(self):
+        update_owner_rollup(self.owner)
+
+        # assets, categories and existing rows of both rollups
+        with self.assertNumQueries(4):
+            self.assertEqual(update_owner_rollup(self.owner), 0)
+
+    def test_type_locations(self):
+        update_owner_rollup(self.owner)
+
+        self.assertEqual(
+            _type_locations(corporation=self.corporation),
+            {(34, JITA): 1000, (587, AMARR): 1, (35, AMARR): 50, (691, AMARR): 1},
+        )
+
+    def test_type_locations_follow_asset_sync(self):
+        update_owner_rollup(self.owner)
+        CorporationAsset.objects.filter(item_id=2).update(location_id=JITA)
+        create_asset(CorporationAsset, 5, 34, AMARR, 10, corporation=self.corporation)
+
+        update_owner_rollup(self.owner)
+
+        self.assertEqual(
+            _type_locations(corporation=self.corporation),
+            {
+                (34, JITA): 1000,
+                (34, AMARR): 10,
+                (587, JITA): 1,
+                (35, JITA): 50,
+                (691, AMARR): 1,
+            },
+        )
+
+    def test_price_refresh_skips_type_locations(self):
+        update_owner_rollup(self.owner)
+
+        with self.assertNumQueries(3):
+            update_owner_rollup(self.owner, type_locations=False)
+
+    def test_price_refresh_revalues(self):
+        update_asset_rollups()
+        version = rollup_version()
+        MarketPrice.objects.filter(type_id=34).update(average_price=6)
+        bump_price_version()
+
+        update_asset_rollups()
+
+        self.assertEqual(
+            _rollup(corporation=self.corporation)[(JITA, 4)],
+            (1000, Decimal("6000.00")),
+        )
+        self.assertNotEqual(rollup_version(), version)
+
+    @patch("wizardindustry.tasks.update_asset_rollups.delay")
+    @patch("wizardindustry.tasks.refresh_market_prices", return_value=1)
+    def test_price_refresh_queues_rollups(self, _, mock_delay):
+        update_market_prices()
+
+        mock_delay.assert_called_once()
+
+    def test_asset_values_are_cached(self):
+        user = self.ownership.user
+        update_owner_rollup(self.owner)
+        bump_rollup_version()
+
+        values = asset_values(user)
+
+        self.assertEqual(values["total"], Decimal("5500.00"))
+        with self.assertNumQueries(0):
+            self.assertEqual(asset_values(user), values)
+
+        AssetValueRollup.objects.all().delete()
+        self.assertEqual(asset_values(user), values)
+        bump_rollup_version()
+        self.assertEqual(asset_values(user)["total"], 0)
+
+    def test_dashboard(self):
+        update_owner_rollup(self.owner)
+        staStations.objects.create(
+            station_id=AMARR,
+            station_name="Amarr VIII (Oris) - Emperor Family Academy",
+            solar_system_id=30002187,
+        )
+        user = self.ownership.user
+        user.is_superuser = True
+        user.save()
+        user.profile.main_character = self.ownership.character
+        user.profile.save()
+        self.client.force_login(user)
+
+        response = self.client.get(reverse("wizardindustry:asset_values"))
+
+        self.assertEqual(
+            [(row["name"], row["value"]) for row in response.context["locations"]],
+            [
+                ("Jita IV - 4", Decimal("5000.00")),
+                ("Amarr VIII (Oris) - Emperor Family Academy", Decimal("500.00")),
+            ],
+        )
+        self.assertEqual(
+            [row["name"] for row in response.context["categories"]],
+            ["Material", "Ship", "Blueprint"],
+        )
+        self.assertEqual(response.context["total"], Decimal("5500.00"))
+
+        data = self.client.get(
+            reverse("wizardindustry:asset_locations", args=[34])
+        ).json()
+
+        self.assertEqual(
+            data["locations"],
+            [
+                {
+                    "location_id": JITA,
+                    "location_name": "Jita IV - 4",
+                    "owner_name": "Wizard Corp",
+                    "quantity": 1000,
+                }
+            ],
+        )
@@ -0,0 +1,89 @@
+"""
+wizardindustry Stock Matching Tests
+"""
+
+# Django
+from django.test import TestCase
+
+# AA wizardindustry App
+from wizardindustry.helpers.stock import match_stock, root_locations
+from wizardindustry.models import CharacterAsset, CorporationAsset
+from wizardindustry.tests.testdata import (
+    create_asset,
+    create_corporation,
+    create_user_with_character,
+)
+
+JITA = 60003760
+AMARR = 60008494
+
+
+class TestRootLocations(TestCase):
+    """
+    Containers resolved to the station or structure holding them
+    """
+
+    def test_root_locations(self):
+        self.assertEqual(
+            root_locations({1: JITA, 2: 1, 3: 2, 4: AMARR}),
+            {1: JITA, 2: JITA, 3: JITA, 4: AMARR},
+        )
+
+    def test_limited_to_locations(self):
+        self.assertEqual(
+            root_locations({1: JITA, 2: 1, 3: AMARR}, [2, AMARR]),
+            {1: JITA, 2: JITA, AMARR: AMARR},
+        )
+
+
+class TestMatchStock(TestCase):
+    """
+    Bill of materials against owned assets
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.corporation = create_corporation()
+        cls.ownership = create_user_with_character(corporation=cls.corporation)
+        corporation = {"corporation": cls.corporation}
+        create_asset(CorporationAsset, 1, 34, JITA, 600, **corporation)
+        # a container in Amarr holding tritanium and a ship holding pyerite
+        create_asset(CorporationAsset, 2, 17366, AMARR, **corporation)
+        create_asset(CorporationAsset, 3, 34, 2, 300, **corporation)
+        create_asset(CorporationAsset, 4, 587, 2, **corporation)
+        create_asset(CorporationAsset, 5, 35, 4, 40, **corporation)
+        create_asset(CharacterAsset, 6, 35, JITA, 30, character=cls.ownership)
+
+    def test_shortfall_over_all_locations(self):
+        match = match_stock({34: 1000, 35: 50}, [self.corporation.pk])
+
+        self.assertEqual(match.stock, {34: {JITA: 600, AMARR: 300}, 35: {AMARR: 40}})
+        self.assertEqual(match.shortfall, {34: 100, 35: 10})
+
+    def test_shortfall_per_location(self):
+        match = match_stock(
+            {34: 1000, 35: 50}, [self.corporation.pk], [self.ownership.pk]
+        )
+
+        self.assertEqual(match.shortfall, {34: 100})
+        self.assertEqual(
+            match.location_shortfall,
+            {JITA: {34: 400, 35: 20}, AMARR: {34: 700, 35: 10}},
+        )
+
+    def test_limited_to_locations(self):
+        match = match_stock({34: 500}, [self.corporation.pk], location_ids={JITA})
+
+        self.assertEqual(match.stock, {34: {JITA: 600}})
+        self.assertEqual(match.shortfall, {})
+
+    def test_grouped_queries(self):
+        # stock, then one query per level of containers
+        with self.assertNumQueries(3):
+            match_stock({34: 1000, 35: 50}, [self.corporation.pk])
+
+    def test_no_owners(self):
+        with self.assertNumQueries(0):
+            match = match_stock({34: 10}, [])
+
+        self.assertEqual(match.shortfall, {34: 10})
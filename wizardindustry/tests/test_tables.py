@@ -0,0 +1,216 @@
+"""
+wizardindustry Table Tests
+"""
+
+# Standard Library
+from datetime import timedelta
+
+# Django
+from django.http import QueryDict
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+# AA wizardindustry App
+from wizardindustry.helpers.tables import TableRequest, table_page
+from wizardindustry.models import CorporationAsset, CorporationIndustryJob, Owner
+from wizardindustry.tests.testdata import (
+    create_asset,
+    create_blueprint_catalogue,
+    create_blueprint_materials,
+    create_corporation,
+    create_user_with_character,
+)
+
+ASSET_COLUMNS = ["corporation_id", "item_id", "type_id", "location_id"]
+JOB_COLUMNS = ["corporation_id", "job_id", "status", "end_date"]
+
+
+def table_request(name, columns, **params) -> TableRequest:
+    query = QueryDict(mutable=True)
+    for index, column in enumerate(columns):
+        query[f"columns[{index}][data]"] = column
+    query.update({key: str(value) for key, value in params.items()})
+    return TableRequest(name, query)
+
+
+class TestTables(TestCase):
+    """
+    Keyset paginated asset and job tables
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        create_blueprint_catalogue()
+        create_blueprint_materials()
+        cls.corporation = create_corporation()
+        cls.other_corporation = create_corporation(2002, "Other Corp", "OTH")
+        stranger_corporation = create_corporation(2003, "Stranger Corp", "STR")
+        cls.ownership = create_user_with_character(corporation=cls.corporation)
+        cls.user = cls.ownership.user
+        for corporation in (cls.corporation, cls.other_corporation):
+            Owner.objects.create(
+                corporation=corporation,
+                character=cls.ownership,
+                corporation_owner=True,
+                user=cls.user,
+            )
+
+        for item_id, type_id, location_id, corporation in [
+            (1, 34, 60000003, cls.corporation),
+            (2, 35, 60000001, cls.corporation),
+            (3, 34, 60000002, cls.other_corporation),
+            (4, 34, 60000001, cls.other_corporation),
+            (5, 35, 60000002, cls.corporation),
+            (6, 34, 60000001, stranger_corporation),
+        ]:
+            create_asset(
+                CorporationAsset,
+                item_id,
+                type_id,
+                location_id,
+                corporation=corporation,
+            )
+
+        start = timezone.now()
+        for job_id, status, hours, corporation in [
+            (1, "delivered", 1, cls.corporation),
+            (2, "active", 3, cls.other_corporation),
+            (3, "active", 2, cls.corporation),
+        ]:
+            CorporationIndustryJob.objects.create(
+                corporation=corporation,
+                job_id=job_id,
+                activity_id=1,
+                blueprint_id=10,
+                blueprint_location_id=60003760,
+                blueprint_type_id=691,
+                duration=3600,
+                start_date=start,
+                end_date=start + timedelta(hours=hours),
+                facility_id=60003760,
+                installer_id=1001,
+                location_id=60003760,
+                output_location_id=60003760,
+                product_type_id=587,
+                runs=1,
+                status=status,
+            )
+
+    def pages(self, name, columns, **params) -> list:
+        """The item or job ids of every page of a table."""
+        pages = []
+        cursor = None
+        while True:
+            page = table_page(
+                name,
+                self.user,
+                table_request(name, columns, length=2, cursor=cursor or "", **params),
+            )
+            pages.append(
+                [row.get("item_id", row.get("job_id")) for row in page["data"]]
+            )
+            cursor = page["next"]
+            if cursor is None:
+                return pages
+
+    def test_pages_merge_owners_in_order(self):
+        self.assertEqual(
+            self.pages("corporation_assets", ASSET_COLUMNS, **{"order[0][column]": 3}),
+            [[2, 4], [3, 5], [1]],
+        )
+
+    def test_descending(self):
+        self.assertEqual(
+            self.pages(
+                "corporation_assets",
+                ASSET_COLUMNS,
+                **{"order[0][column]": 2, "order[0][dir]": "desc"},
+            ),
+            [[5, 2], [4, 3], [1]],
+        )
+
+    def test_filters_and_search(self):
+        self.assertEqual(
+            self.pages(
+                "corporation_assets",
+                ASSET_COLUMNS,
+                **{
+                    "columns[0][search][value]": 2002,
+                    "search[value]": "Trit",
+                },
+            ),
+            [[4, 3]],
+        )
+
+    def test_jobs_by_status(self):
+        self.assertEqual(
+            self.pages("corporation_jobs", JOB_COLUMNS, **{"order[0][column]": 2}),
+            [[3, 2], [1]],
+        )
+
+    def test_page_cost_does_not_grow(self):
+        first = table_page(
+            "corporation_assets",
+            self.user,
+            table_request("corporation_assets", ASSET_COLUMNS, length=1),
+        )
+
+        with self.assertNumQueries(3):
+            table_page(
+                "corporation_assets",
+                self.user,
+                table_request(
+                    "corporation_assets",
+                    ASSET_COLUMNS,
+                    length=1,
+                    cursor=first["next"],
+                ),
+            )
+
+    def test_invalid_requests(self):
+        for params in [
+            {"order[0][column]": 1},
+            {"columns[1][search][value]": 1},
+            {"length": 501},
+            {"order[0][column]": "x"},
+        ]:
+            with self.subTest(params=params):
+                with self.assertRaises(ValueError):
+                    table_request("corporation_assets", ASSET_COLUMNS, **params)
+
+        with self.assertRaises(ValueError):
+            table_page(
+                "corporation_assets",
+                self.user,
+                table_request("corporation_assets", ASSET_COLUMNS, cursor="WzFd"),
+            )
+
+    def test_endpoint(self):
+        self.user.is_superuser = True
+        self.user.save()
+        self.user.profile.main_character = self.ownership.character
+        self.user.profile.save()
+        self.client.force_login(self.user)
+
+        data = self.client.get(
+            reverse("wizardindustry:table", args=["corporation_jobs"]),
+            {"draw": 7, "length": 1},
+        ).json()
+
+        self.assertEqual(data["draw"], 7)
+        self.assertEqual(data["data"][0]["corporation_name"], "Wizard Corp")
+        self.assertIsNotNone(data["next"])
+        self.assertEqual(
+            self.client.get(
+                reverse("wizardindustry:table", args=["corporation_jobs"]),
+                {"cursor": "nonsense"},
+            ).status_code,
+            400,
+        )
+        self.assertEqual(
+            self.client.get(
+                reverse("wizardindustry:table", args=["owners"])
+            ).status_code,
+            404,
+        )
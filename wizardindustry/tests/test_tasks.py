@@ -0,0 +1,418 @@
+"""
+wizardindustry Task Tests
+"""
+
+# Standard Library
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+# Third Party
+from bravado.exception import HTTPNotFound
+
+# Django
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+
+# Alliance Auth
+from allianceauth.authentication.models import CharacterOwnership
+from allianceauth.eveonline.models import EveCharacter, EveCorporationInfo
+from esi.exceptions import ESIErrorLimitException
+
+# AA wizardindustry App
+from wizardindustry.models import CorporationAsset, EveLocation, Owner
+from wizardindustry.tasks import (
+    _create_can_locations,
+    _create_office_locations,
+    _update_can_locations,
+    _update_office_locations,
+    refresh_stale_structures,
+    refresh_structure_names,
+    update_assets,
+    update_owner_locations,
+)
+from wizardindustry.tests.testdata import (
+    create_asset,
+    create_container_types,
+    create_jump_graph,
+)
+
+JITA_SYSTEM = 30000142
+
+
+def _office(corporation, item_id, location_id):
+    return CorporationAsset.objects.create(
+        corporation=corporation,
+        singleton=True,
+        item_id=item_id,
+        location_flag="OfficeFolder",
+        location_id=location_id,
+        location_type="item",
+        quantity=1,
+        type_id=27,
+    )
+
+
+class TestOfficeLocations(TestCase):
+    """
+    Office location maintenance
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.corporation = EveCorporationInfo.objects.create(
+            corporation_id=2001,
+            corporation_name="Wizard Corp",
+            corporation_ticker="WIZ",
+            member_count=1,
+        )
+
+    def test_create_office_locations_uses_constant_queries(self):
+        EveLocation.objects.create(location_id=1000000000001, location_name="Keep")
+        for item_id in range(1, 51):
+            _office(self.corporation, item_id, 1000000000001)
+
+        with self.assertNumQueries(2):
+            _create_office_locations()
+
+        self.assertEqual(
+            EveLocation.objects.filter(location_name__startswith="Office").count(), 50
+        )
+        self.assertEqual(
+            EveLocation.objects.get(location_id=7).location_name, "Office: #7"
+        )
+
+    def test_create_office_locations_skips_known_offices(self):
+        EveLocation.objects.create(location_id=1, location_name="Office: #1")
+        _office(self.corporation, 1, 1000000000001)
+        _office(self.corporation, 2, 1000000000001)
+
+        _create_office_locations()
+
+        self.assertEqual(EveLocation.objects.count(), 2)
+
+    def test_update_office_locations_only_touches_resolvable_offices(self):
+        EveLocation.objects.create(location_id=1000000000001, location_name="Keep")
+        EveLocation.objects.create(location_id=1, location_name="Office: #1")
+        EveLocation.objects.create(location_id=2, location_name="Office: #2")
+        _office(self.corporation, 1, 1000000000001)
+
+        _update_office_locations()
+
+        self.assertEqual(EveLocation.objects.get(location_id=1).system_id, None)
+        self.assertTrue(EveLocation.objects.filter(location_id=2).exists())
+
+    def test_create_office_locations_resolves_parent_system(self):
+        create_jump_graph()
+        EveLocation.objects.create(
+            location_id=1000000000001, location_name="Keep", system_id=JITA_SYSTEM
+        )
+        _office(self.corporation, 1, 1000000000001)
+
+        _create_office_locations()
+
+        self.assertEqual(EveLocation.objects.get(location_id=1).system_id, JITA_SYSTEM)
+
+    def test_update_office_locations_resolves_parent_system(self):
+        create_jump_graph()
+        EveLocation.objects.create(
+            location_id=1000000000001, location_name="Keep", system_id=JITA_SYSTEM
+        )
+        EveLocation.objects.create(location_id=1, location_name="Office: #1")
+        _office(self.corporation, 1, 1000000000001)
+
+        _update_office_locations()
+
+        office = EveLocation.objects.get(location_id=1)
+        self.assertEqual(office.system_id, JITA_SYSTEM)
+        self.assertIsNotNone(office.last_update)
+
+
+class TestCanLocations(TestCase):
+    """
+    Can location maintenance
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.corporation = EveCorporationInfo.objects.create(
+            corporation_id=2001,
+            corporation_name="Wizard Corp",
+            corporation_ticker="WIZ",
+            member_count=1,
+        )
+        create_jump_graph()
+        create_container_types()
+        EveLocation.objects.create(
+            location_id=1000000000001, location_name="Keep", system_id=JITA_SYSTEM
+        )
+
+    def _can(self, item_id, type_id, name):
+        return create_asset(
+            CorporationAsset,
+            item_id,
+            type_id,
+            1000000000001,
+            type_name_id=type_id,
+            name=name,
+            corporation=self.corporation,
+        )
+
+    def test_create_can_locations(self):
+        self._can(1, 3465, "Ore")
+        self._can(2, 25, "Corpse")
+
+        _create_can_locations()
+
+        can = EveLocation.objects.get(location_id=1)
+        self.assertEqual(can.location_name, "Can: Ore")
+        self.assertEqual(can.system_id, JITA_SYSTEM)
+        self.assertFalse(EveLocation.objects.filter(location_id=2).exists())
+
+    def test_update_can_locations_renames(self):
+        self._can(1, 3465, "Minerals")
+        EveLocation.objects.create(location_id=1, location_name="Can: Ore")
+
+        _update_can_locations()
+
+        can = EveLocation.objects.get(location_id=1)
+        self.assertEqual(can.location_name, "Can: Minerals")
+        self.assertEqual(can.system_id, JITA_SYSTEM)
+
+        last_update = can.last_update
+        _update_can_locations()
+
+        self.assertEqual(
+            EveLocation.objects.get(location_id=1).last_update, last_update
+        )
+
+
+class TestUpdateOwnerLocations(TestCase):
+    """
+    Owner scoped location maintenance
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.corporation = EveCorporationInfo.objects.create(
+            corporation_id=2001,
+            corporation_name="Wizard Corp",
+            corporation_ticker="WIZ",
+            member_count=1,
+        )
+        cls.other_corporation = EveCorporationInfo.objects.create(
+            corporation_id=2002,
+            corporation_name="Other Corp",
+            corporation_ticker="OTH",
+            member_count=1,
+        )
+        user = User.objects.create_user("wizard")
+        character = EveCharacter.objects.create(
+            character_id=1001,
+            character_name="Wizard",
+            corporation_id=2001,
+            corporation_name="Wizard Corp",
+            corporation_ticker="WIZ",
+        )
+        ownership = CharacterOwnership.objects.create(
+            user=user, character=character, owner_hash="wizard"
+        )
+        cls.owner = Owner.objects.create(
+            corporation=cls.corporation,
+            character=ownership,
+            user=user,
+            corporation_owner=True,
+        )
+
+    def test_only_touches_owner_item_delta(self):
+        _office(self.corporation, 1, 1000000000001)
+        _office(self.corporation, 2, 1000000000001)
+        _office(self.other_corporation, 3, 1000000000001)
+
+        update_owner_locations(self.owner.pk, [1, 3])
+
+        self.assertEqual(
+            set(EveLocation.objects.values_list("location_id", flat=True)), {1}
+        )
+
+    def test_snapshot_only_holds_locations(self):
+        create_container_types()
+        _office(self.corporation, 1, 1000000000001)
+        for item_id, type_id in [(2, 3465), (3, 25), (4, None)]:
+            create_asset(
+                CorporationAsset,
+                item_id,
+                type_id or 0,
+                1,
+                type_name_id=type_id,
+                corporation=self.corporation,
+            )
+
+        self.assertEqual(
+            self.owner._location_asset_snapshot(),
+            {1: (1000000000001, None, "OfficeFolder"), 2: (1, None, "Hangar")},
+        )
+
+    @patch("wizardindustry.models.LOCATION_UPDATE_CHUNK_SIZE", 2)
+    @patch("wizardindustry.tasks.update_asset_rollup.delay")
+    @patch("wizardindustry.tasks.update_owner_locations.delay")
+    def test_asset_sync_resolves_offices_before_chunked_containers(
+        self, mock_locations, mock_rollup
+    ):
+        create_container_types()
+
+        def sync():
+            _office(self.corporation, 1, 1000000000001)
+            for item_id in (2, 3, 4):
+                create_asset(
+                    CorporationAsset,
+                    item_id,
+                    3465,
+                    1,
+                    type_name_id=3465,
+                    corporation=self.corporation,
+                )
+            return True
+
+        with (
+            patch.object(Owner, "_get_corporation_assets", side_effect=sync),
+            patch.object(Owner, "_update_corporation_asset_names"),
+        ):
+            self.owner._get_assets()
+
+        self.assertTrue(EveLocation.objects.filter(location_id=1).exists())
+        self.assertEqual(
+            [call.args for call in mock_locations.call_args_list],
+            [(self.owner.pk, [2, 3]), (self.owner.pk, [4])],
+        )
+        mock_rollup.assert_called_once_with(self.owner.pk)
+
+    @patch("wizardindustry.tasks.update_asset_rollup.delay")
+    def test_failed_asset_sync_skips_rollup(self, mock_rollup):
+        with (
+            patch.object(Owner, "_get_corporation_assets", return_value=False),
+            patch.object(Owner, "_update_corporation_asset_names"),
+        ):
+            self.owner._get_assets()
+
+        mock_rollup.assert_not_called()
+
+    def test_ignores_empty_delta(self):
+        _office(self.corporation, 1, 1000000000001)
+
+        with self.assertNumQueries(0):
+            update_owner_locations(self.owner.pk, [])
+
+    def test_update_assets_syncs_every_owner(self):
+        with patch.object(Owner, "_get_assets") as mock_get_assets:
+            update_assets()
+
+        mock_get_assets.assert_called_once_with()
+
+
+class TestRefreshStaleStructures(TestCase):
+    """
+    Background structure name refresh
+    """
+
+    def _structure(self, location_id, age_days):
+        EveLocation.objects.create(location_id=location_id, location_name="Old")
+        EveLocation.objects.filter(location_id=location_id).update(
+            last_update=timezone.now() - timedelta(days=age_days)
+        )
+
+    @patch("wizardindustry.tasks.wizardindustry_STRUCTURE_REFRESH_BATCH_SIZE", 2)
+    @patch("wizardindustry.tasks.refresh_structure_names.apply_async")
+    def test_queues_oldest_stale_structures_in_spread_batches(self, apply_async):
+        self._structure(1000000000001, 30)
+        self._structure(1000000000002, 20)
+        self._structure(1000000000003, 10)
+        self._structure(1000000000004, 0)
+        self._structure(60003760, 30)
+
+        refresh_stale_structures()
+
+        self.assertEqual(
+            [call.kwargs["args"] for call in apply_async.call_args_list],
+            [[[1000000000001, 1000000000002]], [[1000000000003]]],
+        )
+        self.assertEqual(apply_async.call_args_list[0].kwargs["countdown"], 0)
+        self.assertGreater(apply_async.call_args_list[1].kwargs["countdown"], 0)
+
+
+@patch("wizardindustry.tasks._structure_characters")
+@patch("wizardindustry.tasks.Token")
+@patch("wizardindustry.tasks.fetch_location_name")
+class TestRefreshStructureNames(TestCase):
+    """
+    Structure name refresh batches
+    """
+
+    def setUp(self):
+        self.week_ago = timezone.now() - timedelta(days=7)
+        for location_id in (1000000000001, 1000000000002, 1000000000003):
+            EveLocation.objects.create(location_id=location_id, location_name="Old")
+        EveLocation.objects.update(last_update=self.week_ago)
+
+    def _mock_access(self, token, structure_characters):
+        structure_characters.side_effect = lambda structure_ids: {
+            structure_id: [1001] for structure_id in structure_ids
+        }
+        token.objects.filter.return_value.require_scopes.return_value.values_list.return_value = [
+            1001
+        ]
+
+    def _refresh(self, responses):
+        def fetch(structure_id, *args, **kwargs):
+            response = responses[structure_id]
+            if isinstance(response, Exception):
+                raise response
+            return EveLocation(location_id=structure_id, location_name=response)
+
+        return fetch
+
+    def test_failed_structures_still_rotate(
+        self, fetch_location_name, token, structure_characters
+    ):
+        self._mock_access(token, structure_characters)
+        fetch_location_name.side_effect = self._refresh(
+            {
+                1000000000001: "New",
+                1000000000002: HTTPNotFound(response=MagicMock(status_code=404)),
+                1000000000003: "Newer",
+            }
+        )
+
+        refresh_structure_names([1000000000001, 1000000000002, 1000000000003])
+
+        locations = EveLocation.objects.in_bulk()
+        self.assertEqual(
+            [locations[location_id].location_name for location_id in sorted(locations)],
+            ["New", "Old", "Newer"],
+        )
+        for location in locations.values():
+            self.assertGreater(location.last_update, self.week_ago)
+
+    def test_error_limit_stops_the_batch(
+        self, fetch_location_name, token, structure_characters
+    ):
+        self._mock_access(token, structure_characters)
+        fetch_location_name.side_effect = self._refresh(
+            {
+                1000000000001: "New",
+                1000000000002: ESIErrorLimitException(reset=30),
+                1000000000003: "Newer",
+            }
+        )
+
+        refresh_structure_names([1000000000001, 1000000000002, 1000000000003])
+
+        self.assertEqual(
+            list(
+                EveLocation.objects.filter(last_update__gt=self.week_ago).values_list(
+                    "location_id", "location_name"
+                )
+            ),
+            [(1000000000001, "New")],
+        )
+        self.assertEqual(fetch_location_name.call_count, 2)
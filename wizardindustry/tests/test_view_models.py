@@ -0,0 +1,123 @@
+"""
+wizardindustry View Model Tests
+"""
+
+# Django
+from django.test import TestCase
+
+# AA wizardindustry App
+from wizardindustry.view_models import (
+    owned_blueprints,
+    owned_blueprints_blueprints,
+    owned_blueprints_market_groups,
+)
+
+
+def _group(name, blueprints=(), sub_groups=()):
+    return owned_blueprints_market_groups(
+        market_group_name=name,
+        blueprints=[
+            owned_blueprints_blueprints(
+                blueprint_name=blueprint_name,
+                owned_count=owned_count,
+                base_cost=base_cost,
+            )
+            for blueprint_name, owned_count, base_cost in blueprints
+        ],
+        sub_groups=list(sub_groups),
+    ).aggregate()
+
+
+class TestOwnedBlueprintsFlatten(TestCase):
+    """
+    Flat blueprint library rows
+    """
+
+    def test_rows_are_ordered_and_unbounded(self):
+        deepest = _group("Level 8", [("Deep Blueprint", 0, 1000)])
+        for level in range(7, 0, -1):
+            deepest = _group(f"Level {level}", sub_groups=[deepest])
+        view_model = owned_blueprints()
+        view_model.market_groups = [deepest]
+
+        rows = view_model.flatten()
+
+        self.assertEqual(
+            [(row.depth, row.name) for row in rows],
+            [(depth, f"Level {depth + 1}") for depth in range(8)]
+            + [(8, "Deep Blueprint")],
+        )
+        self.assertEqual(rows[7].heading, "h6")
+        self.assertEqual(rows[0].cost, "1,000")
+        self.assertEqual(rows[0].progress, "0 / 1")
+
+    def test_complete_and_empty_groups_are_collapsed(self):
+        view_model = owned_blueprints()
+        view_model.market_groups = [
+            _group("Empty"),
+            _group(
+                "Complete",
+                [("Owned Blueprint", 1, 10)],
+                [_group("Hidden", [("Hidden Blueprint", 1, 10)])],
+            ),
+            _group("Open", [("Owned Blueprint", 1, 10), ("Missing", 0, 2500000)]),
+        ]
+
+        rows = view_model.flatten()
+
+        self.assertEqual(
+            [(row.name, row.class_string) for row in rows],
+            [
+                ("Complete", ""),
+                ("Open", ""),
+                ("Owned Blueprint", "table-success"),
+                ("Missing", "table-danger"),
+            ],
+        )
+        self.assertEqual(rows[1].cost, "2,500,000")
+
+
+class TestOwnedBlueprintsAggregate(TestCase):
+    """
+    Market group aggregates
+    """
+
+    def test_aggregates_include_sub_groups(self):
+        market_group = _group(
+            "Ships",
+            [("Owned Blueprint", 1, 10), ("Missing", 0, 20)],
+            [
+                _group(
+                    "Frigates", [("Owned Frigate", 1, 30), ("Missing Frigate", 0, 40)]
+                )
+            ],
+        )
+
+        self.assertEqual(
+            (
+                market_group.blueprint_count,
+                market_group.owned_count,
+                market_group.base_cost,
+            ),
+            (2, 1, 20),
+        )
+        self.assertEqual(
+            (
+                market_group.total_blueprint_count,
+                market_group.total_owned_count,
+                market_group.total_base_cost,
+            ),
+            (4, 2, 60),
+        )
+
+    def test_totals_sum_top_level_groups(self):
+        view_model = owned_blueprints()
+        view_model.market_groups = [
+            _group("Ships", [("Owned Blueprint", 1, 10)]),
+            _group("Modules", [("Missing", 0, 20)], [_group("Empty")]),
+        ]
+
+        self.assertEqual(
+            (view_model.all_owned(), view_model.all_total(), view_model.all_costs()),
+            (1, 2, 20),
+        )
@@ -0,0 +1,314 @@
+"""
+wizardindustry View Tests
+"""
+
+# Standard Library
+from unittest.mock import patch
+
+# Django
+from django.test import TestCase
+from django.urls import reverse
+
+# Alliance Auth
+from allianceauth.authentication.models import CharacterOwnership
+from allianceauth.eveonline.models import EveCharacter
+
+# AA wizardindustry App
+from wizardindustry.helpers.catalogue import (
+    bump_catalogue_version,
+    update_blueprint_eligibility,
+)
+from wizardindustry.helpers.ownership import bump_ownership_version
+from wizardindustry.models import CorporationAsset, Owner
+from wizardindustry.tasks import update_blueprint_coverage
+from wizardindustry.tests.testdata import (
+    create_blueprint,
+    create_blueprint_catalogue,
+    create_blueprint_materials,
+    create_blueprint_owner,
+    create_corporation,
+    create_user_with_character,
+)
+
+
+class TestBlueprintLibrary(TestCase):
+    """
+    Lazily loaded blueprint library
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        create_blueprint_catalogue()
+        update_blueprint_eligibility()
+        corporation = create_corporation()
+        ownership = create_user_with_character(corporation=corporation)
+        cls.user = ownership.user
+        cls.user.is_superuser = True
+        cls.user.save()
+        cls.user.profile.main_character = ownership.character
+        cls.user.profile.save()
+        cls.owner = create_blueprint_owner(corporation)
+        create_blueprint(cls.owner, 1, 691)
+
+    def setUp(self):
+        bump_catalogue_version()
+        bump_ownership_version()
+        self.client.force_login(self.user)
+
+    def test_page_renders_top_level_only(self):
+        response = self.client.get(reverse("wizardindustry:blueprint_pokemon"))
+
+        self.assertContains(response, "Ship Blueprints")
+        self.assertContains(response, 'data-market-group-id="10"')
+        self.assertNotContains(response, "Frigates")
+
+    def test_group_returns_one_level(self):
+        response = self.client.get(
+            reverse("wizardindustry:blueprint_pokemon_group", args=[11])
+        )
+
+        rows = response.json()["rows"]
+        self.assertEqual(
+            [(row["name"], row["depth"], row["is_group"]) for row in rows],
+            [("Rifter Blueprint", 1, False), ("Minmatar Frigates", 1, True)],
+        )
+        self.assertEqual(rows[0]["class_string"], "table-success")
+        self.assertEqual(rows[1]["market_group_id"], 12)
+        self.assertTrue(rows[1]["expandable"])
+
+    def test_group_rollup_counts(self):
+        response = self.client.get(
+            reverse("wizardindustry:blueprint_pokemon_group", args=[10])
+        )
+
+        self.assertEqual(
+            [
+                (row["name"], row["owned_count"], row["blueprint_count"])
+                for row in response.json()["rows"]
+            ],
+            [("Frigates", 1, 2), ("Cruisers", 0, 1)],
+        )
+
+    def test_unknown_group(self):
+        response = self.client.get(
+            reverse("wizardindustry:blueprint_pokemon_group", args=[999])
+        )
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_conditional_get(self):
+        url = reverse("wizardindustry:blueprint_pokemon_group", args=[10])
+        etag = self.client.get(url)["ETag"]
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_language_changes_etag(self):
+        url = reverse("wizardindustry:blueprint_pokemon_group", args=[10])
+        etag = self.client.get(url, HTTP_ACCEPT_LANGUAGE="en")["ETag"]
+
+        response = self.client.get(
+            url, HTTP_IF_NONE_MATCH=etag, HTTP_ACCEPT_LANGUAGE="de"
+        )
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_blueprint_changes_change_etag(self):
+        url = reverse("wizardindustry:blueprint_pokemon_group", args=[10])
+        etag = self.client.get(url)["ETag"]
+
+        create_blueprint(self.owner, 2, 1030)
+        update_blueprint_coverage()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["rows"][1]["owned_count"], 1)
+
+    def test_users_with_the_same_access_share_the_page(self):
+        self.client.get(reverse("wizardindustry:blueprint_pokemon"))
+        colleague = create_user_with_character("colleague", 1002).user
+        colleague.is_superuser = True
+        colleague.save()
+        colleague.profile.main_character = (
+            colleague.character_ownerships.get().character
+        )
+        colleague.profile.save()
+        self.client.force_login(colleague)
+
+        with patch("wizardindustry.views.user_coverage") as mock_user_coverage:
+            response = self.client.get(reverse("wizardindustry:blueprint_pokemon"))
+
+        mock_user_coverage.assert_not_called()
+        self.assertContains(response, "(1/3)")
+
+    def test_blueprint_changes_invalidate_the_page(self):
+        self.client.get(reverse("wizardindustry:blueprint_pokemon"))
+
+        create_blueprint(self.owner, 2, 1030)
+        update_blueprint_coverage()
+        response = self.client.get(reverse("wizardindustry:blueprint_pokemon"))
+
+        self.assertContains(response, "(2/3)")
+
+    def test_group_rows_are_cached(self):
+        url = reverse("wizardindustry:blueprint_pokemon_group", args=[10])
+        self.client.get(url)
+
+        with patch("wizardindustry.views._market_group_rows") as mock_rows:
+            response = self.client.get(url)
+
+        mock_rows.assert_not_called()
+        self.assertEqual(len(response.json()["rows"]), 2)
+
+
+class TestBlueprintComparison(TestCase):
+    """
+    Blueprint library comparison
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        create_blueprint_catalogue()
+        update_blueprint_eligibility()
+        wizards = create_corporation()
+        apprentices = create_corporation(2002, "Apprentice Corp", "APP")
+        ownership = create_user_with_character(corporation=wizards)
+        cls.user = ownership.user
+        cls.user.is_superuser = True
+        cls.user.save()
+        cls.user.profile.main_character = ownership.character
+        cls.user.profile.save()
+        alt = EveCharacter.objects.create(
+            character_id=1002,
+            character_name="Apprentice",
+            corporation_id=apprentices.corporation_id,
+            corporation_name=apprentices.corporation_name,
+            corporation_ticker=apprentices.corporation_ticker,
+        )
+        CharacterOwnership.objects.create(
+            user=cls.user, character=alt, owner_hash="apprentice"
+        )
+        wizard_owner = create_blueprint_owner(wizards)
+        create_blueprint(wizard_owner, 1, 691)
+        create_blueprint(wizard_owner, 2, 951)
+        create_blueprint(create_blueprint_owner(apprentices), 3, 951)
+        cls.apprentices = apprentices
+
+    def setUp(self):
+        bump_catalogue_version()
+        bump_ownership_version()
+        self.client.force_login(self.user)
+
+    def test_compare_corporations(self):
+        data = self.client.get(reverse("wizardindustry:blueprint_comparison")).json()
+
+        self.assertEqual(
+            (
+                data["blueprint_count"],
+                data["union_count"],
+                data["intersection_count"],
+                data["nobody_count"],
+            ),
+            (3, 2, 1, 1),
+        )
+        self.assertEqual(
+            [
+                (row["name"], row["owned_count"], row["unique_count"])
+                for row in data["corporations"]
+            ],
+            [("Apprentice Corp", 1, 0), ("Wizard Corp", 2, 1)],
+        )
+        self.assertEqual(data["overlap"], [[1, 1], [1, 2]])
+        self.assertEqual(
+            data["nobody"], [{"type_id": 1030, "name": "Rupture Blueprint"}]
+        )
+
+    def test_limit_corporations(self):
+        data = self.client.get(
+            reverse("wizardindustry:blueprint_comparison"),
+            {"corporation": self.apprentices.pk},
+        ).json()
+
+        self.assertEqual(
+            [row["name"] for row in data["corporations"]], ["Apprentice Corp"]
+        )
+        self.assertEqual(data["nobody_count"], 2)
+
+
+class TestBillOfMaterials(TestCase):
+    """
+    Bill of materials view
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        create_blueprint_catalogue()
+        create_blueprint_materials()
+        corporation = create_corporation()
+        ownership = create_user_with_character(corporation=corporation)
+        cls.user = ownership.user
+        cls.user.is_superuser = True
+        cls.user.save()
+        cls.user.profile.main_character = ownership.character
+        cls.user.profile.save()
+        Owner.objects.create(
+            corporation=corporation,
+            character=ownership,
+            corporation_owner=True,
+            user=cls.user,
+        )
+        CorporationAsset.objects.create(
+            corporation=corporation,
+            item_id=1,
+            type_id=34,
+            location_id=60003760,
+            location_flag="Hangar",
+            location_type="station",
+            quantity=1000,
+            singleton=False,
+        )
+
+    def setUp(self):
+        bump_catalogue_version()
+        self.client.force_login(self.user)
+
+    def test_bill_of_materials(self):
+        data = self.client.get(
+            reverse("wizardindustry:bill_of_materials"),
+            {"type_id": 587, "quantity": 2, "me": 10},
+        ).json()
+
+        self.assertEqual(
+            [(row["name"], row["quantity"]) for row in data["materials"]],
+            [("Pyerite", 180), ("Tritanium", 1800)],
+        )
+        self.assertEqual(
+            [(row["name"], row["runs"]) for row in data["jobs"]], [("Rifter", 2)]
+        )
+
+    def test_stock(self):
+        data = self.client.get(
+            reverse("wizardindustry:bill_of_materials"),
+            {"type_id": 587, "quantity": 2, "stock": 1},
+        ).json()
+
+        self.assertEqual(
+            [(row["name"], row["shortfall"]) for row in data["materials"]],
+            [("Pyerite", 180), ("Tritanium", 800)],
+        )
+        self.assertEqual(data["materials"][1]["stock"], {"60003760": 1000})
+
+    def test_unknown_product(self):
+        response = self.client.get(
+            reverse("wizardindustry:bill_of_materials"), {"type_id": 34}
+        )
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_invalid_parameters(self):
+        response = self.client.get(
+            reverse("wizardindustry:bill_of_materials"), {"type_id": 587, "me": 11}
+        )
+
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,271 @@
+"""
+Test data shared by the wizardindustry tests
+"""
+
+# Third Party
+from blueprints.models import Blueprint, Location
+from blueprints.models import Owner as BlueprintOwner
+
+# Django
+from django.contrib.auth.models import User
+from django.utils import timezone
+
+# Alliance Auth
+from allianceauth.authentication.models import CharacterOwnership
+from allianceauth.eveonline.models import EveCharacter, EveCorporationInfo
+
+# Alliance Auth (External Libs)
+from eveuniverse.models import (
+    EveCategory,
+    EveConstellation,
+    EveGroup,
+    EveIndustryActivity,
+    EveIndustryActivityMaterial,
+    EveIndustryActivityProduct,
+    EveMarketGroup,
+    EveRegion,
+    EveSolarSystem,
+    EveStargate,
+    EveType,
+)
+
+# AA wizardindustry App
+from wizardindustry.models import BasePrice, MarketPrice, invMetaTypes
+
+
+def create_blueprint_catalogue():
+    """Small blueprint market tree.
+
+    Blueprints (2)
+    └ Ship Blueprints (10)
+      ├ Frigates (11): Rifter Blueprint, Civilian Rifter Blueprint
+      │ └ Minmatar Frigates (12): Slasher Blueprint, Republic Fleet Firetail Blueprint (faction)
+      └ Cruisers (13): Rupture Blueprint, Stabber Blueprint (tech 2)
+    """
+    blueprint_category = EveCategory.objects.create(
+        id=9, name="Blueprint", published=True
+    )
+    ship_category = EveCategory.objects.create(id=6, name="Ship", published=True)
+    blueprint_group = EveGroup.objects.create(
+        id=105,
+        name="Frigate Blueprint",
+        eve_category=blueprint_category,
+        published=True,
+    )
+    ship_group = EveGroup.objects.create(
+        id=25, name="Frigate", eve_category=ship_category, published=True
+    )
+
+    root = EveMarketGroup.objects.create(id=2, name="Blueprints", description="")
+    ships = EveMarketGroup.objects.create(
+        id=10, name="Ship Blueprints", description="", parent_market_group=root
+    )
+    frigates = EveMarketGroup.objects.create(
+        id=11, name="Frigates", description="", parent_market_group=ships
+    )
+    minmatar = EveMarketGroup.objects.create(
+        id=12, name="Minmatar Frigates", description="", parent_market_group=frigates
+    )
+    cruisers = EveMarketGroup.objects.create(
+        id=13, name="Cruisers", description="", parent_market_group=ships
+    )
+
+    manufacturing = EveIndustryActivity.objects.get(id=1)  # loaded by migration
+
+    blueprints = [
+        (691, "Rifter Blueprint", frigates, 587, 1, 2500000),
+        (39581, "Civilian Rifter Blueprint", frigates, 39580, 1, 1000),
+        (951, "Slasher Blueprint", minmatar, 585, 1, 2000000),
+        (17813, "Republic Fleet Firetail Blueprint", minmatar, 17812, 4, 9000000),
+        (1030, "Rupture Blueprint", cruisers, 629, 1, 16000000),
+        (11990, "Stabber Blueprint", cruisers, 11989, 2, 64000000),
+    ]
+    for type_id, name, market_group, product_id, meta_group_id, price in blueprints:
+        blueprint = EveType.objects.create(
+            id=type_id,
+            name=name,
+            eve_group=blueprint_group,
+            eve_market_group=market_group,
+            published=True,
+        )
+        product = EveType.objects.create(
+            id=product_id,
+            name=name.replace(" Blueprint", ""),
+            eve_group=ship_group,
+            published=True,
+        )
+        EveIndustryActivityProduct.objects.create(
+            eve_type=blueprint,
+            activity=manufacturing,
+            product_eve_type=product,
+            quantity=1,
+        )
+        invMetaTypes.objects.create(eve_type=product, meta_group_id=meta_group_id)
+        BasePrice.objects.create(eve_type=blueprint, base_price=price)
+
+
+def create_blueprint_materials():
+    """Manufacturing materials and market prices for `create_blueprint_catalogue`.
+
+    Rifter Blueprint: 1000 Tritanium, 100 Pyerite
+    Slasher Blueprint: 500 Tritanium
+    Tritanium is priced at its average price (5), Pyerite at its adjusted price (10)
+    """
+    material_category = EveCategory.objects.create(
+        id=4, name="Material", published=True
+    )
+    mineral_group = EveGroup.objects.create(
+        id=18, name="Mineral", eve_category=material_category, published=True
+    )
+    tritanium = EveType.objects.create(
+        id=34, name="Tritanium", eve_group=mineral_group, published=True
+    )
+    pyerite = EveType.objects.create(
+        id=35, name="Pyerite", eve_group=mineral_group, published=True
+    )
+    MarketPrice.objects.create(type_id=34, average_price=5, updated=timezone.now())
+    MarketPrice.objects.create(type_id=35, adjusted_price=10, updated=timezone.now())
+
+    manufacturing = EveIndustryActivity.objects.get(id=1)
+    for blueprint_id, material, quantity in [
+        (691, tritanium, 1000),
+        (691, pyerite, 100),
+        (951, tritanium, 500),
+    ]:
+        EveIndustryActivityMaterial.objects.create(
+            eve_type_id=blueprint_id,
+            activity=manufacturing,
+            material_eve_type=material,
+            quantity=quantity,
+        )
+
+
+def create_corporation(corporation_id=2001, name="Wizard Corp", ticker="WIZ"):
+    return EveCorporationInfo.objects.create(
+        corporation_id=corporation_id,
+        corporation_name=name,
+        corporation_ticker=ticker,
+        member_count=1,
+    )
+
+
+def create_user_with_character(
+    username="wizard", character_id=1001, corporation=None
+) -> CharacterOwnership:
+    """User whose main character is in `corporation`."""
+    corporation = corporation or EveCorporationInfo.objects.get(corporation_id=2001)
+    user = User.objects.create_user(username)
+    character = EveCharacter.objects.create(
+        character_id=character_id,
+        character_name=username.title(),
+        corporation_id=corporation.corporation_id,
+        corporation_name=corporation.corporation_name,
+        corporation_ticker=corporation.corporation_ticker,
+    )
+    return CharacterOwnership.objects.create(
+        user=user, character=character, owner_hash=username
+    )
+
+
+def create_blueprint_owner(corporation) -> BlueprintOwner:
+    return BlueprintOwner.objects.create(corporation=corporation)
+
+
+def create_blueprint(owner, item_id, type_id, runs=None) -> Blueprint:
+    location, _ = Location.objects.get_or_create(id=60003760, defaults={"name": "Jita"})
+    return Blueprint.objects.create(
+        item_id=item_id,
+        owner=owner,
+        eve_type_id=type_id,
+        location=location,
+        location_flag="Hangar",
+        runs=runs,
+        material_efficiency=10,
+        time_efficiency=20,
+    )
+
+
+def create_asset(model, item_id, type_id, location_id, quantity=1, **fields):
+    """Asset of `model`, the owner is passed as `corporation` or `character`."""
+    return model.objects.create(
+        item_id=item_id,
+        type_id=type_id,
+        location_id=location_id,
+        location_flag="Hangar",
+        location_type="station" if location_id > 60000000 else "item",
+        quantity=quantity,
+        singleton=quantity == 1,
+        **fields,
+    )
+
+
+def create_jump_graph():
+    """Jita (30000142) - Perimeter (30000144) - New Caldari (30000145), and
+    Amarr (30002187) without gates to them.
+
+    The Perimeter - New Caldari gate is only stored one way.
+    """
+    region = EveRegion.objects.create(id=10000002, name="The Forge")
+    constellation = EveConstellation.objects.create(
+        id=20000020, name="Kimotoro", eve_region=region
+    )
+    systems = {
+        system_id: EveSolarSystem.objects.create(
+            id=system_id,
+            name=name,
+            eve_constellation=constellation,
+            security_status=0.9,
+        )
+        for system_id, name in [
+            (30000142, "Jita"),
+            (30000144, "Perimeter"),
+            (30000145, "New Caldari"),
+            (30002187, "Amarr"),
+        ]
+    }
+    celestial_category = EveCategory.objects.create(
+        id=2, name="Celestial", published=False
+    )
+    stargate_group = EveGroup.objects.create(
+        id=10, name="Stargate", eve_category=celestial_category, published=False
+    )
+    stargate_type = EveType.objects.create(
+        id=16, name="Stargate", eve_group=stargate_group, published=False
+    )
+    for stargate_id, system_id, destination_id in [
+        (50001248, 30000142, 30000144),
+        (50001249, 30000144, 30000142),
+        (50001250, 30000144, 30000145),
+    ]:
+        EveStargate.objects.create(
+            id=stargate_id,
+            name=f"Stargate ({systems[destination_id].name})",
+            eve_solar_system=systems[system_id],
+            destination_eve_solar_system=systems[destination_id],
+            eve_type=stargate_type,
+        )
+
+
+def create_container_types():
+    """Large Secure Container (3465), a container assets can be placed in, and
+    Corpse (25), in the Biomass group of the same category that never holds
+    assets.
+    """
+    celestial_category, _ = EveCategory.objects.get_or_create(
+        id=2, defaults={"name": "Celestial", "published": False}
+    )
+    container_group = EveGroup.objects.create(
+        id=12, name="Cargo Container", eve_category=celestial_category, published=True
+    )
+    biomass_group = EveGroup.objects.create(
+        id=14, name="Biomass", eve_category=celestial_category, published=True
+    )
+    EveType.objects.create(
+        id=3465,
+        name="Large Secure Container",
+        eve_group=container_group,
+        published=True,
+    )
+    EveType.objects.create(
+        id=25, name="Corpse", eve_group=biomass_group, published=True
+    )
@@ -13,4 +13,27 @@ urlpatterns = [
     path("setup_character", views.setup_character, name="setup_character"),
     path("setup_corporation", views.setup_corporation, name="setup_corporation"),
     path("blueprint_pokemon", views.blueprint_pokemon, name="blueprint_pokemon"),
+    path(
+        "blueprint_pokemon/<int:market_group_id>",
+        views.blueprint_pokemon_group,
+        name="blueprint_pokemon_group",
+    ),
+    path(
+        "blueprint_comparison",
+        views.blueprint_comparison,
+        name="blueprint_comparison",
+    ),
+    path("bill_of_materials", views.bill_of_materials, name="bill_of_materials"),
+    path("asset_values", views.asset_values, name="asset_values"),
+    path("asset_search", views.asset_search, name="asset_search"),
+    path(
+        "asset_locations/<int:type_id>",
+        views.asset_locations,
+        name="asset_locations",
+    ),
+    path("nearest_stockpiles", views.nearest_stockpiles, name="nearest_stockpiles"),
+    path("export/<str:name>", views.export, name="export"),
+    path("table/<str:name>", views.table, name="table"),
+    path("industry_jobs", views.industry_jobs, name="industry_jobs"),
+    path("active_jobs", views.active_jobs, name="active_jobs"),
 ]
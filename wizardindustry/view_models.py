@@ -1,94 +1,264 @@
-# Standard Library
-from dataclasses import dataclass
+# Django
+from django.utils.formats import get_format
 
 
-@dataclass
 class owned_blueprints_blueprints:
-    id: int
-    name: str
-    owned_count: int
-    base_cost: int
+    __slots__ = (
+        "blueprint_id",
+        "blueprint_name",
+        "owned_count",
+        "base_cost",
+        "build_cost",
+    )
 
-    def __init__(self):
-        self.name = ""
+    def __init__(
+        self,
+        blueprint_id=None,
+        blueprint_name="",
+        owned_count=0,
+        base_cost=0,
+        build_cost=0,
+    ):
+        self.blueprint_id = blueprint_id
+        self.blueprint_name = blueprint_name
+        self.owned_count = owned_count
+        self.base_cost = base_cost
+        self.build_cost = build_cost
 
     def class_string(self):
         return "table-success" if self.owned_count > 0 else "table-danger"
 
 
-@dataclass
 class owned_blueprints_market_groups:
-    market_group_id: int
-    market_group_name: str
-    description: str
-    blueprint_count: int
-    owned_count: int
-    sub_groups: list["owned_blueprints_market_groups"]
-    blueprints: list[owned_blueprints_blueprints]
-
-    _calculated_blueprint_count: int = None
-    _calculated_owned_count: int = None
-    _calculated_base_cost: int = None
+    """A market group with its blueprints and sub groups.
 
-    def __init__(self):
-        self.market_group_name = ""
-        self.description = ""
-        self.sub_groups = []
-        self.blueprints = []
-        self.owned_count = 0
+    `blueprint_count`, `owned_count`, `base_cost` and `build_cost` cover the group's own
+    blueprints, the `total_*` aggregates include every sub group and are
+    filled by `aggregate()` once the sub groups are aggregated.
+    """
+
+    __slots__ = (
+        "market_group_id",
+        "market_group_name",
+        "description",
+        "sub_groups",
+        "blueprints",
+        "blueprint_count",
+        "owned_count",
+        "base_cost",
+        "build_cost",
+        "total_blueprint_count",
+        "total_owned_count",
+        "total_base_cost",
+        "total_build_cost",
+    )
+
+    def __init__(
+        self,
+        market_group_id=None,
+        market_group_name="",
+        description="",
+        blueprints=None,
+        sub_groups=None,
+    ):
+        self.market_group_id = market_group_id
+        self.market_group_name = market_group_name
+        self.description = description
+        self.blueprints = blueprints if blueprints is not None else []
+        self.sub_groups = sub_groups if sub_groups is not None else []
         self.blueprint_count = 0
+        self.owned_count = 0
+        self.base_cost = 0
+        self.build_cost = 0
+        self.total_blueprint_count = 0
+        self.total_owned_count = 0
+        self.total_base_cost = 0
+        self.total_build_cost = 0
+
+    def aggregate(self):
+        blueprint_count = owned_count = base_cost = build_cost = 0
+        for blueprint in self.blueprints:
+            blueprint_count += 1
+            if blueprint.owned_count > 0:
+                owned_count += 1
+            else:
+                base_cost += blueprint.base_cost
+                build_cost += blueprint.build_cost
+        self.blueprint_count = blueprint_count
+        self.owned_count = owned_count
+        self.base_cost = base_cost
+        self.build_cost = build_cost
+
+        for sub_group in self.sub_groups:
+            blueprint_count += sub_group.total_blueprint_count
+            owned_count += sub_group.total_owned_count
+            base_cost += sub_group.total_base_cost
+            build_cost += sub_group.total_build_cost
+        self.total_blueprint_count = blueprint_count
+        self.total_owned_count = owned_count
+        self.total_base_cost = base_cost
+        self.total_build_cost = build_cost
+        return self
+
+
+def _isk_formatter():
+    """Grouped number formatting matching `intcomma`, looked up once per table."""
+    thousand_separator = get_format("THOUSAND_SEPARATOR")
+    decimal_separator = get_format("DECIMAL_SEPARATOR")
+
+    def isk(value):
+        return (
+            f"{value:,}".replace(",", "\0")
+            .replace(".", decimal_separator)
+            .replace("\0", thousand_separator)
+        )
+
+    return isk
+
+
+class owned_blueprints_row:
+    __slots__ = (
+        "depth",
+        "is_group",
+        "name",
+        "owned_count",
+        "blueprint_count",
+        "base_cost",
+        "cost",
+        "build_cost",
+        "build_value",
+        "class_string",
+        "market_group_id",
+        "heading",
+        "indent",
+        "progress",
+        "expandable",
+    )
+
+    def __init__(
+        self,
+        depth,
+        is_group,
+        name,
+        owned_count,
+        blueprint_count,
+        base_cost,
+        cost,
+        build_cost=0,
+        build_value="",
+        class_string="",
+        market_group_id=None,
+    ):
+        self.depth = depth
+        self.is_group = is_group
+        self.name = name
+        self.owned_count = owned_count
+        self.blueprint_count = blueprint_count
+        self.base_cost = base_cost
+        self.cost = cost
+        self.build_cost = build_cost
+        self.build_value = build_value
+        self.class_string = class_string
+        self.market_group_id = market_group_id
+        # Rendered as plain strings, ints would go through localization per row
+        self.heading = f"h{min(depth + 2, 6)}"
+        self.indent = f"{depth}rem"
+        self.progress = f"{owned_count} / {blueprint_count}"
+        self.expandable = is_group and owned_count < blueprint_count
+
+    def as_json(self):
+        return {
+            "market_group_id": self.market_group_id,
+            "is_group": self.is_group,
+            "expandable": self.expandable,
+            "depth": self.depth,
+            "name": self.name,
+            "owned_count": self.owned_count,
+            "blueprint_count": self.blueprint_count,
+            "base_cost": self.base_cost,
+            "cost": self.cost,
+            "build_cost": self.build_cost,
+            "build_value": self.build_value,
+            "class_string": self.class_string,
+        }
+
 
-    def calculated_blueprint_count(self):
-        if self._calculated_blueprint_count is None:
-            self._calculated_blueprint_count = self.blueprint_count
-            for sub_group in self.sub_groups:
-                self._calculated_blueprint_count += (
-                    sub_group.calculated_blueprint_count()
-                )
-        return self._calculated_blueprint_count
-
-    def calculated_owned_count(self):
-        if self._calculated_owned_count is None:
-            self._calculated_owned_count = self.owned_count
-            for blueprint in self.blueprints:
-                if blueprint.owned_count > 0:
-                    self._calculated_owned_count += 1
-            for sub_group in self.sub_groups:
-                self._calculated_owned_count += sub_group.calculated_owned_count()
-        return self._calculated_owned_count
-
-    def calculated_base_cost(self):
-        if self._calculated_base_cost is None:
-            self._calculated_base_cost = 0
-            for blueprint in self.blueprints:
-                if blueprint.owned_count == 0:
-                    self._calculated_base_cost += blueprint.base_cost
-            for sub_group in self.sub_groups:
-                self._calculated_base_cost += sub_group.calculated_base_cost()
-        return self._calculated_base_cost
-
-
-@dataclass
 class owned_blueprints:
-    market_groups: list[owned_blueprints_market_groups]
+    __slots__ = ("market_groups", "rows")
 
     def __init__(self):
         self.market_groups = []
+        self.rows = []
+
+    def flatten(self, max_depth=None):
+        """Rows of the library table in display order, at any depth.
+
+        Groups without blueprints are skipped, the blueprints and sub groups
+        of complete groups are collapsed. With `max_depth` only rows up to that
+        depth are returned, deeper levels are loaded on demand.
+        """
+        isk = _isk_formatter()
+        rows = []
+        pending = [(0, market_group) for market_group in reversed(self.market_groups)]
+        while pending:
+            depth, market_group = pending.pop()
+            blueprint_count = market_group.total_blueprint_count
+            if blueprint_count == 0:
+                continue
+
+            owned_count = market_group.total_owned_count
+            base_cost = market_group.total_base_cost
+            build_cost = market_group.total_build_cost
+            rows.append(
+                owned_blueprints_row(
+                    depth,
+                    True,
+                    market_group.market_group_name,
+                    owned_count,
+                    blueprint_count,
+                    base_cost,
+                    isk(base_cost),
+                    build_cost,
+                    isk(build_cost),
+                    market_group_id=market_group.market_group_id,
+                )
+            )
+            if owned_count == blueprint_count or depth == max_depth:
+                continue
+
+            for blueprint in market_group.blueprints:
+                rows.append(
+                    owned_blueprints_row(
+                        depth + 1,
+                        False,
+                        blueprint.blueprint_name,
+                        blueprint.owned_count,
+                        1,
+                        blueprint.base_cost,
+                        isk(blueprint.base_cost),
+                        blueprint.build_cost,
+                        isk(blueprint.build_cost),
+                        blueprint.class_string(),
+                    )
+                )
+            pending += [
+                (depth + 1, sub_group)
+                for sub_group in reversed(market_group.sub_groups)
+            ]
+        return rows
 
     def all_costs(self):
-        cost = 0
-        for market_group in self.market_groups:
-            cost += market_group.calculated_base_cost()
-        return cost
+        return sum(market_group.total_base_cost for market_group in self.market_groups)
+
+    def all_build_costs(self):
+        return sum(market_group.total_build_cost for market_group in self.market_groups)
 
     def all_owned(self):
-        owned = 0
-        for market_group in self.market_groups:
-            owned += market_group.calculated_owned_count()
-        return owned
+        return sum(
+            market_group.total_owned_count for market_group in self.market_groups
+        )
 
     def all_total(self):
-        total = 0
-        for market_group in self.market_groups:
-            total += market_group.calculated_blueprint_count()
-        return total
+        return sum(
+            market_group.total_blueprint_count for market_group in self.market_groups
+        )
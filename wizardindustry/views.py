@@ -1,16 +1,19 @@
 """App Views"""
 
-# Third Party
-from blueprints.models import Blueprint
-
 # Django
 from django.contrib.auth.decorators import login_required, permission_required
+from django.core.cache import cache
 from django.core.handlers.wsgi import WSGIRequest
 from django.db import transaction
-from django.http import HttpResponse
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
 from django.shortcuts import redirect, render
+from django.template.loader import render_to_string
+from django.urls import reverse
 from django.utils.html import format_html
-from django.utils.translation import gettext_lazy
+from django.utils.safestring import mark_safe
+from django.utils.translation import get_language, gettext_lazy
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
 
 # Alliance Auth
 from allianceauth.authentication.models import CharacterOwnership
@@ -18,8 +21,25 @@ from allianceauth.eveonline.models import EveCharacter, EveCorporationInfo
 from esi.decorators import token_required
 
 # Alliance Auth (External Libs)
-from eveuniverse.models import EveMarketGroup
-
+from eveuniverse.models import EveType
+
+from .app_settings import wizardindustry_LIBRARY_CACHE_TIMEOUT
+from .helpers import jobs, jumps, rollups
+from .helpers.assets import asset_owners, search_assets
+from .helpers.bitsets import (
+    compare,
+    corporation_bitmaps,
+    from_bitmap,
+    get_bit_index,
+    ownership_fingerprint,
+)
+from .helpers.bom import get_industry_graph
+from .helpers.catalogue import catalogue_version, get_catalogue
+from .helpers.coverage import coverage_version, user_coverage
+from .helpers.export import EXPORTS, FORMATS, iter_export
+from .helpers.ownership import owned_blueprint_type_ids, ownership_version
+from .helpers.stock import match_stock
+from .helpers.tables import TABLES, TableRequest, table_columns, table_page
 from .models import Owner
 from .utils import messages_plus
 from .view_models import (
@@ -146,12 +166,16 @@ def setup_character(request, token):
 @login_required
 @permission_required("wizardindustry.basic_access")
 def index(request: WSGIRequest) -> HttpResponse:
-    models = {}
-
-    owners = Owner.objects.all()
-
-    for owner in owners:
-        owner._get_assets()
+    models = {
+        "tables": [
+            {
+                "name": name,
+                "url": reverse("wizardindustry:table", args=[name]),
+                "columns": table_columns(name),
+            }
+            for name in TABLES
+        ]
+    }
 
     return render(request, "wizardindustry/index.html", models)
 
@@ -165,98 +189,440 @@ def blueprint_pokemon(request: WSGIRequest) -> HttpResponse:
     :return:
     """
 
-    owned_blueprint_list = (
-        Blueprint.objects.user_has_access(request.user).filter(runs=None).all()
+    key = _library_cache_key(request)
+    library = cache.get(key)
+    if library is None:
+        catalogue = get_catalogue()
+        coverage = user_coverage(request.user)
+
+        view_model = owned_blueprints()
+
+        view_model.market_groups = [
+            _coverage_market_group(catalogue.groups[market_group_id], coverage)
+            for market_group_id in catalogue.roots
+        ]
+        view_model.rows = view_model.flatten(max_depth=0)
+
+        library = render_to_string(
+            "wizardindustry/partials/blueprint_library/table.html",
+            {"model": view_model},
+            request=request,
+        )
+        cache.set(key, library, timeout=wizardindustry_LIBRARY_CACHE_TIMEOUT)
+
+    context = {"library": mark_safe(library)}
+
+    return render(request, "wizardindustry/allblueprints.html", context)
+
+
+def _library_cache_key(request: WSGIRequest, *parts) -> str:
+    """Cache key of rendered library output, shared by users with the same access.
+
+    The catalogue version changes with the SDE tasks and the coverage version
+    whenever blueprint changes update the coverage table.
+    """
+    return "-".join(
+        str(part)
+        for part in (
+            "wizardindustry-library",
+            catalogue_version(),
+            coverage_version(),
+            ownership_fingerprint(request.user),
+            get_language(),
+            *parts,
+        )
+    )
+
+
+def _blueprint_library_etag(request: WSGIRequest, **kwargs) -> str:
+    return (
+        f"{catalogue_version()}-{ownership_version()}-{coverage_version()}"
+        f"-{request.user.pk}-{get_language()}"
     )
-    blueprint_marketgroups = EveMarketGroup.objects.filter(parent_market_group__id=2)
+
+
+@login_required
+@permission_required("wizardindustry.blueprint_pokemon")
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=_blueprint_library_etag)
+def blueprint_pokemon_group(request: WSGIRequest, market_group_id: int) -> JsonResponse:
+    """
+    One level of the blueprint library, loaded when a market group is expanded
+    :param request:
+    :param market_group_id:
+    :return:
+    """
+
+    catalogue = get_catalogue()
+    if market_group_id not in catalogue.groups:
+        raise Http404
+
+    key = _library_cache_key(request, market_group_id)
+    rows = cache.get(key)
+    if rows is None:
+        rows = _market_group_rows(request, catalogue, market_group_id)
+        cache.set(key, rows, timeout=wizardindustry_LIBRARY_CACHE_TIMEOUT)
+
+    return JsonResponse({"rows": rows})
+
+
+def _market_group_rows(request: WSGIRequest, catalogue, market_group_id: int):
+    """Rows of the blueprints and sub groups of one market group."""
+    owned_type_ids = owned_blueprint_type_ids(request.user)
+    coverage = user_coverage(request.user)
+    market_group = catalogue.groups[market_group_id]
 
     view_model = owned_blueprints()
 
-    view_model.market_groups = _market_cycler(
-        blueprint_marketgroups, owned_blueprint_list
+    view_model.market_groups = [
+        owned_blueprints_market_groups(
+            market_group.market_group_id,
+            market_group.name,
+            market_group.description,
+            [
+                owned_blueprints_blueprints(
+                    blueprint.type_id,
+                    blueprint.name,
+                    1 if blueprint.type_id in owned_type_ids else 0,
+                    blueprint.base_cost,
+                    blueprint.build_cost,
+                )
+                for blueprint in market_group.blueprints
+            ],
+            [
+                _coverage_market_group(catalogue.groups[child_id], coverage)
+                for child_id in market_group.children
+            ],
+        ).aggregate()
+    ]
+    return [row.as_json() for row in view_model.flatten(max_depth=1)[1:]]
+
+
+@login_required
+@permission_required("wizardindustry.blueprint_pokemon")
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=_blueprint_library_etag)
+def blueprint_comparison(request: WSGIRequest) -> JsonResponse:
+    """
+    Compare the blueprint libraries of the corporations the user can see
+    :param request: optional `corporation` parameters limit the corporations
+    :return:
+    """
+
+    index = get_bit_index()
+    bitmaps = corporation_bitmaps(request.user)
+
+    corporation_pks = request.GET.getlist("corporation")
+    if corporation_pks:
+        bitmaps = {
+            corporation_pk: bitmap
+            for corporation_pk, bitmap in bitmaps.items()
+            if str(corporation_pk) in corporation_pks
+        }
+
+    comparison = compare(bitmaps, index.mask)
+
+    corporations = EveCorporationInfo.objects.filter(pk__in=bitmaps).order_by(
+        "corporation_name"
+    )
+    names = {
+        blueprint.type_id: blueprint.name
+        for market_group in get_catalogue().groups.values()
+        for blueprint in market_group.blueprints
+    }
+
+    return JsonResponse(
+        {
+            "blueprint_count": index.mask.bit_count(),
+            "union_count": comparison.union.bit_count(),
+            "intersection_count": comparison.intersection.bit_count(),
+            "nobody_count": comparison.nobody.bit_count(),
+            "corporations": [
+                {
+                    "id": corporation.pk,
+                    "corporation_id": corporation.corporation_id,
+                    "name": corporation.corporation_name,
+                    "owned_count": bitmaps[corporation.pk].bit_count(),
+                    "unique_count": comparison.unique[corporation.pk].bit_count(),
+                }
+                for corporation in corporations
+            ],
+            "overlap": [
+                [comparison.overlap[(row.pk, column.pk)] for column in corporations]
+                for row in corporations
+            ],
+            "nobody": [
+                {"type_id": type_id, "name": names.get(type_id, "")}
+                for type_id in sorted(
+                    index.type_ids[bit] for bit in from_bitmap(comparison.nobody)
+                )
+            ],
+        }
     )
 
-    context = {"model": view_model}
 
-    return render(request, "wizardindustry/allblueprints.html", context)
+@login_required
+@permission_required("wizardindustry.basic_access")
+def bill_of_materials(request: WSGIRequest) -> JsonResponse:
+    """
+    Raw materials and jobs needed to build a product
+    :param request: `type_id` of the product, `quantity` (1), blueprint `me` (10)
+        and `reactions=0` to buy reaction products instead of building them,
+        `stock=1` to match the materials against the assets of your owners
+    :return:
+    """
+
+    try:
+        type_id = int(request.GET["type_id"])
+        quantity = int(request.GET.get("quantity", 1))
+        me = int(request.GET.get("me", 10))
+    except (KeyError, ValueError):
+        return JsonResponse(
+            {"error": "type_id, quantity and me must be integers"}, status=400
+        )
+    if quantity < 1 or not 0 <= me <= 10:
+        return JsonResponse(
+            {"error": "quantity must be positive, me 0 to 10"}, status=400
+        )
+
+    graph = get_industry_graph()
+    if type_id not in graph.recipes:
+        raise Http404
 
+    bom = graph.explode(
+        {type_id: quantity},
+        me=me,
+        build_reactions=request.GET.get("reactions") != "0",
+    )
+
+    names = dict(
+        EveType.objects.filter(pk__in={*bom.materials, *bom.jobs}).values_list(
+            "id", "name"
+        )
+    )
 
-def _market_cycler(blueprint_marketgroups, owned_blueprints):
-    models = []
-
-    bad_bpos = [
-        47969,
-        48469,
-        48470,
-        47971,
-        48471,
-        48472,
-        47973,
-        48473,
-        48474,
-        48095,
-        58973,
-        58974,
-        49973,
-        60514,
+    materials = [
+        {
+            "type_id": material_id,
+            "name": names.get(material_id, ""),
+            "quantity": material_quantity,
+        }
+        for material_id, material_quantity in sorted(
+            bom.materials.items(), key=lambda item: names.get(item[0], "")
+        )
     ]
+    if request.GET.get("stock") == "1":
+        match = match_stock(bom.materials, *asset_owners(request.user))
+        for material in materials:
+            material["stock"] = match.stock.get(material["type_id"], {})
+            material["shortfall"] = match.shortfall.get(material["type_id"], 0)
+
+    return JsonResponse(
+        {
+            "type_id": type_id,
+            "quantity": quantity,
+            "materials": materials,
+            "jobs": [
+                {
+                    "type_id": product_id,
+                    "name": names.get(product_id, ""),
+                    "blueprint_id": job.blueprint_id,
+                    "activity_id": job.activity_id,
+                    "runs": job.runs,
+                    "quantity": job.quantity,
+                    "surplus": bom.surplus.get(product_id, 0),
+                }
+                for product_id, job in bom.jobs.items()
+            ],
+        }
+    )
 
-    for market_group in blueprint_marketgroups:
-        market_group_view_model = owned_blueprints_market_groups()
-        market_group_view_model.market_group_id = market_group.id
-        market_group_view_model.market_group_name = market_group.name
-        market_group_view_model.description = market_group.description
-        market_group_view_model.blueprints = []
-
-        for eve_type in market_group.eve_types.filter(published=True).all():
-            if eve_type.name.startswith("Civilian"):
-                continue
-
-            if eve_type.id in bad_bpos:
-                continue
-
-            if eve_type is not None:
-                activity_product_product = eve_type.industry_products.filter(
-                    activity_id=1
-                ).first()
-                if not hasattr(activity_product_product, "product_eve_type"):
-                    continue
-                activity_product_product = activity_product_product.product_eve_type
-
-                if (
-                    hasattr(activity_product_product, "inv_meta_types")
-                    and activity_product_product.inv_meta_types is not None
-                    and activity_product_product.inv_meta_types.meta_group_id != 1
-                    and activity_product_product.inv_meta_types.meta_group_id != 54
-                ):
-                    continue
-
-            blueprint_view_model = owned_blueprints_blueprints()
-            blueprint_view_model.blueprint_id = eve_type.id
-            blueprint_view_model.blueprint_name = eve_type.name
-            blueprint_view_model.base_cost = (
-                eve_type.base_price.base_price
-                if hasattr(eve_type, "base_price") and eve_type.base_price is not None
-                else 0
-            )
 
-            blueprint = owned_blueprints.filter(eve_type=eve_type).first()
-            if blueprint:
-                blueprint_view_model.owned_count = 1
-            else:
-                blueprint_view_model.owned_count = 0
+@login_required
+@permission_required("wizardindustry.basic_access")
+def asset_values(request: WSGIRequest) -> HttpResponse:
+    """
+    Market value of the assets of your owners per structure and category
+    :param request:
+    :return:
+    """
 
-            market_group_view_model.blueprints.append(blueprint_view_model)
+    context = rollups.asset_values(request.user)
+    for row in context["categories"]:
+        row["name"] = row["name"] or gettext_lazy("Unknown")
 
-        market_group_view_model.blueprint_count = len(
-            market_group_view_model.blueprints
+    return render(request, "wizardindustry/assetvalues.html", context)
+
+
+@login_required
+@permission_required("wizardindustry.basic_access")
+def asset_search(request: WSGIRequest) -> JsonResponse:
+    """
+    Assets of your owners by type, container or location name
+    :param request: `q` search term of at least 3 characters, `cursor` the
+        `next` value of the previous page
+    :return:
+    """
+
+    term = request.GET.get("q", "").strip()
+    if len(term) < 3:
+        return JsonResponse({"error": "q must be at least 3 characters"}, status=400)
+
+    try:
+        results, cursor = search_assets(
+            request.user, term, request.GET.get("cursor") or None
         )
+    except ValueError:
+        return JsonResponse({"error": "invalid cursor"}, status=400)
 
-        if len(market_group.market_group_children.all()) > 0:
-            market_group_view_model.sub_groups = _market_cycler(
-                market_group.market_group_children.all(), owned_blueprints
-            )
+    return JsonResponse({"results": results, "next": cursor})
+
+
+@login_required
+@permission_required("wizardindustry.basic_access")
+def asset_locations(request: WSGIRequest, type_id: int) -> JsonResponse:
+    """
+    Every station or structure holding a type for your owners
+    :param request:
+    :param type_id:
+    :return:
+    """
+
+    return JsonResponse(
+        {"type_id": type_id, "locations": rollups.stockpiles(request.user, type_id)}
+    )
+
+
+@login_required
+@permission_required("wizardindustry.basic_access")
+def nearest_stockpiles(request: WSGIRequest) -> JsonResponse:
+    """
+    Stockpiles of a type of your owners closest to a solar system
+    :param request: `type_id`, `system_id` and `limit` (5, at most 50)
+    :return:
+    """
+
+    try:
+        type_id = int(request.GET["type_id"])
+        system_id = int(request.GET["system_id"])
+        limit = int(request.GET.get("limit", 5))
+    except (KeyError, ValueError):
+        return JsonResponse(
+            {"error": "type_id, system_id and limit must be integers"}, status=400
+        )
+    if not 1 <= limit <= 50:
+        return JsonResponse({"error": "limit must be 1 to 50"}, status=400)
+
+    return JsonResponse(
+        {
+            "type_id": type_id,
+            "system_id": system_id,
+            "stockpiles": jumps.nearest_stockpiles(
+                request.user, type_id, system_id, limit
+            ),
+        }
+    )
+
+
+@login_required
+@permission_required("wizardindustry.basic_access")
+def export(request: WSGIRequest, name: str) -> StreamingHttpResponse:
+    """
+    Stream the assets or industry jobs of your owners
+    :param request: `format` csv (default) or jsonl, `gzip=1` to compress
+    :param name: one of `helpers.export.EXPORTS`
+    :return:
+    """
+
+    if name not in EXPORTS:
+        raise Http404
+    export_format = request.GET.get("format", "csv")
+    if export_format not in FORMATS:
+        return JsonResponse({"error": "format must be csv or jsonl"}, status=400)
+    gzip = request.GET.get("gzip") == "1"
+
+    corporation_ids, character_ownership_ids = asset_owners(request.user)
+    owner_ids = (
+        corporation_ids if name.startswith("corporation") else character_ownership_ids
+    )
+
+    filename = f"{name}.{export_format}"
+    response = StreamingHttpResponse(
+        iter_export(name, export_format, owner_ids, gzip),
+        content_type="application/gzip" if gzip else FORMATS[export_format],
+    )
+    response["Content-Disposition"] = (
+        f'attachment; filename="{filename}.gz"'
+        if gzip
+        else f'attachment; filename="{filename}"'
+    )
+    return response
+
+
+@login_required
+@permission_required("wizardindustry.basic_access")
+def table(request: WSGIRequest, name: str) -> JsonResponse:
+    """
+    One page of the assets or industry jobs of your owners
+    :param request: DataTables server-side parameters, with the `next` value
+        of the previous page as `cursor` instead of `start`
+    :param name: one of `helpers.tables.TABLES`
+    :return:
+    """
+
+    if name not in TABLES:
+        raise Http404
+
+    try:
+        return JsonResponse(
+            table_page(name, request.user, TableRequest(name, request.GET))
+        )
+    except ValueError as exc:
+        return JsonResponse({"error": str(exc)}, status=400)
+
+
+@login_required
+@permission_required("wizardindustry.basic_access")
+def industry_jobs(request: WSGIRequest) -> HttpResponse:
+    """
+    Running industry jobs of your owners, polled from `active_jobs`
+    :param request:
+    :return:
+    """
+
+    return render(request, "wizardindustry/industryjobs.html")
+
+
+@login_required
+@permission_required("wizardindustry.basic_access")
+def active_jobs(request: WSGIRequest) -> JsonResponse:
+    """
+    Running industry jobs of your owners, served from the cached summary
+    :param request:
+    :return:
+    """
+
+    return JsonResponse(
+        {
+            "version": str(jobs.active_jobs_version()),
+            "jobs": jobs.active_jobs(request.user),
+        }
+    )
+
+
+def _coverage_market_group(market_group, coverage):
+    """View model of a collapsed market group, totals read from its coverage row."""
+    market_group_view_model = owned_blueprints_market_groups(
+        market_group.market_group_id,
+        market_group.name,
+        market_group.description,
+    )
 
-        models.append(market_group_view_model)
+    row = coverage.get(market_group.market_group_id)
+    if row is not None:
+        market_group_view_model.total_owned_count = row.owned_count
+        market_group_view_model.total_blueprint_count = row.blueprint_count
+        market_group_view_model.total_base_cost = row.base_cost
+        market_group_view_model.total_build_cost = row.build_cost
 
-    return models
+    return market_group_view_model